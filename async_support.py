@@ -0,0 +1,135 @@
+"""비동기 파이프라인 공용 런타임.
+
+- get_async_client(): 이벤트 루프별로 공유되는 httpx.AsyncClient (keep-alive 커넥션 풀)
+- run_sync(coro): 동기 코드(Flask 스레드, CLI)에서 코루틴을 공유 백그라운드 루프에 실행
+
+Flask 요청 스레드들이 모두 같은 백그라운드 루프를 사용하므로, 한 프로세스에서
+여러 변환 작업이 네트워크 대기를 겹쳐 동시에 진행된다.
+
+gevent 워커(gunicorn.conf.py의 SERVER_MODE=gevent)처럼 threading이 몽키패치된 프로세스에서는
+공유 루프를 실제 OS 스레드에서 돌린다. 그린렛으로 돌리면 같은 OS 스레드의 다른 그린렛에서도
+루프가 "실행 중"으로 보여 run_sync가 실패하기 때문이다. asyncio.to_thread용 기본 실행기도
+원본 OS 스레드 풀(ASYNC_EXECUTOR_THREADS)로 바꾼다. run_sync의 대기는 패치된 잠금이라
+요청 그린렛만 멈추고 다른 요청/SSE 연결은 계속 처리된다 (gevent 20.12+).
+"""
+import asyncio
+import concurrent.futures
+import os
+import threading
+import weakref
+from typing import Any, Coroutine, Optional, TypeVar
+
+import httpx
+
+from metrics import get_metrics
+
+try:
+    from gevent import monkey as _gevent_monkey  # 선택 의존성 (gevent 워커)
+    _HAS_GEVENT = True
+except Exception:
+    _gevent_monkey = None
+    _HAS_GEVENT = False
+
+T = TypeVar("T")
+
+# 루프별 클라이언트. 루프가 사라지면 엔트리도 함께 정리된다.
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """현재 실행 중인 이벤트 루프의 공유 AsyncClient 반환 (없으면 생성)."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            trust_env=False,  # OS 프록시 무시 (TLS 핸드셰이크 오류 방지)
+            timeout=httpx.Timeout(30.0),
+            follow_redirects=True,
+            # 호스트별 지연/상태 계측 (연결 실패 포함)
+            transport=get_metrics().async_httpx_transport(
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)),
+        )
+        _clients[loop] = client
+    return client
+
+
+async def aclose_async_client() -> None:
+    """현재 루프의 공유 클라이언트 닫기 (자체 루프를 운영하는 호출자용)."""
+    loop = asyncio.get_running_loop()
+    client = _clients.pop(loop, None)
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
+class _NativeThreadPool(concurrent.futures.ThreadPoolExecutor):
+    """몽키패치와 무관하게 원본 OS 스레드에서 실행하는 고정 크기 풀 (gevent 프로세스의 루프 기본 실행기).
+    loop.set_default_executor가 ThreadPoolExecutor만 받으므로 상속하되, 작업 큐와 스레드는 원본 것을 쓴다"""
+
+    def __init__(self, max_workers: int):
+        super().__init__(max_workers=max_workers, thread_name_prefix="async-executor")
+        self._native_queue = _gevent_monkey.get_original("queue", "SimpleQueue")()
+        start_new_thread = _gevent_monkey.get_original("_thread", "start_new_thread")
+        for _ in range(max_workers):
+            start_new_thread(self._native_worker, ())
+
+    def _native_worker(self) -> None:
+        while True:
+            item = self._native_queue.get()
+            if item is None:
+                return
+            future, fn, args, kwargs = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def submit(self, fn, /, *args, **kwargs) -> concurrent.futures.Future:
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        self._native_queue.put((future, fn, args, kwargs))
+        return future
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        for _ in range(self._max_workers):
+            self._native_queue.put(None)
+
+
+def _gevent_patched() -> bool:
+    return _HAS_GEVENT and _gevent_monkey.is_module_patched("threading")
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            if _gevent_patched():
+                # 패치 전 원본 셀렉터/스레드로 루프를 OS 스레드에서 실행
+                selector = _gevent_monkey.get_original("selectors", "DefaultSelector")()
+                loop = asyncio.SelectorEventLoop(selector)
+                workers = int(os.getenv("ASYNC_EXECUTOR_THREADS", str(min(32, (os.cpu_count() or 1) + 4))))
+                loop.set_default_executor(_NativeThreadPool(workers))
+                # threading.Thread는 원본 클래스라도 패치된 _start_new_thread로 시작해 그린렛이 되므로 _thread를 직접 사용
+                _gevent_monkey.get_original("_thread", "start_new_thread")(loop.run_forever, ())
+            else:
+                loop = asyncio.new_event_loop()
+                t = threading.Thread(target=loop.run_forever, name="async-pipeline-loop", daemon=True)
+                t.start()
+            _loop = loop
+        return _loop
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """코루틴을 공유 백그라운드 루프에서 실행하고 결과를 블로킹으로 반환."""
+    loop = _background_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("run_sync()는 공유 이벤트 루프 안에서 호출할 수 없습니다. await를 사용하세요.")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
@@ -0,0 +1,4 @@
+"""오프라인 벤치마크: 로컬 스텁 서버(OpenAI/Pexels/YouTube/Blogger)로 파이프라인 처리량 측정.
+
+실행: python -m benchmarks.run_benchmark --conversions 20 --concurrency 4
+"""
@@ -0,0 +1,178 @@
+"""파이프라인 오프라인 벤치마크.
+
+로컬 스텁 서버를 띄우고 환경변수로 모든 외부 호출을 스텁으로 돌린 뒤
+1) YouTubeAutoBlogger.agenerate_full_auto_package 직접 호출
+2) (--flask) premium_auto_blogger_web의 /api/convert 엔드포인트
+를 지정한 동시성으로 실행해 초당 변환 수, 단계별 지연(p50/p95/p99), 메모리를 보고한다.
+
+사용 예:
+    python -m benchmarks.run_benchmark --conversions 20 --concurrency 4 --llm-latency-ms 300
+    python -m benchmarks.run_benchmark --flask --publish --error-rate 0.02 --json
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from benchmarks.stub_servers import StubConfig, StubServer
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _video_url(i: int) -> str:
+    return f"https://www.youtube.com/watch?v=bench{i:06d}"
+
+
+def _configure_env(stub: StubServer, args) -> None:
+    os.environ.update(stub.env())
+    os.environ["ANALYSIS_MODE"] = args.mode
+    if not args.warm_cache:
+        for name in ("LLM_CACHE_ENABLED", "TRANSCRIPT_CACHE_ENABLED", "KEYWORD_TRANSLATION_CACHE_ENABLED"):
+            os.environ[name] = "0"
+
+
+def run_direct(args, stub: StubServer) -> Dict:
+    from async_support import run_sync
+    from blogger_service import get_blogger_service
+    from youtube_auto_blogger import YouTubeAutoBlogger
+
+    blogger = YouTubeAutoBlogger(pexels_api_key=os.environ["PEXELS_API_KEY"])
+    blog_id = None
+    if args.publish:
+        blogger.blogger_service = get_blogger_service()  # BLOGGER_API_ENDPOINT → 스텁, 스레드별 전송
+        blog_id = "1000"
+
+    async def _one(i: int, semaphore: asyncio.Semaphore) -> float:
+        async with semaphore:
+            started = time.perf_counter()
+            package = await blogger.agenerate_full_auto_package(
+                _video_url(i), blog_id=blog_id, min_len=args.min_len, max_len=args.max_len)
+            elapsed = time.perf_counter() - started
+            return elapsed if package.get("success") else -elapsed
+
+    async def _all() -> List[float]:
+        semaphore = asyncio.Semaphore(args.concurrency)
+        return await asyncio.gather(*(_one(i, semaphore) for i in range(args.conversions)))
+
+    started = time.perf_counter()
+    results = run_sync(_all())
+    return _summarize("direct", results, time.perf_counter() - started)
+
+
+def run_flask(args, stub: StubServer) -> Dict:
+    import premium_auto_blogger_web as web
+
+    web.auto_blogger.pexels_api_key = os.environ["PEXELS_API_KEY"]
+    web.auto_blogger.openai_api_key = os.environ["OPENAI_API_KEY"]
+
+    def _one(i: int) -> float:
+        client = web.app.test_client()
+        started = time.perf_counter()
+        resp = client.post("/api/convert", json={"youtube_url": _video_url(args.conversions + i)})
+        elapsed = time.perf_counter() - started
+        return elapsed if resp.status_code == 200 else -elapsed
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(_one, range(args.conversions)))
+    return _summarize("flask", results, time.perf_counter() - started)
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _summarize(name: str, results: List[float], wall: float) -> Dict:
+    ok = [r for r in results if r >= 0]
+    return {
+        "driver": name,
+        "conversions": len(results),
+        "succeeded": len(ok),
+        "failed": len(results) - len(ok),
+        "wall_seconds": wall,
+        "conversions_per_sec": len(ok) / wall if wall > 0 else 0.0,
+        "latency": {"p50": _percentile(ok, 0.5), "p95": _percentile(ok, 0.95), "p99": _percentile(ok, 0.99)},
+    }
+
+
+def _print_report(report: Dict) -> None:
+    for run in report["runs"]:
+        print(f"\n[{run['driver']}] {run['succeeded']}/{run['conversions']} 성공, "
+              f"{run['wall_seconds']:.2f}s, {run['conversions_per_sec']:.2f} conv/s, "
+              f"p50 {run['latency']['p50']:.2f}s / p95 {run['latency']['p95']:.2f}s / p99 {run['latency']['p99']:.2f}s")
+    for section in ("stages", "llm_calls"):
+        rows = report["metrics"].get(section) or {}
+        if not rows:
+            continue
+        print(f"\n{section:<16}{'count':>7}{'mean':>9}{'p50':>9}{'p95':>9}{'p99':>9}")
+        for stage, s in sorted(rows.items()):
+            print(f"{stage:<16}{s['count']:>7}{s['mean']:>9.3f}{s['p50']:>9.3f}{s['p95']:>9.3f}{s['p99']:>9.3f}")
+    print(f"\nLLM 토큰: {report['metrics'].get('llm_tokens')}")
+    print(f"스텁 요청 수: {report['stub_requests']}")
+    mem = report["memory"]
+    print(f"메모리: tracemalloc 최대 {mem['tracemalloc_peak_mb']:.1f}MB, 최대 RSS {mem['max_rss_mb']:.1f}MB")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="YouTube 자동 블로거 오프라인 벤치마크")
+    parser.add_argument("--conversions", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Pexels/YouTube/Blogger 스텁 지연")
+    parser.add_argument("--llm-latency-ms", type=float, default=400.0, help="OpenAI 스텁 지연")
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--transcript-lines", type=int, default=400)
+    parser.add_argument("--mode", default="single_pass", choices=["single_pass", "chain", "outline"])
+    parser.add_argument("--min-len", type=int, default=3000)
+    parser.add_argument("--max-len", type=int, default=4000)
+    parser.add_argument("--publish", action="store_true", help="스텁 Blogger로 게시까지 포함")
+    parser.add_argument("--flask", action="store_true", help="/api/convert 엔드포인트도 측정")
+    parser.add_argument("--warm-cache", action="store_true", help="LLM/스크립트/번역 캐시를 켠 채 측정")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args(argv)
+
+    config = StubConfig(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+                        llm_latency_ms=args.llm_latency_ms, transcript_lines=args.transcript_lines, seed=7)
+    stub = StubServer(config).start()
+    _configure_env(stub, args)
+    sys.path.insert(0, REPO_ROOT)
+    workdir = tempfile.mkdtemp(prefix="bench-")
+    os.chdir(workdir)  # 캐시 DB/토큰 파일이 저장소를 더럽히지 않도록
+
+    from metrics import get_metrics
+
+    tracemalloc.start()
+    runs = [run_direct(args, stub)]
+    if args.flask:
+        runs.append(run_flask(args, stub))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    report = {
+        "config": vars(args),
+        "runs": runs,
+        "metrics": get_metrics().snapshot(),
+        "stub_requests": dict(config.requests),
+        "memory": {"tracemalloc_peak_mb": peak / 1024 / 1024,
+                   "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024},
+    }
+    stub.stop()
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        _print_report(report)
+    return 0 if all(run["failed"] == 0 for run in runs) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,226 @@
+"""서버 모드 부하 벤치마크: 유휴 SSE 연결 다수 + 동시 변환.
+
+스텁 서버를 띄우고 gunicorn(gunicorn.conf.py)으로 premium_auto_blogger_web을 실행한 뒤
+1) /api/log-stream에 --sse-clients개 연결을 열어 둔 채
+2) /api/convert를 --conversions개(동시 --concurrency) 보내면서
+3) /api/health 응답 지연을 주기적으로 측정한다.
+SSE 연결 유지 수, 연결당 수신 이벤트 수, 변환 성공/지연, health 지연(p50/p95/최대)을 보고한다.
+
+사용 예:
+    python -m benchmarks.sse_benchmark --server-mode gevent --sse-clients 500 --conversions 8
+    python -m benchmarks.sse_benchmark --server-mode gthread --sse-clients 20 --json
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+import httpx
+
+from benchmarks.run_benchmark import REPO_ROOT, _configure_env, _percentile, _summarize, _video_url
+from benchmarks.stub_servers import StubConfig, StubServer
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _start_server(args, port: int, workdir: str) -> subprocess.Popen:
+    env = dict(os.environ)
+    env.update({
+        "SERVER_MODE": args.server_mode,
+        "GUNICORN_WORKERS": str(args.workers),
+        "GUNICORN_THREADS": str(args.threads),
+        "GUNICORN_BIND": f"127.0.0.1:{port}",
+        "EVENT_BUS": "sqlite" if args.workers > 1 else "local",
+        "EVENT_BUS_PATH": os.path.join(workdir, "event_bus.sqlite3"),
+        "PYTHONPATH": REPO_ROOT + os.pathsep + env.get("PYTHONPATH", ""),
+    })
+    cmd = [sys.executable, "-m", "gunicorn", "-c", os.path.join(REPO_ROOT, "gunicorn.conf.py"),
+           "premium_auto_blogger_web:app"]
+    log = open(os.path.join(workdir, "gunicorn.log"), "wb")
+    return subprocess.Popen(cmd, cwd=workdir, env=env, stdout=log, stderr=subprocess.STDOUT)
+
+
+def _wait_ready(base_url: str, timeout: float = 60.0) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"{base_url}/api/health", timeout=2.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.3)
+    raise RuntimeError("gunicorn이 시작되지 않았습니다 (gunicorn.log 확인)")
+
+
+async def _sse_client(client: httpx.AsyncClient, url: str, state: Dict, stop: asyncio.Event) -> None:
+    """연결을 열어 두고 이벤트 수를 센다. 끊기면 dropped로 기록"""
+    entry = {"connected": False, "events": 0, "dropped": False}
+    state["clients"].append(entry)
+    try:
+        async with client.stream("GET", url, timeout=httpx.Timeout(None, connect=30.0)) as resp:
+            async for line in resp.aiter_lines():
+                if line.startswith("retry:"):
+                    entry["connected"] = True
+                elif line.startswith("id:"):
+                    entry["events"] += 1
+                if stop.is_set():
+                    return
+        entry["dropped"] = not stop.is_set()
+    except asyncio.CancelledError:
+        pass
+    except Exception:
+        entry["dropped"] = True
+
+
+async def _run(args, base_url: str) -> Dict:
+    limits = httpx.Limits(max_connections=args.sse_clients + args.concurrency + 10, max_keepalive_connections=0)
+    stop = asyncio.Event()
+    state: Dict = {"clients": []}
+    async with httpx.AsyncClient(limits=limits, trust_env=False) as client:
+        sse_tasks = [asyncio.create_task(_sse_client(client, f"{base_url}/api/log-stream", state, stop))
+                     for _ in range(args.sse_clients)]
+        started = time.perf_counter()
+        while time.perf_counter() - started < args.connect_timeout:
+            if sum(c["connected"] for c in state["clients"]) >= args.sse_clients:
+                break
+            await asyncio.sleep(0.1)
+        connect_seconds = time.perf_counter() - started
+
+        health: List[float] = []
+        health_failures = 0
+        converting = True
+
+        async def _probe() -> None:
+            nonlocal health_failures
+            while converting:
+                t0 = time.perf_counter()
+                try:
+                    resp = await client.get(f"{base_url}/api/health", timeout=args.probe_timeout)
+                    if resp.status_code == 200:
+                        health.append(time.perf_counter() - t0)
+                    else:
+                        health_failures += 1
+                except httpx.HTTPError:
+                    health_failures += 1
+                await asyncio.sleep(0.2)
+
+        semaphore = asyncio.Semaphore(args.concurrency)
+
+        async def _convert(i: int) -> float:
+            async with semaphore:
+                t0 = time.perf_counter()
+                try:
+                    resp = await client.post(f"{base_url}/api/convert", json={"youtube_url": _video_url(i)},
+                                             timeout=args.convert_timeout)
+                    ok = resp.status_code == 200
+                except httpx.HTTPError:
+                    ok = False
+                elapsed = time.perf_counter() - t0
+                return elapsed if ok else -elapsed
+
+        probe = asyncio.create_task(_probe())
+        t0 = time.perf_counter()
+        results = await asyncio.gather(*(_convert(i) for i in range(args.conversions)))
+        wall = time.perf_counter() - t0
+        converting = False
+        await probe
+        await asyncio.sleep(0.5)  # 마지막 로그 이벤트 수신 대기
+
+        stop.set()
+        for task in sse_tasks:
+            task.cancel()
+        await asyncio.gather(*sse_tasks, return_exceptions=True)
+
+    clients = state["clients"]
+    events = [c["events"] for c in clients if c["connected"]]
+    return {
+        "sse": {
+            "clients": len(clients),
+            "connected": sum(c["connected"] for c in clients),
+            "dropped": sum(c["dropped"] for c in clients),
+            "connect_seconds": connect_seconds,
+            "events_min": min(events) if events else 0,
+            "events_mean": sum(events) / len(events) if events else 0.0,
+        },
+        "convert": _summarize("gunicorn", results, wall),
+        "health": {
+            "probes": len(health) + health_failures,
+            "failures": health_failures,
+            "p50": _percentile(health, 0.5),
+            "p95": _percentile(health, 0.95),
+            "max": max(health) if health else 0.0,
+        },
+    }
+
+
+def _print_report(report: Dict) -> None:
+    sse, conv, health = report["sse"], report["convert"], report["health"]
+    print(f"\n[{report['config']['server_mode']}] SSE {sse['connected']}/{sse['clients']} 연결 "
+          f"({sse['connect_seconds']:.2f}s), 끊김 {sse['dropped']}, 연결당 이벤트 최소 {sse['events_min']} / "
+          f"평균 {sse['events_mean']:.1f}")
+    print(f"변환 {conv['succeeded']}/{conv['conversions']} 성공, {conv['wall_seconds']:.2f}s, "
+          f"p50 {conv['latency']['p50']:.2f}s / p95 {conv['latency']['p95']:.2f}s")
+    print(f"health {health['probes'] - health['failures']}/{health['probes']} 응답, "
+          f"p50 {health['p50'] * 1000:.0f}ms / p95 {health['p95'] * 1000:.0f}ms / 최대 {health['max'] * 1000:.0f}ms")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="유휴 SSE 연결 + 동시 변환 서버 벤치마크")
+    parser.add_argument("--server-mode", default="gevent", choices=["gevent", "gthread"])
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=4, help="gthread 모드의 워커당 스레드 수")
+    parser.add_argument("--sse-clients", type=int, default=300)
+    parser.add_argument("--conversions", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Pexels/YouTube/Blogger 스텁 지연")
+    parser.add_argument("--llm-latency-ms", type=float, default=400.0, help="OpenAI 스텁 지연")
+    parser.add_argument("--mode", default="single_pass", choices=["single_pass", "chain", "outline"])
+    parser.add_argument("--connect-timeout", type=float, default=30.0, help="SSE 연결을 모두 여는 데 기다릴 시간")
+    parser.add_argument("--probe-timeout", type=float, default=5.0)
+    parser.add_argument("--convert-timeout", type=float, default=300.0)
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args(argv)
+    args.warm_cache = False
+
+    config = StubConfig(latency_ms=args.latency_ms, jitter_ms=20.0, llm_latency_ms=args.llm_latency_ms, seed=7)
+    stub = StubServer(config).start()
+    _configure_env(stub, args)
+    workdir = tempfile.mkdtemp(prefix="bench-sse-")
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = _start_server(args, port, workdir)
+    try:
+        _wait_ready(base_url)
+        report = asyncio.run(_run(args, base_url))
+    finally:
+        server.send_signal(signal.SIGTERM)
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+        stub.stop()
+
+    report["config"] = vars(args)
+    report["server_log"] = os.path.join(workdir, "gunicorn.log")
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        _print_report(report)
+    ok = (report["sse"]["connected"] == args.sse_clients and report["sse"]["dropped"] == 0
+          and report["convert"]["failed"] == 0 and report["health"]["failures"] == 0)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,349 @@
+"""외부 API 로컬 스텁 서버.
+
+실제 API와 같은 형태의 응답을 돌려주며, 지연(latency_ms ± jitter_ms)과 오류율(error_rate)을 설정할 수 있다.
+- OpenAI   POST /v1/chat/completions (stream 포함), GET /v1/models
+- Pexels   GET  /v1/search
+- YouTube  GET  /timedtext (type=list / lang=..), GET /oembed
+- Blogger  POST /blogger/v3/blogs/{blogId}/posts, POST /blogger/v3/blogs/{blogId}/posts/{postId}/publish,
+           PATCH/DELETE /blogger/v3/blogs/{blogId}/posts/{postId}, GET /blogger/v3/users/self/blogs,
+           POST /batch/blogger/v3 (multipart/mixed 배치)
+
+하나의 HTTP 서버가 모든 경로를 처리하므로 base URL만 각 설정에 넣으면 된다.
+"""
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+_SENTENCES = [
+    "인공지능 도구는 반복 업무를 줄이고 의사결정 속도를 높여 줍니다.",
+    "실제로 한 제조 기업은 자동화 도입 후 불량률을 18% 낮췄습니다.",
+    "처음에는 작은 업무부터 시범 적용해 효과를 측정하는 것이 좋습니다.",
+    "데이터 품질이 낮으면 어떤 모델을 써도 결과가 불안정해집니다.",
+    "팀원 교육과 업무 프로세스 정비가 기술 도입만큼 중요합니다.",
+    "비용은 월 구독료보다 운영 인력의 학습 시간이 더 크게 차지합니다.",
+    "성과 지표는 처리 시간, 오류율, 고객 만족도처럼 측정 가능한 것으로 정합니다.",
+    "보안 정책을 먼저 정해 두면 외부 서비스 연동이 훨씬 수월합니다.",
+]
+_KEYWORDS = ["인공지능", "업무 자동화", "생산성", "데이터", "디지털 전환",
+             "기업 사례", "비용 절감", "교육", "보안", "성과 지표"]
+_EN = {"인공지능": "artificial intelligence", "업무 자동화": "work automation", "생산성": "productivity",
+       "데이터": "data", "디지털 전환": "digital transformation"}
+
+
+def korean_text(chars: int, paragraphs: int = 1) -> str:
+    """대략 chars 글자의 한국어 본문 (단락은 빈 줄로 구분)"""
+    per = max(1, chars // max(paragraphs, 1))
+    out = []
+    for p in range(paragraphs):
+        buf, i = [], p
+        while sum(len(s) + 1 for s in buf) < per:
+            buf.append(_SENTENCES[i % len(_SENTENCES)])
+            i += 3
+        out.append(" ".join(buf))
+    return "\n\n".join(out)
+
+
+class StubConfig:
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, error_rate: float = 0.0,
+                 llm_latency_ms: Optional[float] = None, transcript_lines: int = 400,
+                 content_chars: int = 3500, stream_chunk_chars: int = 20, seed: Optional[int] = None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.llm_latency_ms = latency_ms if llm_latency_ms is None else llm_latency_ms
+        self.transcript_lines = transcript_lines
+        self.content_chars = content_chars
+        self.stream_chunk_chars = stream_chunk_chars
+        self.random = random.Random(seed)
+        self.requests: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def count(self, route: str) -> None:
+        with self._lock:
+            self.requests[route] = self.requests.get(route, 0) + 1
+
+    def delay(self, llm: bool = False) -> bool:
+        """설정된 지연만큼 대기 후 이번 요청을 오류로 응답할지 반환"""
+        base = self.llm_latency_ms if llm else self.latency_ms
+        with self._lock:
+            jitter = self.random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+            fail = self.random.random() < self.error_rate
+        time.sleep(max(0.0, base + jitter) / 1000)
+        return fail
+
+
+def _make_handler(config: StubConfig):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        # --- 응답 보조 ---
+        def _send(self, status: int, body, content_type: str = "application/json") -> None:
+            raw = body if isinstance(body, bytes) else (
+                json.dumps(body, ensure_ascii=False) if not isinstance(body, str) else body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(raw)))
+            self.end_headers()
+            self.wfile.write(raw)
+
+        def _error(self, llm: bool = False) -> None:
+            if llm and config.random.random() < 0.5:
+                self.send_response(429)
+                self.send_header("Retry-After", "1")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self._send(500, {"error": {"message": "stub injected error"}})
+
+        def _body(self) -> Dict:
+            n = int(self.headers.get("Content-Length", 0) or 0)
+            try:
+                return json.loads(self.rfile.read(n) or b"{}")
+            except ValueError:
+                return {}
+
+        # --- 라우팅 ---
+        def do_GET(self):
+            url = urlparse(self.path)
+            q = {k: v[0] for k, v in parse_qs(url.query).items()}
+            if url.path.endswith("/models"):
+                config.count("openai_models")
+                return self._send(200, {"object": "list", "data": [{"id": "gpt-4o-mini", "object": "model"}]})
+            if url.path.endswith("/search"):
+                config.count("pexels_search")
+                if config.delay():
+                    return self._error()
+                return self._send(200, self._pexels(q.get("query", ""), int(q.get("per_page", 1))))
+            if url.path.endswith("/timedtext"):
+                config.count("timedtext")
+                if config.delay():
+                    return self._error()
+                if q.get("type") == "list":
+                    return self._send(200, '<transcript_list><track id="0" lang_code="ko" name=""/>'
+                                           '<track id="1" lang_code="en" name=""/></transcript_list>', "text/xml")
+                lines = "".join(
+                    f'<text start="{i * 2.5}" dur="3">{_SENTENCES[i % len(_SENTENCES)]}</text>'
+                    + ('<text start="0" dur="1">[음악]</text>' if i % 25 == 0 else "")
+                    for i in range(config.transcript_lines)
+                )
+                return self._send(200, f"<transcript>{lines}</transcript>", "text/xml")
+            if url.path.endswith("/oembed"):
+                config.count("oembed")
+                if config.delay():
+                    return self._error()
+                return self._send(200, {"title": "업무 자동화로 생산성 높이는 법", "author_name": "stub", "type": "video"})
+            if url.path.endswith("/users/self/blogs"):
+                config.count("blogger_list")
+                return self._send(200, {"kind": "blogger#blogList", "items": [{"id": "1000", "name": "Stub Blog",
+                                                                                "url": "https://stub.blogspot.com/"}]})
+            self._send(404, {"error": "not found"})
+
+        def do_POST(self):
+            url = urlparse(self.path)
+            if url.path.rstrip("/").endswith("/batch/blogger/v3"):
+                return self._batch()
+            body = self._body()
+            if url.path.endswith("/chat/completions"):
+                config.count("chat_completions")
+                if config.delay(llm=True):
+                    return self._error(llm=True)
+                content = self._chat_content(body)
+                if body.get("stream"):
+                    return self._stream(body, content)
+                return self._send(200, {
+                    "id": "chatcmpl-stub", "object": "chat.completion", "model": body.get("model"),
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                    "usage": self._usage(body, content),
+                })
+            self._send(*self._blogger("POST", url, body))
+
+        def do_PATCH(self):
+            self._send(*self._blogger("PATCH", urlparse(self.path), self._body()))
+
+        def do_DELETE(self):
+            self._send(*self._blogger("DELETE", urlparse(self.path), {}))
+
+        def _blogger(self, method: str, url, body: Dict) -> tuple:
+            """Blogger posts 경로 처리 → (status, body). 배치 내부 요청도 같은 함수를 쓴다"""
+            m = re.search(r"/blogs/([^/]+)/posts/([^/]+)/publish$", url.path)
+            if method == "POST" and m:
+                config.count("blogger_publish")
+                if config.delay():
+                    return 500, {"error": {"code": 500, "message": "stub injected error"}}
+                return 200, self._post(m.group(1), m.group(2), status="SCHEDULED")
+            m = re.search(r"/blogs/([^/]+)/posts/?$", url.path)
+            if method == "POST" and m:
+                config.count("blogger_insert")
+                if config.delay():
+                    return 500, {"error": {"code": 500, "message": "stub injected error"}}
+                draft = parse_qs(url.query).get("isDraft", ["false"])[0] == "true"
+                post_id = str(config.random.randint(10 ** 9, 10 ** 10))
+                return 200, self._post(m.group(1), post_id, body.get("title", ""), status="DRAFT" if draft else "LIVE")
+            m = re.search(r"/blogs/([^/]+)/posts/([^/]+)$", url.path)
+            if m and method in ("PATCH", "DELETE"):
+                config.count(f"blogger_{method.lower()}")
+                if config.delay():
+                    return 500, {"error": {"code": 500, "message": "stub injected error"}}
+                if method == "DELETE":
+                    return 204, b""
+                return 200, self._post(m.group(1), m.group(2), body.get("title", ""))
+            return 404, {"error": {"code": 404, "message": "not found"}}
+
+        def _batch(self) -> None:
+            """multipart/mixed 배치: 각 파트의 HTTP 요청을 _blogger로 처리해 같은 형식으로 응답"""
+            config.count("blogger_batch")
+            boundary = re.search(r'boundary="?([^";]+)"?', self.headers.get("Content-Type", ""))
+            raw = self.rfile.read(int(self.headers.get("Content-Length", 0) or 0)).decode("utf-8")
+            if not boundary:
+                return self._send(400, {"error": "boundary missing"})
+            config.delay()
+            out_boundary = "batch_stub_boundary"
+            parts = []
+            for part in raw.split("--" + boundary.group(1))[1:]:
+                if part.startswith("--"):
+                    break
+                outer, _, http = part.replace("\r\n", "\n").partition("\n\n")
+                content_id = re.search(r"Content-ID:\s*<([^>]+)>", outer, re.I)
+                request_line, _, rest = http.strip("\n").partition("\n")
+                _, _, payload = rest.partition("\n\n")
+                method, target = request_line.split(" ")[:2]
+                try:
+                    body = json.loads(payload) if payload.strip() else {}
+                except ValueError:
+                    body = {}
+                status, result = self._blogger(method, urlparse(target), body)
+                text = result.decode("utf-8") if isinstance(result, bytes) else json.dumps(result, ensure_ascii=False)
+                cid = f"response-{content_id.group(1)}" if content_id else "response"
+                parts.append(f"--{out_boundary}\r\nContent-Type: application/http\r\nContent-ID: <{cid}>\r\n\r\n"
+                             f"HTTP/1.1 {status} {'OK' if status < 400 else 'Error'}\r\n"
+                             f"Content-Type: application/json; charset=UTF-8\r\n\r\n{text}\r\n")
+            self._send(200, "".join(parts) + f"--{out_boundary}--\r\n", f"multipart/mixed; boundary={out_boundary}")
+
+        # --- 페이로드 ---
+        @staticmethod
+        def _usage(body: Dict, content: str) -> Dict:
+            prompt = sum(len(m.get("content") or "") for m in body.get("messages") or [])
+            return {"prompt_tokens": prompt, "completion_tokens": len(content),
+                    "total_tokens": prompt + len(content)}
+
+        @staticmethod
+        def _chat_content(body: Dict) -> str:
+            prompt = "\n".join(m.get("content") or "" for m in body.get("messages") or [])
+            if body.get("response_format"):
+                if "영어로 번역" in prompt:
+                    words = re.findall(r'"([^"]+)"', prompt.split("키워드:", 1)[-1].split("\n", 1)[0])
+                    return json.dumps({w: _EN.get(w, "business technology") for w in words}, ensure_ascii=False)
+                outline = "section_points" in prompt
+                result = {
+                    "title": "업무 자동화로 생산성을 높이는 5가지 방법",
+                    "subheadings": ["도입 배경", "핵심 도구", "실제 사례", "비용과 효과", "시작하는 방법"],
+                    "keywords": _KEYWORDS,
+                    "meta_description": "업무 자동화 도입 방법과 사례, 비용과 효과를 정리했습니다.",
+                    "target_audience": "일반인",
+                }
+                if outline:
+                    result["section_points"] = ["배경", "도구", "사례", "비용", "시작"]
+                else:
+                    result["content"] = korean_text(config.content_chars, 5)
+                return json.dumps(result, ensure_ascii=False)
+            if "영어로 번역" in prompt:
+                return "artificial intelligence, work automation, productivity"
+            if "부분입니다" in prompt:  # map-reduce 청크 요약
+                return "\n".join(f"- {s}" for s in _SENTENCES[:4])
+            if "본문만 작성" in prompt:  # 섹션 본문
+                return korean_text(config.content_chars // 5, 2)
+            if "JSON" in prompt:  # chain 모드 초안
+                return Handler._chat_content({**body, "response_format": {"type": "json_object"}})
+            return korean_text(config.content_chars, 5)
+
+        def _stream(self, body: Dict, content: str) -> None:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+
+            def write(raw: bytes) -> None:
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(raw), raw))
+
+            step = config.stream_chunk_chars
+            for i in range(0, len(content), step):
+                chunk = {"choices": [{"index": 0, "delta": {"content": content[i:i + step]}}]}
+                write(("data: " + json.dumps(chunk, ensure_ascii=False) + "\n\n").encode("utf-8"))
+            write(("data: " + json.dumps({"choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}) + "\n\n").encode())
+            write(("data: " + json.dumps({"choices": [], "usage": self._usage(body, content)}) + "\n\n").encode())
+            write(b"data: [DONE]\n\n")
+            self.wfile.write(b"0\r\n\r\n")
+
+        @staticmethod
+        def _pexels(query: str, per_page: int) -> Dict:
+            photos = []
+            for i in range(per_page):
+                pid = abs(hash((query, i))) % 10 ** 7
+                w, h = [(1920, 1080), (6000, 4000), (3000, 4500), (1280, 720)][i % 4]
+                photos.append({
+                    "id": pid, "width": w, "height": h, "alt": f"{query} photo {i}",
+                    "photographer": "stub",
+                    "src": {"original": f"https://images.pexels.test/{pid}.jpeg",
+                            "large": f"https://images.pexels.test/{pid}.jpeg?h=650",
+                            "landscape": f"https://images.pexels.test/{pid}.jpeg?fit=crop"},
+                })
+            return {"page": 1, "per_page": per_page, "total_results": 1000, "photos": photos}
+
+        @staticmethod
+        def _post(blog_id: str, post_id: str, title: str = "", status: str = "LIVE") -> Dict:
+            return {"kind": "blogger#post", "id": post_id, "blog": {"id": blog_id}, "title": title,
+                    "status": status, "url": f"https://stub.blogspot.com/{post_id}.html"}
+
+    return Handler
+
+
+class StubServer:
+    """모든 스텁 경로를 처리하는 단일 HTTP 서버 (백그라운드 스레드)"""
+
+    def __init__(self, config: Optional[StubConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or StubConfig()
+        self._server = ThreadingHTTPServer((host, port), _make_handler(self.config))
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="benchmark-stub", daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def blogger_endpoint(self) -> str:
+        """googleapiclient client_options.api_endpoint 값"""
+        return f"{self.base_url}/blogger/v3/"
+
+    def start(self) -> "StubServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def env(self) -> Dict[str, str]:
+        """파이프라인이 스텁을 바라보도록 하는 환경변수"""
+        return {
+            "OPENAI_BASE_URL": f"{self.base_url}/v1",
+            "OPENAI_API_KEY": "stub-key",
+            "PEXELS_BASE_URL": f"{self.base_url}/v1",
+            "PEXELS_API_KEY": "stub-key",
+            "YOUTUBE_TIMEDTEXT_URL": f"{self.base_url}/timedtext",
+            "YOUTUBE_OEMBED_URL": f"{self.base_url}/oembed",
+            "BLOGGER_BATCH_URL": f"{self.base_url}/batch/blogger/v3",
+            "BLOGGER_API_ENDPOINT": self.blogger_endpoint,
+            # 실제 YouTube로 나가는 경로 차단
+            "PYTUBE_ENABLED": "0",
+            "CAPTION_RESOLVER_PARALLEL": "0",
+        }
@@ -0,0 +1,180 @@
+"""Blogger API 일괄 처리 (googleapiclient BatchHttpRequest).
+
+여러 insert / publish / revert / patch / delete 호출을 배치 요청 하나(최대 BLOGGER_BATCH_SIZE개)로 묶어 보낸다.
+- 각 작업 결과는 입력 순서대로 {"id", "op", "success", "status", "post", "error"}로 돌려준다
+- 429/5xx로 실패한 항목만 골라 지수 백오프 후 다시 배치로 보낸다 (BLOGGER_BATCH_RETRIES).
+  단 insert는 429일 때만 재시도한다: 5xx여도 게시물이 이미 만들어졌을 수 있어 다시 보내면 중복된다.
+  5xx insert는 실패로 돌려주고 호출자가 판단한다
+- schedule_posts: 예약 발행 게시물은 "초안 insert 배치 → publish 배치" 두 단계라
+  한 달치 예약도 HTTP 호출 몇 번으로 끝난다
+- BLOGGER_BATCH_URL로 배치 엔드포인트를 바꿀 수 있다 (벤치마크 스텁 등)
+
+작업 형식 예:
+    {"op": "insert", "blog_id": "123", "post": {"title": ..., "content": ..., "labels": [...]}, "is_draft": True}
+    {"op": "publish", "blog_id": "123", "post_id": "456", "publish_date": "2025-01-01T09:00:00+09:00"}
+    {"op": "patch", "blog_id": "123", "post_id": "456", "post": {"title": "새 제목"}}
+    {"op": "delete", "blog_id": "123", "post_id": "456"}
+"""
+import os
+import random
+import time
+from typing import Dict, List, Optional
+
+from googleapiclient.errors import HttpError
+from googleapiclient.http import BatchHttpRequest
+
+OPERATIONS = ("insert", "publish", "revert", "patch", "delete")
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+INSERT_RETRYABLE_STATUSES = (429,)  # 요청이 처리되지 않았음이 확실한 경우만
+MAX_BATCH_SIZE = 50  # Blogger 배치 요청당 권장 최대 호출 수
+
+
+def _batch_size(size: Optional[int] = None) -> int:
+    return max(1, min(MAX_BATCH_SIZE, int(size or os.getenv("BLOGGER_BATCH_SIZE", str(MAX_BATCH_SIZE)))))
+
+
+def _build_request(service, operation: Dict):
+    """작업 dict → googleapiclient HttpRequest (잘못된 작업은 ValueError)"""
+    op = operation.get("op")
+    blog_id = operation.get("blog_id")
+    post_id = operation.get("post_id")
+    if op not in OPERATIONS:
+        raise ValueError(f"지원하지 않는 작업: {op}")
+    if not blog_id:
+        raise ValueError("blog_id가 필요합니다.")
+    if op != "insert" and not post_id:
+        raise ValueError(f"{op} 작업에는 post_id가 필요합니다.")
+
+    posts = service.posts()
+    if op == "insert":
+        post = dict(operation.get("post") or {})
+        if not post.get("title"):
+            raise ValueError("insert 작업에는 post.title이 필요합니다.")
+        post.setdefault("kind", "blogger#post")
+        post.setdefault("blog", {"id": blog_id})
+        return posts.insert(blogId=blog_id, body=post, isDraft=bool(operation.get("is_draft", False)))
+    if op == "publish":
+        kwargs = {"publishDate": operation["publish_date"]} if operation.get("publish_date") else {}
+        return posts.publish(blogId=blog_id, postId=post_id, **kwargs)
+    if op == "revert":
+        return posts.revert(blogId=blog_id, postId=post_id)
+    if op == "patch":
+        return posts.patch(blogId=blog_id, postId=post_id, body=operation.get("post") or {})
+    return posts.delete(blogId=blog_id, postId=post_id)
+
+
+def _new_batch(service, callback) -> BatchHttpRequest:
+    batch_url = os.getenv("BLOGGER_BATCH_URL")
+    if batch_url:
+        return BatchHttpRequest(callback=callback, batch_uri=batch_url)
+    return service.new_batch_http_request(callback=callback)
+
+
+def _error_status(exception: Exception) -> Optional[int]:
+    if isinstance(exception, HttpError):
+        try:
+            return int(exception.resp.status)
+        except Exception:
+            return None
+    return None
+
+
+def _error_message(exception: Exception) -> str:
+    if isinstance(exception, HttpError):
+        try:
+            return exception._get_reason() or str(exception)
+        except Exception:
+            pass
+    return str(exception)
+
+
+def execute_operations(service, operations: List[Dict], batch_size: Optional[int] = None,
+                       retries: Optional[int] = None) -> List[Dict]:
+    """작업 목록을 배치로 실행하고 입력 순서대로 항목별 결과를 반환.
+    배치 전송 자체가 실패하면(네트워크 등) 해당 배치의 모든 항목을 실패로 기록한다."""
+    size = _batch_size(batch_size)
+    retries = int(retries if retries is not None else os.getenv("BLOGGER_BATCH_RETRIES", "2"))
+    results: List[Dict] = []
+    requests: Dict[int, object] = {}
+    for index, operation in enumerate(operations):
+        result = {"id": operation.get("id", index), "op": operation.get("op"), "post_id": operation.get("post_id"),
+                  "success": False, "status": None, "post": None, "error": None}
+        results.append(result)
+        try:
+            requests[index] = _build_request(service, operation)
+        except Exception as e:
+            result["error"] = str(e)
+
+    pending = list(requests)
+    attempt = 0
+    while pending:
+        retry: List[int] = []
+
+        def _callback(request_id, response, exception):
+            index = int(request_id)
+            result = results[index]
+            if exception is None:
+                result.update(success=True, status=200, error=None,
+                              post=response if isinstance(response, dict) and response else None)
+                if result["post"] and result["post"].get("id"):
+                    result["post_id"] = result["post"]["id"]
+                return
+            status = _error_status(exception)
+            result.update(success=False, status=status, error=_error_message(exception))
+            retryable = INSERT_RETRYABLE_STATUSES if result["op"] == "insert" else RETRYABLE_STATUSES
+            if status in retryable:
+                retry.append(index)
+
+        for start in range(0, len(pending), size):
+            chunk = pending[start:start + size]
+            batch = _new_batch(service, _callback)
+            for index in chunk:
+                batch.add(requests[index], request_id=str(index))
+            try:
+                batch.execute()
+            except Exception as e:
+                for index in chunk:
+                    results[index].update(success=False, status=_error_status(e), error=f"배치 요청 실패: {e}")
+
+        if not retry or attempt >= retries:
+            break
+        attempt += 1
+        delay = min(30.0, 2 ** attempt) / 2
+        time.sleep(delay + random.uniform(0, delay))
+        pending = sorted(retry)
+    return results
+
+
+def schedule_posts(service, blog_id: str, posts: List[Dict], batch_size: Optional[int] = None) -> List[Dict]:
+    """여러 게시물을 한 번에 작성. posts 항목: {"title", "content", "labels", "publish_at_iso", "is_draft"}
+    publish_at_iso가 있으면 초안으로 만든 뒤 해당 시각으로 예약 발행, 없으면 is_draft에 따라 즉시 발행/초안.
+    반환: 입력 순서대로 {"success", "post_id", "url", "status", "error", "scheduled"}"""
+    inserts = []
+    for post in posts:
+        scheduled = bool(post.get("publish_at_iso"))
+        inserts.append({
+            "op": "insert", "blog_id": blog_id, "is_draft": scheduled or bool(post.get("is_draft")),
+            "post": {"title": post.get("title"), "content": post.get("content", ""), "labels": post.get("labels") or []},
+        })
+    inserted = execute_operations(service, inserts, batch_size)
+
+    publishes, publish_index = [], []
+    for index, (post, result) in enumerate(zip(posts, inserted)):
+        if result["success"] and post.get("publish_at_iso"):
+            publishes.append({"op": "publish", "blog_id": blog_id, "post_id": result["post_id"],
+                              "publish_date": post["publish_at_iso"]})
+            publish_index.append(index)
+    published = execute_operations(service, publishes, batch_size) if publishes else []
+
+    results = []
+    for post, result in zip(posts, inserted):
+        results.append({"success": result["success"], "post_id": result["post_id"],
+                        "url": (result["post"] or {}).get("url"), "status": result["status"],
+                        "error": result["error"], "scheduled": None})
+    for index, result in zip(publish_index, published):
+        entry = results[index]
+        entry.update(success=result["success"], status=result["status"], error=result["error"],
+                     scheduled=posts[index]["publish_at_iso"] if result["success"] else None)
+        if result["success"]:
+            entry["url"] = (result["post"] or {}).get("url") or entry["url"]
+    return results
@@ -0,0 +1,115 @@
+"""Blogger API 서비스 팩토리.
+
+- 디스커버리 문서는 로컬 사본에서 한 번만 읽는다 (BLOGGER_DISCOVERY_PATH, 없으면
+  google-api-python-client에 포함된 blogger.v3 문서). 시작 시 네트워크로 문서를 받지 않는다
+- 자격 증명(credentials)마다 서비스 객체를 하나만 만들어 재사용
+- httplib2.Http는 스레드 안전하지 않으므로 실제 Resource/HTTP 전송은 스레드별로 따로 둔다
+- BLOGGER_API_ENDPOINT로 API 주소를 바꿀 수 있다 (벤치마크 스텁 등)
+"""
+import json
+import os
+import threading
+import weakref
+from typing import Optional
+
+import google_auth_httplib2
+import httplib2
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+
+API_NAME = "blogger"
+API_VERSION = "v3"
+
+
+class ThreadLocalBloggerService:
+    """Blogger Resource 대리 객체. 속성 접근 시 현재 스레드 전용 Resource로 위임한다."""
+
+    def __init__(self, factory: "BloggerServiceFactory", credentials=None):
+        self._factory = factory
+        self.credentials = credentials
+        self._local = threading.local()
+
+    def _resource(self):
+        resource = getattr(self._local, "resource", None)
+        if resource is None:
+            resource = self._factory.build_resource(self.credentials)
+            self._local.resource = resource
+        return resource
+
+    def __getattr__(self, name):
+        return getattr(self._resource(), name)
+
+
+class BloggerServiceFactory:
+    def __init__(self, discovery_path: Optional[str] = None, api_endpoint: Optional[str] = None,
+                 timeout: Optional[float] = None):
+        self.discovery_path = discovery_path or os.getenv("BLOGGER_DISCOVERY_PATH")
+        self.api_endpoint = api_endpoint or os.getenv("BLOGGER_API_ENDPOINT")
+        self.timeout = float(timeout or os.getenv("BLOGGER_HTTP_TIMEOUT", "60"))
+        self._document: Optional[str] = None
+        self._services: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+        self._anonymous: Optional[ThreadLocalBloggerService] = None
+        self._lock = threading.Lock()
+
+    def discovery_document(self) -> str:
+        """디스커버리 문서 JSON 문자열 (최초 1회 로드 후 캐시)"""
+        with self._lock:
+            if self._document is None:
+                if self.discovery_path:
+                    with open(self.discovery_path, "r", encoding="utf-8") as f:
+                        document = f.read()
+                else:
+                    document = get_static_doc(API_NAME, API_VERSION)
+                if not document:
+                    raise RuntimeError("Blogger 디스커버리 문서를 찾을 수 없습니다.")
+                json.loads(document)  # 손상된 문서는 여기서 바로 실패
+                self._document = document
+            return self._document
+
+    def build_resource(self, credentials=None):
+        """현재 스레드 전용 Resource 생성 (HTTP 전송 객체도 새로 만든다)"""
+        http = httplib2.Http(timeout=self.timeout)
+        if credentials is not None:
+            http = google_auth_httplib2.AuthorizedHttp(credentials, http=http)
+        client_options = {"api_endpoint": self.api_endpoint} if self.api_endpoint else None
+        return build_from_document(self.discovery_document(), http=http, client_options=client_options)
+
+    def get(self, credentials=None) -> ThreadLocalBloggerService:
+        """자격 증명별로 캐시된 서비스 (credentials=None이면 인증 없는 서비스)"""
+        with self._lock:
+            if credentials is None:
+                if self._anonymous is None:
+                    self._anonymous = ThreadLocalBloggerService(self, None)
+                return self._anonymous
+            service = self._services.get(credentials)
+            if service is None:
+                service = ThreadLocalBloggerService(self, credentials)
+                self._services[credentials] = service
+            return service
+
+    def invalidate(self, credentials=None) -> None:
+        """자격 증명 교체/로그아웃 시 캐시된 서비스 제거 (None이면 전부)"""
+        with self._lock:
+            if credentials is None:
+                self._services = weakref.WeakKeyDictionary()
+                self._anonymous = None
+            else:
+                self._services.pop(credentials, None)
+
+
+_factory: Optional[BloggerServiceFactory] = None
+_factory_lock = threading.Lock()
+
+
+def get_service_factory() -> BloggerServiceFactory:
+    """프로세스 전역 팩토리 (지연 생성)"""
+    global _factory
+    with _factory_lock:
+        if _factory is None:
+            _factory = BloggerServiceFactory()
+        return _factory
+
+
+def get_blogger_service(credentials=None) -> ThreadLocalBloggerService:
+    """build('blogger', 'v3', credentials=...) 대신 사용하는 캐시된 서비스"""
+    return get_service_factory().get(credentials)
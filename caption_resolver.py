@@ -0,0 +1,129 @@
+"""YouTube 자막 탐색기.
+
+언어별로 순차 요청하며 탐색하던 방식을 대체한다.
+- 소스마다 트랙 목록을 한 번만 조회하고, 선호 언어는 로컬에서 선택한 뒤 해당 트랙만 한 번 받는다.
+- parallel=True면 timedtext와 youtube-transcript-api를 동시에 시도해 먼저 성공한 쪽을 사용.
+
+환경변수:
+  - CAPTION_RESOLVER_PARALLEL=0 → 순차 모드 (timedtext → transcript-api, 기본은 병렬)
+  - YOUTUBE_TIMEDTEXT_URL=...   → timedtext 엔드포인트 (기본 video.google.com, 벤치마크 스텁용)
+"""
+import asyncio
+import html
+import os
+import xml.etree.ElementTree as ET
+from typing import List, NamedTuple, Optional, Sequence
+
+from async_support import get_async_client
+from transcript_cache import SOURCE_TIMEDTEXT, SOURCE_TRANSCRIPT_API
+
+# Optional dependency: youtube-transcript-api for robust caption fetching
+try:
+    from youtube_transcript_api import YouTubeTranscriptApi
+except Exception:
+    YouTubeTranscriptApi = None
+
+PREFERRED_LANGS = ['ko', 'ko-KR', 'en', 'en-US', 'ja', 'zh-Hans', 'zh-Hant', 'zh']
+TIMEDTEXT_URL = "https://video.google.com/timedtext"
+
+
+class CaptionTrack(NamedTuple):
+    text: str
+    lang: str
+    source: str
+
+
+def pick_language(available: Sequence[str], preferred: Sequence[str] = PREFERRED_LANGS) -> Optional[str]:
+    """사용 가능한 언어 코드 중 선호 순서상 가장 앞선 것을 선택.
+    정확히 일치 → 기본 언어 일치(ko-KR ↔ ko) → 목록의 첫 번째 순.
+    """
+    if not available:
+        return None
+    for p in preferred:
+        if p in available:
+            return p
+    for p in preferred:
+        base = p.split('-')[0]
+        for code in available:
+            if code.split('-')[0] == base:
+                return code
+    return available[0]
+
+
+class CaptionResolver:
+    def __init__(self, preferred_langs: Optional[List[str]] = None, parallel: Optional[bool] = None,
+                 timedtext_url: Optional[str] = None):
+        self.preferred_langs = preferred_langs or list(PREFERRED_LANGS)
+        self.timedtext_url = timedtext_url or os.getenv("YOUTUBE_TIMEDTEXT_URL", TIMEDTEXT_URL)
+        if parallel is None:
+            parallel = os.getenv("CAPTION_RESOLVER_PARALLEL", "1") != "0"
+        self.parallel = parallel
+
+    async def aresolve(self, video_id: str) -> Optional[CaptionTrack]:
+        """자막 트랙 하나를 찾아 반환 (없으면 None)"""
+        sources = [self.afetch_timedtext]
+        if YouTubeTranscriptApi:
+            sources.append(self.afetch_transcript_api)
+        if not self.parallel:
+            for source in sources:
+                track = await source(video_id)
+                if track:
+                    return track
+            return None
+
+        pending = {asyncio.create_task(source(video_id)) for source in sources}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    track = None if task.exception() else task.result()
+                    if track:
+                        return track
+            return None
+        finally:
+            for task in pending:
+                task.cancel()
+
+    # --- timedtext: 목록 1회 + 선택 트랙 1회 ---
+    async def afetch_timedtext(self, video_id: str) -> Optional[CaptionTrack]:
+        try:
+            client = get_async_client()
+            r = await client.get(self.timedtext_url, params={"type": "list", "v": video_id}, timeout=10)
+            if r.status_code != 200 or not r.text.strip():
+                return None
+            tracks = ET.fromstring(r.text).findall('track')
+            lang = pick_language([t.get('lang_code') for t in tracks if t.get('lang_code')], self.preferred_langs)
+            if not lang:
+                return None
+
+            # 자막 다운로드 (XML)
+            r2 = await client.get(self.timedtext_url, params={"lang": lang, "v": video_id}, timeout=15)
+            if r2.status_code != 200 or not r2.text.strip():
+                return None
+            lines = []
+            for node in ET.fromstring(r2.text).findall('text'):
+                t = html.unescape(node.text or '').replace('\n', ' ').strip()
+                if t:
+                    lines.append(t)
+            text = "\n".join(lines)
+            return CaptionTrack(text, lang, SOURCE_TIMEDTEXT) if text.strip() else None
+        except Exception:
+            return None
+
+    # --- youtube-transcript-api: list_transcripts 1회 + fetch 1회 ---
+    async def afetch_transcript_api(self, video_id: str) -> Optional[CaptionTrack]:
+        try:
+            return await asyncio.to_thread(self._from_transcript_api, video_id)
+        except Exception:
+            return None
+
+    def _from_transcript_api(self, video_id: str) -> Optional[CaptionTrack]:
+        transcripts = list(YouTubeTranscriptApi.list_transcripts(video_id))
+        if not transcripts:
+            return None
+        lang = pick_language([t.language_code for t in transcripts], self.preferred_langs)
+        # 같은 언어라면 수동 자막을 자동 생성 자막보다 우선
+        candidates = sorted((t for t in transcripts if t.language_code == lang), key=lambda t: t.is_generated)
+        data = candidates[0].fetch()
+        text = "\n".join(seg['text'] for seg in data if seg.get('text'))
+        return CaptionTrack(text, lang, SOURCE_TRANSCRIPT_API) if text.strip() else None
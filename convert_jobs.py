@@ -0,0 +1,305 @@
+"""단일 변환 비동기 작업 (POST /api/convert?async=1).
+
+- 요청은 작업을 등록하고 바로 job_id를 돌려준다. 변환은 백그라운드 실행기(CONVERT_WORKERS 스레드)에서 진행
+- 작업 상태는 SQLite에 저장되므로 GET /api/jobs/<id>가 어느 gunicorn 워커로 가도 조회된다
+- 같은 페이로드의 작업이 대기/실행 중이거나 CONVERT_DEDUP_SECONDS 안에 성공했으면 새로 만들지 않고
+  그 작업을 돌려준다. 브라우저/프록시가 요청을 재시도해도 변환과 게시가 중복되지 않는다
+- 진행 단계(stages)는 지금 실행 중인 metrics.stage 이름(transcript, analysis, render, blogger_post ...)의 목록.
+  content_fix와 translate/image_search처럼 동시에 도는 단계는 함께 표시된다. 단계 변경은 메모리에만 적고
+  러너의 백그라운드 스레드가 모아서 SQLite에 쓴다 (이벤트 루프에서 DB를 쓰지 않도록)
+- 작업은 등록한 프로세스에서만 실행된다. 그 프로세스는 CONVERT_JOB_HEARTBEAT_SECONDS마다 자기 작업의
+  heartbeat_at을 갱신하고, 하트비트가 3주기 넘게 끊긴 작업(프로세스 종료/재시작)이나 CONVERT_JOB_TIMEOUT_SECONDS가
+  지나도 끝나지 않은 작업은 조회/등록 시 failed로 정리한다 (중복 판별이 죽은 작업에 합류하지 않음)
+
+환경변수:
+  - CONVERT_JOBS_PATH=...               → DB 파일 경로 (기본 convert_jobs.sqlite3)
+  - CONVERT_WORKERS=4                   → 프로세스당 동시 변환 수
+  - CONVERT_DEDUP_SECONDS=600           → 성공한 작업을 같은 요청에 다시 돌려주는 시간
+  - CONVERT_JOB_TIMEOUT_SECONDS=1800    → 미완료 작업을 중단으로 보는 시간
+  - CONVERT_JOB_HEARTBEAT_SECONDS=10    → 실행 프로세스의 하트비트 주기
+  - CONVERT_JOB_RETENTION_SECONDS=86400 → 끝난 작업 보관 시간
+"""
+import hashlib
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from job_queue import STATE_DONE, STATE_FAILED, STATE_QUEUED, STATE_RUNNING, TERMINAL_STATES
+from metrics import stage_listener
+
+
+def dedup_key(payload: Dict) -> str:
+    """페이로드 내용으로 만든 중복 판별 키 (키 순서와 무관)"""
+    canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ConvertJobStore:
+    def __init__(self, path: Optional[str] = None, dedup_seconds: Optional[float] = None,
+                 timeout_seconds: Optional[float] = None, retention_seconds: Optional[float] = None,
+                 heartbeat_seconds: Optional[float] = None):
+        self.path = path or os.getenv("CONVERT_JOBS_PATH", "convert_jobs.sqlite3")
+        self.dedup_seconds = dedup_seconds if dedup_seconds is not None else float(os.getenv("CONVERT_DEDUP_SECONDS", "600"))
+        self.timeout_seconds = timeout_seconds or float(os.getenv("CONVERT_JOB_TIMEOUT_SECONDS", "1800"))
+        self.retention_seconds = retention_seconds or float(os.getenv("CONVERT_JOB_RETENTION_SECONDS", "86400"))
+        self.heartbeat_seconds = heartbeat_seconds or float(os.getenv("CONVERT_JOB_HEARTBEAT_SECONDS", "10"))
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS convert_jobs ("
+            " id TEXT PRIMARY KEY, dedup_key TEXT NOT NULL, payload TEXT NOT NULL, state TEXT NOT NULL,"
+            " stage TEXT, owner TEXT, result TEXT, error TEXT, created_at REAL NOT NULL, updated_at REAL NOT NULL,"
+            " started_at REAL, finished_at REAL, heartbeat_at REAL);"
+            "CREATE INDEX IF NOT EXISTS idx_convert_jobs_dedup ON convert_jobs(dedup_key, created_at);"
+            "CREATE INDEX IF NOT EXISTS idx_convert_jobs_state ON convert_jobs(state, created_at);"
+        )
+        self._last_cleanup = 0.0
+
+    # --- 트랜잭션 ---
+    def _write(self, fn: Callable[[sqlite3.Connection], object]):
+        """BEGIN IMMEDIATE로 쓰기 잠금을 먼저 잡아 프로세스 간 경쟁을 막는다 (중복 등록 방지)"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = fn(self._conn)
+                self._conn.execute("COMMIT")
+                return result
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    @property
+    def stale_seconds(self) -> float:
+        """하트비트가 이만큼 끊기면 실행 프로세스가 죽은 것으로 본다"""
+        return self.heartbeat_seconds * 3
+
+    def _is_orphaned(self, row: sqlite3.Row, now: float) -> bool:
+        if row["state"] in TERMINAL_STATES:
+            return False
+        heartbeat = row["heartbeat_at"] or row["created_at"]
+        return now - row["created_at"] > self.timeout_seconds or now - heartbeat > self.stale_seconds
+
+    def _expire(self, conn: sqlite3.Connection, now: float) -> None:
+        """시간 안에 끝나지 않았거나 실행 프로세스가 사라진 작업을 failed로 정리 + 보관 기간이 지난 작업 삭제"""
+        conn.execute(
+            "UPDATE convert_jobs SET state = ?, error = ?, finished_at = ?, updated_at = ?"
+            " WHERE state IN (?, ?) AND created_at < ?",
+            (STATE_FAILED, "작업이 제한 시간 안에 끝나지 않았습니다 (중단됨)", now, now,
+             STATE_QUEUED, STATE_RUNNING, now - self.timeout_seconds),
+        )
+        conn.execute(
+            "UPDATE convert_jobs SET state = ?, error = ?, finished_at = ?, updated_at = ?"
+            " WHERE state IN (?, ?) AND COALESCE(heartbeat_at, created_at) < ?",
+            (STATE_FAILED, "작업을 실행하던 프로세스가 응답하지 않습니다 (중단됨)", now, now,
+             STATE_QUEUED, STATE_RUNNING, now - self.stale_seconds),
+        )
+        if now - self._last_cleanup > 600:
+            self._last_cleanup = now
+            conn.execute("DELETE FROM convert_jobs WHERE state IN (?, ?) AND finished_at < ?",
+                         (STATE_DONE, STATE_FAILED, now - self.retention_seconds))
+
+    # --- 등록/진행 ---
+    def submit(self, payload: Dict, owner: str) -> Tuple[Dict, bool]:
+        """작업 등록. 같은 페이로드의 진행 중(또는 최근 성공) 작업이 있으면 (그 작업, False)"""
+        key = dedup_key(payload)
+        job_id = uuid.uuid4().hex[:12]
+        now = time.time()
+
+        def _tx(conn):
+            self._expire(conn, now)
+            row = conn.execute(
+                "SELECT * FROM convert_jobs WHERE dedup_key = ?"
+                " AND (state IN (?, ?) OR (state = ? AND finished_at >= ?))"
+                " ORDER BY created_at DESC LIMIT 1",
+                (key, STATE_QUEUED, STATE_RUNNING, STATE_DONE, now - self.dedup_seconds),
+            ).fetchone()
+            if row:
+                return row, False
+            conn.execute(
+                "INSERT INTO convert_jobs (id, dedup_key, payload, state, owner, created_at, updated_at, heartbeat_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, key, json.dumps(payload, ensure_ascii=False), STATE_QUEUED, owner, now, now, now),
+            )
+            return conn.execute("SELECT * FROM convert_jobs WHERE id = ?", (job_id,)).fetchone(), True
+        row, created = self._write(_tx)
+        return self._job_dict(row), created
+
+    def _update(self, job_id: str, **fields) -> None:
+        fields["updated_at"] = time.time()
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        self._write(lambda conn: conn.execute(f"UPDATE convert_jobs SET {columns} WHERE id = ?",
+                                              (*fields.values(), job_id)))
+
+    def mark_running(self, job_id: str) -> None:
+        now = time.time()
+        self._update(job_id, state=STATE_RUNNING, started_at=now, heartbeat_at=now)
+
+    def set_stages(self, job_id: str, stages: List[str]) -> bool:
+        """실행 중인 작업의 현재 단계 목록 기록 (이미 끝난 작업이면 False)"""
+        cursor = self._write(lambda conn: conn.execute(
+            "UPDATE convert_jobs SET stage = ?, updated_at = ? WHERE id = ? AND state = ?",
+            (",".join(stages) or None, time.time(), job_id, STATE_RUNNING)))
+        return cursor.rowcount > 0
+
+    def heartbeat(self, owner: str) -> None:
+        """owner 프로세스의 미완료 작업이 살아 있음을 기록"""
+        now = time.time()
+        self._write(lambda conn: conn.execute(
+            "UPDATE convert_jobs SET heartbeat_at = ? WHERE owner = ? AND state IN (?, ?)",
+            (now, owner, STATE_QUEUED, STATE_RUNNING)))
+
+    def finish(self, job_id: str, result: Optional[Dict] = None, error: Optional[str] = None) -> None:
+        self._update(job_id, state=STATE_FAILED if error else STATE_DONE, error=error, finished_at=time.time(),
+                     result=json.dumps(result, ensure_ascii=False) if result is not None else None)
+
+    # --- 조회 ---
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM convert_jobs WHERE id = ?", (job_id,)).fetchone()
+        if row and self._is_orphaned(row, time.time()):
+            self._write(lambda conn: self._expire(conn, time.time()))
+            with self._lock:
+                row = self._conn.execute("SELECT * FROM convert_jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._job_dict(row) if row else None
+
+    @staticmethod
+    def _job_dict(row: sqlite3.Row) -> Dict:
+        return {
+            "id": row["id"],
+            "state": row["state"],
+            "stage": row["stage"],
+            "stages": row["stage"].split(",") if row["stage"] else [],
+            "finished": row["state"] in TERMINAL_STATES,
+            "payload": json.loads(row["payload"] or "{}"),
+            "result": json.loads(row["result"]) if row["result"] else None,
+            "error": row["error"],
+            "created_at": row["created_at"],
+            "started_at": row["started_at"],
+            "finished_at": row["finished_at"],
+        }
+
+
+class ConvertJobRunner:
+    """작업을 등록하고 이 프로세스의 스레드 풀에서 handler(job) → 결과 dict를 실행.
+    handler가 예외를 던지면 failed로 기록한다 (재시도하지 않음: 게시가 중복될 수 있으므로).
+    on_update(job)는 상태/단계가 바뀔 때마다 호출된다 (SSE 진행 이벤트용).
+    단계 기록과 하트비트는 첫 작업 등록 때 시작되는 백그라운드 스레드 하나가 맡는다."""
+
+    def __init__(self, store: ConvertJobStore, handler: Callable[[Dict], Dict],
+                 max_workers: Optional[int] = None, on_update: Optional[Callable[[Dict], None]] = None):
+        self.store = store
+        self.handler = handler
+        self.on_update = on_update
+        self.max_workers = max(1, int(max_workers or os.getenv("CONVERT_WORKERS", "4")))
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="convert-job")
+        self._cond = threading.Condition()
+        self._stages: Dict[str, List[str]] = {}  # job_id → 실행 중인 단계 (시작 순)
+        self._dirty: Set[str] = set()
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, payload: Dict) -> Tuple[Dict, bool]:
+        """(작업, 새로 만들었는지). 기존 작업에 합류한 경우 실행기에는 넣지 않는다"""
+        self._ensure_thread()
+        job, created = self.store.submit(payload, self.owner)
+        if created:
+            self._notify(job)
+            self._executor.submit(self._run, job)
+        return job, created
+
+    def _notify(self, job: Dict) -> None:
+        if self.on_update:
+            try:
+                self.on_update(job)
+            except Exception:
+                pass
+
+    # --- 단계/하트비트 ---
+    def _ensure_thread(self) -> None:
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._background, name="convert-job-heartbeat", daemon=True)
+                self._thread.start()
+
+    def _on_stage(self, job_id: str, stage: str, active: bool) -> None:
+        """metrics.stage 시작/종료 (이벤트 루프 스레드에서도 불림): 메모리만 갱신하고 기록은 백그라운드 스레드로"""
+        with self._cond:
+            stages = self._stages.get(job_id)
+            if stages is None:
+                return
+            if active and stage not in stages:
+                stages.append(stage)
+            elif not active and stage in stages:
+                stages.remove(stage)
+            else:
+                return
+            self._dirty.add(job_id)
+            self._cond.notify()
+
+    def _background(self) -> None:
+        last_beat = 0.0
+        while True:
+            with self._cond:
+                timeout = max(0.0, last_beat + self.store.heartbeat_seconds - time.time())
+                if not self._dirty:
+                    self._cond.wait(timeout)
+                changes = {job_id: list(self._stages[job_id]) for job_id in self._dirty if job_id in self._stages}
+                self._dirty.clear()
+            for job_id, stages in changes.items():
+                try:
+                    if self.store.set_stages(job_id, stages):
+                        self._notify({"id": job_id, "state": STATE_RUNNING, "stage": ",".join(stages) or None,
+                                      "stages": stages, "finished": False})
+                except Exception as e:
+                    print(f"⚠️ 작업 단계 기록 실패: {e}")
+            if time.time() - last_beat >= self.store.heartbeat_seconds:
+                last_beat = time.time()
+                try:
+                    self.store.heartbeat(self.owner)
+                except Exception as e:
+                    print(f"⚠️ 작업 하트비트 기록 실패: {e}")
+
+    def _run(self, job: Dict) -> None:
+        job_id = job["id"]
+        with self._cond:
+            self._stages[job_id] = []
+        try:
+            self.store.mark_running(job_id)
+            self._notify(dict(job, state=STATE_RUNNING))
+            with stage_listener(lambda stage, active: self._on_stage(job_id, stage, active)):
+                result = self.handler(job)
+            self._forget(job_id)
+            self.store.finish(job_id, result=result)
+        except Exception as e:
+            self._forget(job_id)
+            try:
+                self.store.finish(job_id, error=str(e))
+            except Exception as store_error:
+                print(f"⚠️ 작업 결과 기록 실패: {store_error}")
+        self._notify(self.store.get(job_id) or dict(job, state=STATE_FAILED, finished=True))
+
+    def _forget(self, job_id: str) -> None:
+        with self._cond:
+            self._stages.pop(job_id, None)
+            self._dirty.discard(job_id)
+
+
+_store: Optional[ConvertJobStore] = None
+_store_lock = threading.Lock()
+
+
+def get_convert_job_store() -> ConvertJobStore:
+    """프로세스 전역 변환 작업 저장소 (지연 생성)"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ConvertJobStore()
+        return _store
@@ -0,0 +1,261 @@
+"""Google OAuth 자격 증명 관리자.
+
+- token.pickle(GOOGLE_TOKEN_PATH)을 한 번 읽어 메모리에 보관하고, 이후에는 파일이 바뀐 경우에만 다시 읽는다
+- 백그라운드 스레드가 만료 GOOGLE_TOKEN_REFRESH_MARGIN_SECONDS초 전에 미리 갱신한다.
+  갱신은 같은 Credentials 객체를 제자리에서 바꾸므로, 이미 만든 Blogger 서비스도 그대로 새 토큰을 쓴다.
+  게시 호출은 갱신을 기다리지 않는다
+- 여러 gunicorn 워커가 같은 토큰 파일을 공유: 파일 잠금(token.pickle.lock) 안에서 다시 읽어
+  다른 워커가 이미 갱신했으면 그 토큰을 쓰고, 아니면 갱신 후 임시 파일 → os.replace로 원자적으로 교체한다
+"""
+import os
+import pickle
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+from google.auth.transport.requests import Request
+
+try:
+    import fcntl  # POSIX
+except ImportError:  # Windows
+    fcntl = None
+    try:
+        import msvcrt
+    except ImportError:
+        msvcrt = None
+
+
+class _FileLock:
+    """프로세스 간 배타 잠금 (fcntl.flock / msvcrt.locking, 둘 다 없으면 프로세스 내 잠금만)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self.path, "a+b")
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        elif msvcrt is not None:
+            self._file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.1)
+        return self
+
+    def __exit__(self, *exc):
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._file.close()
+            self._file = None
+
+
+def _seconds_left(creds) -> Optional[float]:
+    """만료까지 남은 초 (만료 시각을 모르면 None). google-auth의 expiry는 naive UTC"""
+    expiry = getattr(creds, "expiry", None)
+    if expiry is None:
+        return None
+    return (expiry - datetime.utcnow()).total_seconds()
+
+
+class CredentialManager:
+    def __init__(self, path: Optional[str] = None, refresh_margin: Optional[float] = None,
+                 check_interval: float = 60.0, retry_interval: float = 30.0):
+        self.path = path or os.getenv("GOOGLE_TOKEN_PATH", "token.pickle")
+        # google-auth는 만료 3분 45초 전부터 토큰을 만료로 보고 요청 중에 갱신하므로 그보다 앞서 갱신해야 한다
+        self.refresh_margin = float(refresh_margin or os.getenv("GOOGLE_TOKEN_REFRESH_MARGIN_SECONDS", "300"))
+        self.check_interval = check_interval
+        self.retry_interval = retry_interval
+        self._creds = None
+        self._mtime: Optional[float] = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self.last_refresh: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    # --- 파일 저장소 ---
+    def _file_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.path).st_mtime
+        except OSError:
+            return None
+
+    def _read_file(self):
+        with open(self.path, "rb") as f:
+            return pickle.load(f)
+
+    def _write_file(self, creds) -> None:
+        """임시 파일에 쓴 뒤 os.replace로 교체 (읽는 쪽은 항상 완전한 파일만 본다)"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp = tempfile.mkstemp(prefix=".token-", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(creds, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+        except Exception:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+        self._mtime = self._file_mtime()
+
+    def _file_lock(self) -> _FileLock:
+        return _FileLock(self.path + ".lock")
+
+    def _adopt(self, loaded) -> None:
+        """디스크에서 읽은 자격 증명 반영. 같은 계정(refresh_token)이면 기존 객체를 제자리에서 갱신"""
+        current = self._creds
+        if current is not None and loaded is not None and \
+                getattr(current, "refresh_token", None) == getattr(loaded, "refresh_token", None):
+            current.token = loaded.token
+            current.expiry = loaded.expiry
+        else:
+            self._creds = loaded
+
+    def _reload_if_changed(self) -> None:
+        mtime = self._file_mtime()
+        if mtime == self._mtime:
+            return
+        self._mtime = mtime
+        if mtime is None:
+            self._creds = None  # 다른 워커에서 로그아웃
+            return
+        try:
+            self._adopt(self._read_file())
+        except Exception as e:
+            self.last_error = f"토큰 파일 읽기 실패: {e}"
+
+    # --- 공개 API ---
+    def get(self):
+        """메모리의 자격 증명 (없으면 None). 갱신을 기다리지 않는다"""
+        with self._lock:
+            self._reload_if_changed()
+            creds = self._creds
+        if creds is not None:
+            self._ensure_thread()
+        return creds
+
+    def has_credentials(self) -> bool:
+        return self.get() is not None
+
+    def set(self, creds) -> None:
+        """새로 발급받은 자격 증명 저장 (OAuth 완료 시)"""
+        # 잠금 순서는 항상 파일 잠금 → self._lock (_refresh와 같게)
+        with self._file_lock(), self._lock:
+            self._write_file(creds)
+            self._creds = creds
+        self._ensure_thread()
+        self._wake.set()
+
+    def clear(self) -> None:
+        """로그아웃: 메모리와 토큰 파일 모두 제거"""
+        with self._file_lock(), self._lock:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+            self._creds = None
+            self._mtime = None
+
+    def refresh_now(self) -> bool:
+        """즉시 갱신 (인증 설정 화면처럼 기다려도 되는 곳에서만 사용)"""
+        return self._refresh(force=True)
+
+    def _refresh(self, force: bool = False) -> bool:
+        # self._lock은 짧게만 잡는다: 갱신(네트워크) 중에도 get()은 기존 토큰을 바로 돌려준다
+        with self._refresh_lock, self._file_lock():
+            with self._lock:
+                # 잠금을 기다리는 동안 다른 워커가 갱신했을 수 있으므로 파일을 다시 확인
+                self._reload_if_changed()
+                creds = self._creds
+            if creds is None or not getattr(creds, "refresh_token", None):
+                return False
+            left = _seconds_left(creds)
+            if not force and left is not None and left > self.refresh_margin:
+                return True
+            try:
+                creds.refresh(Request())
+                with self._lock:
+                    self._write_file(creds)
+            except Exception as e:
+                self.refresh_failures += 1
+                self.last_error = str(e)
+                print(f"⚠️ Google 토큰 갱신 실패: {e}")
+                return False
+        self.refreshes += 1
+        self.last_refresh = time.time()
+        self.last_error = None
+        print("🔑 Google 토큰을 미리 갱신했습니다.")
+        return True
+
+    # --- 백그라운드 갱신 ---
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="google-token-refresh", daemon=True)
+                self._thread.start()
+
+    def _next_check(self) -> float:
+        with self._lock:
+            self._reload_if_changed()
+            creds = self._creds
+        left = _seconds_left(creds) if creds is not None else None
+        if left is None:
+            return self.check_interval
+        return max(0.0, min(self.check_interval, left - self.refresh_margin))
+
+    def _run(self) -> None:
+        while True:
+            wait = self._next_check()
+            if wait <= 0:
+                if not self._refresh():
+                    wait = self.retry_interval
+                else:
+                    continue
+            self._wake.wait(wait)
+            self._wake.clear()
+
+    def status(self) -> Dict:
+        with self._lock:
+            creds = self._creds
+        left = _seconds_left(creds) if creds is not None else None
+        return {
+            "has_credentials": creds is not None,
+            "expires_in": left,
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+            "last_refresh": self.last_refresh,
+            "last_error": self.last_error,
+        }
+
+
+_manager: Optional[CredentialManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_credential_manager() -> CredentialManager:
+    """프로세스 전역 자격 증명 관리자 (지연 생성)"""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = CredentialManager()
+        return _manager
@@ -0,0 +1,291 @@
+"""프로세스/노드 간 로그 이벤트 버스.
+
+push_log/push_token 이벤트를 모든 gunicorn 워커(와 컨테이너)의 event_hub로 전달해,
+브라우저의 EventSource가 어느 워커에 붙어 있어도 모든 작업의 로그를 보게 한다.
+
+EVENT_BUS로 백엔드 선택:
+- local  (기본): 프로세스 내 허브에 바로 발행 (단일 프로세스 개발 서버)
+- sqlite : 공유 SQLite 파일(EVENT_BUS_PATH)에 기록하고 각 프로세스가 새 행을 tail.
+           같은 호스트(같은 볼륨)의 여러 워커용. 오래된 행은 EVENT_BUS_RETENTION_SECONDS 후 삭제
+- redis  : Redis Stream(EVENT_BUS_URL, EVENT_BUS_STREAM)에 XADD, 각 프로세스가 XREAD. 여러 노드용 (redis 패키지 필요)
+
+sqlite/redis에서는 버스가 매긴 id(행 id / 스트림 id)를 SSE 이벤트 id로 그대로 쓰므로,
+재접속한 브라우저가 다른 워커에 붙어도 Last-Event-ID로 이어 받을 수 있다. 모든 이벤트가 버스를 거쳐야
+id 체계가 하나로 유지되므로, 저장소 장애 시에도 로컬 허브로 우회하지 않고 보관했다가 다시 기록한다.
+
+publish()는 발행 대기열(EVENT_BUS_QUEUE)에 넣기만 하고 바로 돌아온다. 기록 스레드가 대기열을 모아
+한 번의 트랜잭션(파이프라인)으로 쓰므로, 공유 asyncio 루프에서 로그/토큰을 발행해도 루프가 막히지 않는다.
+"""
+import atexit
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from event_hub import EventHub, current_job, get_event_hub
+
+try:
+    import redis  # 선택 의존성 (EVENT_BUS=redis)
+    _HAS_REDIS = True
+except Exception:
+    redis = None
+    _HAS_REDIS = False
+
+
+class LocalEventBus:
+    """프로세스 내 전달만 하는 기본 버스"""
+    name = "local"
+
+    def __init__(self, hub: EventHub):
+        self.hub = hub
+        self.published = 0
+
+    def start(self) -> "LocalEventBus":
+        return self
+
+    def publish(self, event: Optional[str], data: str, job_id: Optional[str] = None) -> None:
+        self.published += 1
+        self.hub.publish(event, data, job_id=job_id if job_id is not None else current_job())
+
+    def stats(self) -> Dict:
+        return {"backend": self.name, "published": self.published}
+
+
+class _TailingEventBus(ABC):
+    """공유 저장소에 쓰고 백그라운드 스레드가 새 이벤트를 읽어 허브로 전달하는 버스의 공통 부분"""
+    name = "tail"
+
+    def __init__(self, hub: EventHub, poll_interval: float):
+        self.hub = hub
+        self.poll_interval = poll_interval
+        self.origin = uuid.uuid4().hex[:8]
+        self.max_pending = int(os.getenv("EVENT_BUS_QUEUE", "10000"))
+        self.batch_size = 500
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+        self._outbox: Deque[Tuple[Optional[str], str, Optional[str]]] = deque()
+        self._outbox_cond = threading.Condition()
+        self._writing = False
+        self._threads: List[threading.Thread] = []
+        self._stop = threading.Event()
+
+    def start(self):
+        if not self._threads:
+            for target, role in ((self._run, "poll"), (self._write_loop, "writer")):
+                thread = threading.Thread(target=target, name=f"event-bus-{self.name}-{role}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            atexit.register(self.flush)
+        return self
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """대기열이 모두 기록될 때까지 기다린다 (종료 시 남은 로그 보존)"""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            with self._outbox_cond:
+                if not self._outbox and not self._writing:
+                    return True
+            time.sleep(0.02)
+        return False
+
+    def stop(self) -> None:
+        self._stop.set()
+        with self._outbox_cond:
+            self._outbox_cond.notify_all()
+
+    def publish(self, event: Optional[str], data: str, job_id: Optional[str] = None) -> None:
+        """발행 대기열에 넣고 바로 반환 (가득 차면 가장 오래된 이벤트를 버린다)"""
+        job_id = job_id if job_id is not None else current_job()
+        with self._outbox_cond:
+            if len(self._outbox) >= self.max_pending:
+                self._outbox.popleft()
+                self.dropped += 1
+            self._outbox.append((event, data, job_id))
+            self._outbox_cond.notify()
+
+    def _write_loop(self) -> None:
+        while not self._stop.is_set():
+            with self._outbox_cond:
+                while not self._outbox and not self._stop.is_set():
+                    self._outbox_cond.wait(1.0)
+                batch = [self._outbox.popleft() for _ in range(min(len(self._outbox), self.batch_size))]
+                self._writing = bool(batch)
+            if not batch:
+                continue
+            try:
+                self._append_many(batch)
+                self.published += len(batch)
+                self._writing = False
+            except Exception as e:
+                # 저장소 장애: 순서를 유지한 채 대기열 앞에 되돌려 놓고 잠시 후 다시 기록
+                self.errors += 1
+                self.last_error = str(e)
+                with self._outbox_cond:
+                    self._writing = False
+                    self._outbox.extendleft(reversed(batch))
+                    while len(self._outbox) > self.max_pending:
+                        self._outbox.pop()
+                        self.dropped += 1
+                self._stop.wait(1.0)
+
+    def _deliver(self, event_id: int, event: Optional[str], data: str, job_id: Optional[str]) -> None:
+        self.hub.publish(event, data, job_id=job_id, event_id=event_id)
+        self.delivered += 1
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self._poll()
+            except Exception as e:
+                self.errors += 1
+                self.last_error = str(e)
+                self._stop.wait(1.0)
+
+    @abstractmethod
+    def _append_many(self, events: List[Tuple[Optional[str], str, Optional[str]]]) -> None:
+        """(event, data, job_id) 목록을 순서대로 저장소에 기록"""
+
+    @abstractmethod
+    def _poll(self) -> None:
+        """새 이벤트를 읽어 _deliver로 허브에 전달 (새 이벤트가 없으면 잠시 대기)"""
+
+    def stats(self) -> Dict:
+        with self._outbox_cond:
+            pending = len(self._outbox)
+        return {"backend": self.name, "origin": self.origin, "published": self.published, "pending": pending,
+                "delivered": self.delivered, "dropped": self.dropped, "errors": self.errors,
+                "last_error": self.last_error}
+
+
+class SQLiteEventBus(_TailingEventBus):
+    name = "sqlite"
+
+    def __init__(self, hub: EventHub, path: Optional[str] = None, poll_interval: Optional[float] = None,
+                 retention_seconds: Optional[float] = None):
+        super().__init__(hub, float(poll_interval or os.getenv("EVENT_BUS_POLL_INTERVAL", "0.2")))
+        self.path = path or os.getenv("EVENT_BUS_PATH", "event_bus.sqlite3")
+        self.retention_seconds = float(retention_seconds or os.getenv("EVENT_BUS_RETENTION_SECONDS", "3600"))
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS events ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT, origin TEXT, job_id TEXT, event TEXT,"
+            " data TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_events_created ON events(created_at)")
+        self._conn.commit()
+        self._lock = threading.Lock()
+        # 새 워커도 최근 이벤트를 허브 버퍼에 채워 두어 Last-Event-ID 재전송이 가능하게
+        row = self._conn.execute("SELECT MAX(id) FROM events").fetchone()
+        self._cursor = max(0, (row[0] or 0) - hub.buffer_size)
+        self._last_prune = 0.0
+
+    def _append_many(self, events: List[Tuple[Optional[str], str, Optional[str]]]) -> None:
+        now = time.time()
+        with self._lock:
+            try:
+                self._conn.executemany(
+                    "INSERT INTO events (origin, job_id, event, data, created_at) VALUES (?, ?, ?, ?, ?)",
+                    [(self.origin, job_id, event, data, now) for event, data, job_id in events],
+                )
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+
+    def _poll(self) -> None:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, job_id, event, data FROM events WHERE id > ? ORDER BY id LIMIT 1000", (self._cursor,)
+            ).fetchall()
+        for event_id, job_id, event, data in rows:
+            self._cursor = event_id
+            self._deliver(event_id, event, data, job_id)
+        now = time.time()
+        if now - self._last_prune > 60:
+            self._last_prune = now
+            with self._lock:
+                self._conn.execute("DELETE FROM events WHERE created_at < ?", (now - self.retention_seconds,))
+                self._conn.commit()
+        if len(rows) < 1000:
+            self._stop.wait(self.poll_interval)
+
+
+class RedisEventBus(_TailingEventBus):
+    """Redis Stream 기반. 스트림 id "밀리초-순번"을 밀리초*1000+순번 정수로 바꿔 SSE id로 쓴다"""
+    name = "redis"
+
+    def __init__(self, hub: EventHub, url: Optional[str] = None, stream: Optional[str] = None,
+                 maxlen: Optional[int] = None, block_ms: int = 5000):
+        super().__init__(hub, 0.0)
+        if not _HAS_REDIS:
+            raise RuntimeError("EVENT_BUS=redis에는 redis 패키지가 필요합니다 (pip install redis)")
+        self.url = url or os.getenv("EVENT_BUS_URL", "redis://localhost:6379/0")
+        self.stream = stream or os.getenv("EVENT_BUS_STREAM", "autoblogger:events")
+        self.maxlen = int(maxlen or os.getenv("EVENT_BUS_MAXLEN", "10000"))
+        self.block_ms = block_ms
+        self._client = redis.Redis.from_url(self.url, decode_responses=True)
+        # 최근 이벤트를 허브 버퍼에 채워 두고 그 다음부터 tail
+        recent = self._client.xrevrange(self.stream, count=hub.buffer_size)
+        for stream_id, fields in reversed(recent):
+            self._deliver_fields(stream_id, fields)
+        self._cursor = recent[0][0] if recent else "0-0"
+
+    @staticmethod
+    def _event_id(stream_id: str) -> int:
+        ms, _, seq = stream_id.partition("-")
+        return int(ms) * 1000 + int(seq or 0)
+
+    def _deliver_fields(self, stream_id: str, fields: Dict) -> None:
+        self._deliver(self._event_id(stream_id), fields.get("event") or None, fields.get("data", ""),
+                      fields.get("job_id") or None)
+
+    def _append_many(self, events: List[Tuple[Optional[str], str, Optional[str]]]) -> None:
+        pipe = self._client.pipeline(transaction=False)
+        for event, data, job_id in events:
+            pipe.xadd(self.stream, {"origin": self.origin, "event": event or "", "data": data,
+                                    "job_id": job_id or ""},
+                      maxlen=self.maxlen, approximate=True)
+        pipe.execute()
+
+    def _poll(self) -> None:
+        result = self._client.xread({self.stream: self._cursor}, count=1000, block=self.block_ms)
+        for _, entries in result or []:
+            for stream_id, fields in entries:
+                self._cursor = stream_id
+                self._deliver_fields(stream_id, fields)
+
+
+def create_event_bus(hub: Optional[EventHub] = None, backend: Optional[str] = None):
+    hub = hub or get_event_hub()
+    backend = (backend or os.getenv("EVENT_BUS", "local")).lower()
+    if backend == "sqlite":
+        return SQLiteEventBus(hub).start()
+    if backend == "redis":
+        return RedisEventBus(hub).start()
+    return LocalEventBus(hub).start()
+
+
+_bus = None
+_bus_lock = threading.Lock()
+
+
+def get_event_bus():
+    """프로세스 전역 이벤트 버스 (지연 생성). 백엔드 생성에 실패하면 로컬 버스로 폴백"""
+    global _bus
+    with _bus_lock:
+        if _bus is None:
+            try:
+                _bus = create_event_bus()
+            except Exception as e:
+                print(f"⚠️ 이벤트 버스 초기화 실패, 프로세스 내 전달로 대체: {e}")
+                _bus = LocalEventBus(get_event_hub()).start()
+        return _bus
@@ -0,0 +1,276 @@
+"""로그/토큰 이벤트 허브 (SSE용).
+
+- 채널별 고정 크기 링 버퍼(EVENT_BUFFER_SIZE)에 최근 이벤트를 보관: 재접속한 브라우저는
+  Last-Event-ID 이후 이벤트를 다시 받는다
+- 전체 채널(GLOBAL_CHANNEL)과 작업별 채널("job:<id>")이 있으며, 작업 이벤트는 두 곳에 모두 기록된다
+- LLM 스트리밍 'token' 이벤트는 TokenBatcher가 EVENT_TOKEN_FLUSH_SECONDS마다 묶어 발행하고, 별도의 작은
+  링 버퍼(EVENT_TOKEN_BUFFER_SIZE)에 보관해 토큰이 로그를 버퍼에서 밀어내지 않는다
+- 구독자 큐도 크기 제한(EVENT_SUBSCRIBER_QUEUE). 따라가지 못하는 구독자는 끊고, 재접속 시 버퍼로 이어 받게 한다
+- 주기적 heartbeat 주석으로 끊긴 연결을 감지해 자동으로 구독 해제
+- 구독자가 없고 오래된(EVENT_CHANNEL_TTL_SECONDS) 작업 채널은 정리해 장기 실행에서도 메모리가 일정하다
+
+현재 작업 id는 contextvars로 전달한다 (job_context). run_sync/asyncio.to_thread가 컨텍스트를 복사하므로
+공유 YouTubeAutoBlogger 인스턴스의 log_callback에서도 어느 작업의 로그인지 알 수 있다.
+"""
+import contextvars
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Deque, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+GLOBAL_CHANNEL = "all"
+TOKEN_EVENT = "token"
+
+_current_job: contextvars.ContextVar = contextvars.ContextVar("event_hub_job", default=None)
+
+
+def current_job() -> Optional[str]:
+    return _current_job.get()
+
+
+@contextmanager
+def job_context(job_id: Optional[str]):
+    """블록 안에서 발생한 이벤트를 job_id 채널에도 기록"""
+    token = _current_job.set(str(job_id) if job_id is not None else None)
+    try:
+        yield
+    finally:
+        _current_job.reset(token)
+
+
+def job_channel(job_id) -> str:
+    return f"job:{job_id}"
+
+
+class Event(NamedTuple):
+    id: int
+    event: Optional[str]
+    data: str
+
+    def to_sse(self) -> str:
+        prefix = f"id: {self.id}\n" + (f"event: {self.event}\n" if self.event else "")
+        return prefix + "".join(f"data: {part}\n" for part in self.data.split("\n")) + "\n"
+
+
+class Subscription:
+    """채널 구독. get()으로 이벤트를 꺼내고, 끝나면 close()"""
+
+    def __init__(self, hub: "EventHub", channel: str, max_queue: int):
+        self.hub = hub
+        self.channel = channel
+        self.max_queue = max_queue
+        self.overflowed = False
+        self.closed = False
+        self._events: Deque[Event] = deque()
+        self._cond = threading.Condition()
+
+    def _offer(self, event: Event) -> None:
+        with self._cond:
+            if self.closed:
+                return
+            if len(self._events) >= self.max_queue:
+                # 느린 구독자: 메모리를 키우지 않고 끊는다 (재접속 시 Last-Event-ID로 버퍼에서 이어 받음)
+                self.overflowed = True
+                self.closed = True
+                self._events.clear()
+            else:
+                self._events.append(event)
+            self._cond.notify()
+
+    def get(self, timeout: float) -> Optional[Event]:
+        """다음 이벤트 (timeout 동안 없으면 None). 닫힌 구독이면 StopIteration"""
+        with self._cond:
+            if not self._events and not self.closed:
+                self._cond.wait(timeout)
+            if self._events:
+                return self._events.popleft()
+            if self.closed:
+                raise StopIteration
+            return None
+
+    def close(self) -> None:
+        with self._cond:
+            self.closed = True
+            self._cond.notify()
+        self.hub._unsubscribe(self)
+
+
+class _Channel:
+    def __init__(self, size: int, token_size: int):
+        self.buffer: Deque[Event] = deque(maxlen=size)
+        self.tokens: Deque[Event] = deque(maxlen=token_size)
+        self.subscribers: List[Subscription] = []
+        self.updated = time.time()
+
+
+class EventHub:
+    def __init__(self, buffer_size: Optional[int] = None, subscriber_queue: Optional[int] = None,
+                 heartbeat: Optional[float] = None, channel_ttl: Optional[float] = None,
+                 max_channels: Optional[int] = None):
+        self.buffer_size = int(buffer_size or os.getenv("EVENT_BUFFER_SIZE", "1000"))
+        self.token_buffer_size = int(os.getenv("EVENT_TOKEN_BUFFER_SIZE", "200"))
+        # 재접속 시 버퍼 전체를 다시 넣을 수 있도록 구독자 큐는 버퍼보다 작지 않게
+        self.subscriber_queue = max(self.buffer_size + self.token_buffer_size,
+                                    int(subscriber_queue or os.getenv("EVENT_SUBSCRIBER_QUEUE", "2000")))
+        self.heartbeat = float(heartbeat or os.getenv("EVENT_HEARTBEAT_SECONDS", "15"))
+        self.channel_ttl = float(channel_ttl or os.getenv("EVENT_CHANNEL_TTL_SECONDS", "3600"))
+        self.max_channels = int(max_channels or os.getenv("EVENT_MAX_CHANNELS", "500"))
+        self._channels: Dict[str, _Channel] = {}
+        self._lock = threading.Lock()
+        # 재시작 후에도 id가 이전 값보다 커지도록 시각(ms)에서 시작
+        self._next_id = int(time.time() * 1000)
+        self._last_sweep = time.time()
+        self.dropped_subscribers = 0
+
+    # --- 발행 ---
+    def publish(self, event: Optional[str], data: str, job_id: Optional[str] = None,
+                event_id: Optional[int] = None) -> int:
+        """이벤트 기록 후 구독자에게 전달. job_id(없으면 현재 job_context)가 있으면 작업 채널에도 기록.
+        event_id를 주면 그 id를 쓴다 (event_bus가 프로세스 간 공통 id로 전달할 때)"""
+        job_id = job_id if job_id is not None else current_job()
+        channels = [GLOBAL_CHANNEL] + ([job_channel(job_id)] if job_id is not None else [])
+        with self._lock:
+            self._next_id = max(self._next_id + 1, event_id or 0)
+            item = Event(event_id or self._next_id, event, data)
+            targets: List[Subscription] = []
+            now = time.time()
+            for name in channels:
+                channel = self._channels.get(name)
+                if channel is None:
+                    channel = self._channels[name] = self._new_channel()
+                (channel.tokens if event == TOKEN_EVENT else channel.buffer).append(item)
+                channel.updated = now
+                targets.extend(channel.subscribers)
+            self._maybe_sweep(now)
+        for sub in targets:
+            sub._offer(item)
+            if sub.overflowed:
+                self.dropped_subscribers += 1
+                self._unsubscribe(sub)
+        return item.id
+
+    # --- 구독 ---
+    def subscribe(self, channel: str = GLOBAL_CHANNEL, last_event_id: Optional[int] = None) -> Subscription:
+        """구독 시작. last_event_id 이후 버퍼에 남은 이벤트를 먼저 넣어 준다"""
+        sub = Subscription(self, channel, self.subscriber_queue)
+        with self._lock:
+            ch = self._channels.get(channel)
+            if ch is None:
+                ch = self._channels[channel] = self._new_channel()
+            if last_event_id is not None:
+                for item in sorted(list(ch.buffer) + list(ch.tokens), key=lambda e: e.id):
+                    if item.id > last_event_id:
+                        sub._offer(item)
+            ch.subscribers.append(sub)
+            ch.updated = time.time()
+        return sub
+
+    def _new_channel(self) -> _Channel:
+        return _Channel(self.buffer_size, self.token_buffer_size)
+
+    def _unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            ch = self._channels.get(sub.channel)
+            if ch is not None and sub in ch.subscribers:
+                ch.subscribers.remove(sub)
+                ch.updated = time.time()
+
+    def stream(self, channel: str = GLOBAL_CHANNEL, last_event_id: Optional[int] = None) -> Iterator[str]:
+        """SSE 본문 제너레이터. 연결이 끊기면(GeneratorExit) 구독을 해제한다"""
+        sub = self.subscribe(channel, last_event_id)
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    item = sub.get(self.heartbeat)
+                except StopIteration:
+                    return  # 큐 초과로 끊김: 브라우저가 Last-Event-ID로 재접속
+                yield item.to_sse() if item is not None else ": keep-alive\n\n"
+        finally:
+            sub.close()
+
+    # --- 정리 ---
+    def _maybe_sweep(self, now: float) -> None:
+        """구독자 없는 오래된 작업 채널 제거 + 채널 수 상한 유지 (self._lock 안에서 호출)"""
+        if now - self._last_sweep < 60 and len(self._channels) <= self.max_channels:
+            return
+        self._last_sweep = now
+        idle = [(ch.updated, name) for name, ch in self._channels.items()
+                if name != GLOBAL_CHANNEL and not ch.subscribers]
+        for updated, name in idle:
+            if now - updated > self.channel_ttl:
+                del self._channels[name]
+        overflow = len(self._channels) - self.max_channels
+        if overflow > 0:
+            for _, name in sorted(idle)[:overflow]:
+                self._channels.pop(name, None)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "channels": len(self._channels),
+                "subscribers": sum(len(ch.subscribers) for ch in self._channels.values()),
+                "buffered_events": sum(len(ch.buffer) + len(ch.tokens) for ch in self._channels.values()),
+                "dropped_subscribers": self.dropped_subscribers,
+            }
+
+
+class TokenBatcher:
+    """LLM 스트리밍 delta를 (작업, 단계)별로 모아 flush_interval마다 'token' 이벤트 하나로 발행.
+    토큰마다 이벤트를 만들면 구독자 전달/버스 기록이 토큰 수만큼 일어나므로 묶어서 줄인다.
+    publish(event, data, job_id)는 보통 push_event. 로그를 발행하기 전에 flush()하면 순서가 유지된다"""
+
+    def __init__(self, publish: Callable[..., None], flush_interval: Optional[float] = None):
+        self.publish = publish
+        self.flush_interval = float(flush_interval or os.getenv("EVENT_TOKEN_FLUSH_SECONDS", "0.25"))
+        self._pending: Dict[Tuple[Optional[str], str], List[str]] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, stage: str, delta: str, job_id: Optional[str] = None) -> None:
+        key = (job_id if job_id is not None else current_job(), stage)
+        with self._lock:
+            self._pending.setdefault(key, []).append(delta)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="event-token-batcher", daemon=True)
+                self._thread.start()
+
+    def flush(self) -> None:
+        with self._flush_lock:  # 발행 순서가 뒤섞이지 않도록 flush는 한 번에 하나씩
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            for (job_id, stage), parts in pending.items():
+                self.publish(TOKEN_EVENT, json.dumps({"stage": stage, "delta": "".join(parts)}, ensure_ascii=False),
+                             job_id=job_id)
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"⚠️ 토큰 이벤트 발행 실패: {e}")
+
+
+def parse_last_event_id(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value) if value not in (None, "") else None
+    except ValueError:
+        return None
+
+
+_hub: Optional[EventHub] = None
+_hub_lock = threading.Lock()
+
+
+def get_event_hub() -> EventHub:
+    """프로세스 전역 이벤트 허브 (지연 생성)"""
+    global _hub
+    with _hub_lock:
+        if _hub is None:
+            _hub = EventHub()
+        return _hub
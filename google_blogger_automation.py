@@ -4,19 +4,18 @@ import re
 from datetime import datetime
 from typing import Dict, List, Optional
 import openai
+from llm_gateway import get_gateway, message_content
 import requests
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
-import pickle
+from blogger_service import get_blogger_service
+from credential_manager import get_credential_manager
 from dotenv import load_dotenv
 
 class GoogleBloggerAutomation:
     def __init__(self, openai_api_key: str):
         """구글 블로그 자동화 클래스"""
         self.openai_api_key = openai_api_key
-        openai.api_key = openai_api_key
         
         # 구글 블로그 API 설정
         self.SCOPES = ['https://www.googleapis.com/auth/blogger']
@@ -28,15 +27,14 @@ class GoogleBloggerAutomation:
     
     def _authenticate_google(self):
         """구글 API 인증"""
-        # 토큰 파일이 있으면 로드
-        if os.path.exists('token.pickle'):
-            with open('token.pickle', 'rb') as token:
-                self.creds = pickle.load(token)
+        # 토큰이 있으면 로드 (메모리 보관, 만료 전 백그라운드 갱신)
+        manager = get_credential_manager()
+        self.creds = manager.get()
         
         # 유효한 인증 정보가 없으면 새로 생성
         if not self.creds or not self.creds.valid:
             if self.creds and self.creds.expired and self.creds.refresh_token:
-                self.creds.refresh(Request())
+                manager.refresh_now()
             else:
                 # client_secrets.json 파일이 필요합니다
                 if not os.path.exists('client_secrets.json'):
@@ -47,13 +45,11 @@ class GoogleBloggerAutomation:
                 flow = InstalledAppFlow.from_client_secrets_file(
                     'client_secrets.json', self.SCOPES)
                 self.creds = flow.run_local_server(port=0)
-            
-            # 토큰 저장
-            with open('token.pickle', 'wb') as token:
-                pickle.dump(self.creds, token)
+                # 토큰 저장
+                manager.set(self.creds)
         
         # Blogger 서비스 생성
-        self.blogger_service = build('blogger', 'v3', credentials=self.creds)
+        self.blogger_service = get_blogger_service(self.creds)
     
     def get_blog_info(self, blog_id: str = None) -> Dict:
         """블로그 정보 가져오기"""
@@ -81,8 +77,9 @@ class GoogleBloggerAutomation:
     def analyze_youtube_script(self, script_text: str) -> Dict:
         """유튜브 스크립트 분석하여 블로그 포스팅 구조 생성"""
         try:
-            response = openai.ChatCompletion.create(
+            response = get_gateway().chat_completion(
                 model="gpt-3.5-turbo",
+                api_key=self.openai_api_key,
                 messages=[
                     {
                         "role": "system",
@@ -118,7 +115,7 @@ class GoogleBloggerAutomation:
                 temperature=0.7
             )
             
-            return json.loads(response.choices[0].message.content)
+            return json.loads(message_content(response))
             
         except Exception as e:
             print(f"스크립트 분석 중 오류: {e}")
@@ -200,6 +197,7 @@ class GoogleBloggerAutomation:
             main_prompt = f"블로그 포스트 메인 이미지: {post_data.get('title', '')}"
             
             response = openai.Image.create(
+                api_key=self.openai_api_key,
                 prompt=main_prompt,
                 n=1,
                 size="1024x1024"
@@ -215,6 +213,7 @@ class GoogleBloggerAutomation:
                 section_prompt = f"블로그 포스트 섹션 이미지: {section}"
                 
                 response = openai.Image.create(
+                    api_key=self.openai_api_key,
                     prompt=section_prompt,
                     n=1,
                     size="512x512"
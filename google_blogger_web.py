@@ -1,9 +1,12 @@
 from flask import Flask, render_template, request, jsonify, send_file
 import os
 import json
+import threading
 from datetime import datetime
 from google_blogger_automation import GoogleBloggerAutomation
+from blogger_batch import execute_operations, schedule_posts
 import zipfile
+from llm_gateway import get_gateway
 import io
 
 app = Flask(__name__)
@@ -12,8 +15,34 @@ app.config['SECRET_KEY'] = 'your-secret-key-here'
 # OpenAI API 키 (환경 변수에서 가져오거나 직접 설정)
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY', 'your-openai-api-key-here')
 
-# 전역 변수로 자동화 인스턴스 저장
+# LLM 커넥션 풀 예열 (첫 변환의 TLS 핸드셰이크 지연 제거)
+get_gateway().warmup_in_background(OPENAI_API_KEY)
+
+# 전역 변수로 자동화 인스턴스 저장 (요청마다 새로 만들지 않고 재사용: 토큰 로드/서비스 생성은 1회)
 automation = None
+_automation_lock = threading.Lock()
+_automation_building = False
+
+def get_automation():
+    """자동화 인스턴스 (지연 생성, 스레드 안전).
+    토큰이 없으면 생성 중에 브라우저 OAuth(run_local_server)를 기다리므로 잠금 밖에서 한 스레드만 만들고,
+    그동안 들어온 다른 요청은 기다리지 않고 바로 실패한다. 인증에 실패한 인스턴스는 재사용하지 않는다."""
+    global automation, _automation_building
+    with _automation_lock:
+        if automation is not None:
+            return automation
+        if _automation_building:
+            raise RuntimeError('Google 인증이 진행 중입니다. 브라우저에서 인증을 마친 뒤 다시 시도하세요.')
+        _automation_building = True
+    try:
+        created = GoogleBloggerAutomation(OPENAI_API_KEY)
+    finally:
+        with _automation_lock:
+            _automation_building = False
+    with _automation_lock:
+        if automation is None and created.blogger_service is not None:
+            automation = created
+        return automation or created
 
 @app.route('/')
 def index():
@@ -33,9 +62,7 @@ def convert_youtube_to_blog():
         if not youtube_url or not script_text:
             return jsonify({'error': '유튜브 URL과 스크립트가 필요합니다.'}), 400
         
-        # 자동화 인스턴스 초기화
-        global automation
-        automation = GoogleBloggerAutomation(OPENAI_API_KEY)
+        automation = get_automation()
         
         # 블로그 포스트 생성
         result = automation.generate_full_blog_post(
@@ -59,9 +86,7 @@ def convert_youtube_to_blog():
 def get_blogs():
     """사용자의 구글 블로그 목록 가져오기"""
     try:
-        global automation
-        if not automation:
-            automation = GoogleBloggerAutomation(OPENAI_API_KEY)
+        automation = get_automation()
         
         # 블로그 목록 가져오기
         blogs = automation.blogger_service.blogs().listByUser(userId='self').execute()
@@ -94,9 +119,7 @@ def preview_content():
         if not script_text:
             return jsonify({'error': '스크립트가 필요합니다.'}), 400
         
-        # 자동화 인스턴스 초기화
-        global automation
-        automation = GoogleBloggerAutomation(OPENAI_API_KEY)
+        automation = get_automation()
         
         # 스크립트 분석
         post_data = automation.analyze_youtube_script(script_text)
@@ -120,9 +143,7 @@ def publish_draft():
         if not blog_id or not post_id:
             return jsonify({'error': '블로그 ID와 포스트 ID가 필요합니다.'}), 400
         
-        global automation
-        if not automation:
-            automation = GoogleBloggerAutomation(OPENAI_API_KEY)
+        automation = get_automation()
         
         # 포스트 발행
         post = automation.blogger_service.posts().publish(
@@ -150,9 +171,7 @@ def delete_post():
         if not blog_id or not post_id:
             return jsonify({'error': '블로그 ID와 포스트 ID가 필요합니다.'}), 400
         
-        global automation
-        if not automation:
-            automation = GoogleBloggerAutomation(OPENAI_API_KEY)
+        automation = get_automation()
         
         # 포스트 삭제
         automation.blogger_service.posts().delete(
@@ -168,6 +187,83 @@ def delete_post():
     except Exception as e:
         return jsonify({'error': f'삭제 중 오류가 발생했습니다: {str(e)}'}), 500
 
+def _bulk_service():
+    return get_automation().blogger_service
+
+def _bulk_response(results, action):
+    """항목별 결과 목록 → 공통 응답 (일부 실패해도 200, 항목별 success로 구분)"""
+    succeeded = sum(1 for r in results if r.get('success'))
+    return jsonify({
+        'success': succeeded == len(results),
+        'succeeded': succeeded,
+        'failed': len(results) - succeeded,
+        'results': results,
+        'message': f'{action}: {succeeded}/{len(results)}건 성공'
+    })
+
+@app.route('/api/posts/batch', methods=['POST'])
+def batch_operations():
+    """insert/publish/revert/patch/delete 작업 여러 개를 Blogger 배치 요청으로 실행"""
+    try:
+        data = request.get_json() or {}
+        operations = data.get('operations') or []
+        if not operations or not isinstance(operations, list):
+            return jsonify({'error': '작업 목록(operations)이 필요합니다.'}), 400
+        default_blog_id = data.get('blog_id')
+        # 객체가 아닌 항목은 요청 전체를 실패시키지 않고 해당 항목만 실패로 보고
+        valid = [{'blog_id': default_blog_id, 'id': index, **op}
+                 for index, op in enumerate(operations) if isinstance(op, dict)]
+        executed = iter(execute_operations(_bulk_service(), valid) if valid else [])
+        results = [next(executed) if isinstance(op, dict) else
+                   {'id': index, 'op': None, 'post_id': None, 'success': False, 'status': None, 'post': None,
+                    'error': '작업 항목은 객체(op, post_id ...)여야 합니다.'}
+                   for index, op in enumerate(operations)]
+        return _bulk_response(results, '일괄 작업')
+    except Exception as e:
+        return jsonify({'error': f'일괄 작업 중 오류가 발생했습니다: {str(e)}'}), 500
+
+@app.route('/api/schedule/bulk', methods=['POST'])
+def schedule_bulk():
+    """여러 포스트 작성/예약 발행 (초안 insert 배치 → publish 배치)"""
+    try:
+        data = request.get_json() or {}
+        blog_id = data.get('blog_id')
+        posts = data.get('posts') or []
+        if not blog_id or not posts:
+            return jsonify({'error': '블로그 ID와 포스트 목록이 필요합니다.'}), 400
+        return _bulk_response(schedule_posts(_bulk_service(), blog_id, posts), '일괄 예약')
+    except Exception as e:
+        return jsonify({'error': f'일괄 예약 중 오류가 발생했습니다: {str(e)}'}), 500
+
+@app.route('/api/publish/bulk', methods=['POST'])
+def publish_bulk():
+    """여러 초안을 한 번에 발행 (post_ids 또는 {post_id, publish_date} 목록)"""
+    try:
+        data = request.get_json() or {}
+        blog_id = data.get('blog_id')
+        items = data.get('posts') or [{'post_id': pid} for pid in (data.get('post_ids') or [])]
+        if not blog_id or not items:
+            return jsonify({'error': '블로그 ID와 포스트 ID 목록이 필요합니다.'}), 400
+        operations = [{'op': 'publish', 'blog_id': blog_id, 'post_id': item.get('post_id'),
+                       'publish_date': item.get('publish_date') or data.get('publish_date')} for item in items]
+        return _bulk_response(execute_operations(_bulk_service(), operations), '일괄 발행')
+    except Exception as e:
+        return jsonify({'error': f'일괄 발행 중 오류가 발생했습니다: {str(e)}'}), 500
+
+@app.route('/api/delete/bulk', methods=['POST'])
+def delete_bulk():
+    """여러 포스트를 한 번에 삭제"""
+    try:
+        data = request.get_json() or {}
+        blog_id = data.get('blog_id')
+        post_ids = data.get('post_ids') or []
+        if not blog_id or not post_ids:
+            return jsonify({'error': '블로그 ID와 포스트 ID 목록이 필요합니다.'}), 400
+        operations = [{'op': 'delete', 'blog_id': blog_id, 'post_id': pid} for pid in post_ids]
+        return _bulk_response(execute_operations(_bulk_service(), operations), '일괄 삭제')
+    except Exception as e:
+        return jsonify({'error': f'일괄 삭제 중 오류가 발생했습니다: {str(e)}'}), 500
+
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000)
 
@@ -0,0 +1,54 @@
+"""gunicorn 설정 (gunicorn은 작업 디렉터리의 gunicorn.conf.py를 자동으로 읽는다).
+
+SERVER_MODE로 워커 방식 선택:
+- gthread (기본): 워커당 GUNICORN_THREADS개 스레드, SSE 연결 하나가 스레드 하나를 계속 점유
+- gevent (opt-in, pip install gevent): 요청마다 그린렛. 열린 /api/log-stream(SSE) 연결과
+  네트워크를 기다리는 /api/convert가 OS 스레드를 잡지 않으므로, 워커당 GUNICORN_WORKER_CONNECTIONS개까지
+  동시에 연결을 유지한다. gevent 워커에서 timeout은 워커 heartbeat 기준이라 긴 변환도 워커를 죽이지 않는다.
+  주의: 작업 큐/변환 작업/SQLite 이벤트 버스의 sqlite3 호출은 그린렛에서 허브를 막는다 (잠금 대기 최대 30초 동안
+  그 워커의 모든 SSE 연결이 멈춤). gevent 모드에서는 EVENT_BUS=redis(또는 local)를 권장한다.
+  측정 환경: gevent 26.9.0, httpx 0.28.1 (benchmarks/sse_benchmark.py)
+
+여러 워커의 로그를 모든 SSE 연결에 보내려면 EVENT_BUS=sqlite(또는 redis)를 함께 설정한다.
+"""
+import os
+
+try:
+    import gevent  # noqa: F401  선택 의존성 (SERVER_MODE=gevent)
+    _HAS_GEVENT = True
+except ImportError:
+    _HAS_GEVENT = False
+
+server_mode = os.getenv("SERVER_MODE", "gthread").lower()
+if server_mode == "gevent" and not _HAS_GEVENT:
+    print("⚠️ SERVER_MODE=gevent이지만 gevent가 설치되어 있지 않아 gthread로 실행합니다 (pip install gevent)")
+    server_mode = "gthread"
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8080")
+workers = int(os.getenv("GUNICORN_WORKERS", "2"))
+# LLM 속도 제한(rate_limiter)의 계정 한도를 워커끼리 나눠 쓰도록 (워커는 이 환경을 물려받는다)
+os.environ.setdefault("LLM_RATE_PROCESSES", str(workers))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+
+if server_mode == "gevent":
+    # 워커가 몽키패치하기 전에(마스터에서) httpcore를 먼저 import: 설치돼 있으면 함께 로드되는
+    # 선택 백엔드(trio)가 패치된 select(epoll 없음)에서는 import에 실패한다
+    import httpcore  # noqa: F401
+    worker_class = "gevent"
+    if os.getenv("EVENT_BUS", "local").lower() == "sqlite":
+        print("⚠️ SERVER_MODE=gevent + EVENT_BUS=sqlite: SQLite 잠금 대기가 워커의 모든 SSE 연결을 멈출 수 있습니다 "
+              "(EVENT_BUS=redis 권장)")
+    worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", "1000"))
+else:
+    worker_class = "gthread"
+    threads = int(os.getenv("GUNICORN_THREADS", "4"))
+
+
+def post_worker_init(worker):
+    # 앱 모듈은 import만으로 스레드를 띄우지 않는다: 워커 프로세스마다 여기서 한 번 시작
+    from premium_auto_blogger_web import start_background_workers
+
+    start_background_workers()
+    print(f"🚀 gunicorn 워커 시작 (pid {worker.pid}, {server_mode})")
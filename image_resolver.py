@@ -0,0 +1,149 @@
+"""Pexels 이미지 후보 수집 및 로컬 랭킹.
+
+키워드마다 per_page=1로 순차 검색하던 방식을 대체한다.
+- 모든 키워드를 동시에 검색(per_page 확대)해 후보를 한데 모은 뒤
+- 가로 비율, 해상도, 키워드 일치도, 여러 키워드에서 함께 나온 정도, 최근 사용 여부로 점수화해
+  최상위 1장과 대체 후보를 반환한다. 최악의 경우에도 지연은 요청 한 번 수준.
+
+환경변수:
+  - PEXELS_PER_PAGE=10  → 키워드당 후보 수 (기본 10)
+"""
+import asyncio
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+from async_support import get_async_client
+
+PEXELS_BASE_URL = "https://api.pexels.com/v1"
+TARGET_RATIO = 16 / 9
+TARGET_PIXELS = 1920 * 1080
+
+
+class ImageCandidate(NamedTuple):
+    photo_id: str
+    url: str
+    width: int
+    height: int
+    alt: str
+    keyword: str
+    position: int
+
+
+def _tokens(text: str) -> set:
+    return set(re.findall(r'[a-z0-9]+', (text or '').lower()))
+
+
+class ImageResolver:
+    def __init__(self, base_url: Optional[str] = None, per_page: Optional[int] = None,
+                 timeout: float = 30.0, used_capacity: int = 500):
+        self.base_url = (base_url or PEXELS_BASE_URL).rstrip("/")
+        self.per_page = per_page or int(os.getenv("PEXELS_PER_PAGE", "10"))
+        self.timeout = timeout
+        # 최근 사용한 사진 ID (같은 이미지가 여러 글에 반복되지 않도록 감점)
+        self._used: "OrderedDict[str, None]" = OrderedDict()
+        self._used_capacity = used_capacity
+        self._lock = threading.Lock()
+
+    # --- 사용 이력 ---
+    def mark_used(self, photo_id: str) -> None:
+        with self._lock:
+            self._used.pop(photo_id, None)
+            self._used[photo_id] = None
+            while len(self._used) > self._used_capacity:
+                self._used.popitem(last=False)
+
+    def is_used(self, photo_id: str) -> bool:
+        with self._lock:
+            return photo_id in self._used
+
+    # --- 검색 ---
+    async def asearch(self, keyword: str, api_key: Optional[str] = None,
+                      per_page: Optional[int] = None) -> List[ImageCandidate]:
+        """키워드 하나에 대한 후보 목록 (실패 시 빈 목록)"""
+        try:
+            headers = {}
+            if api_key:
+                headers['Authorization'] = api_key
+            params = {
+                'query': keyword,
+                'per_page': per_page or self.per_page,
+                'orientation': 'landscape'
+            }
+            response = await get_async_client().get(f"{self.base_url}/search", headers=headers,
+                                                    params=params, timeout=self.timeout)
+            if response.status_code != 200:
+                print(f"Pexels API 오류: {response.status_code}")
+                return []
+            candidates = []
+            for position, photo in enumerate(response.json().get('photos') or []):
+                url = (photo.get('src') or {}).get('large')
+                if not url:
+                    continue
+                candidates.append(ImageCandidate(
+                    photo_id=str(photo.get('id') or url),
+                    url=url,
+                    width=int(photo.get('width') or 0),
+                    height=int(photo.get('height') or 0),
+                    alt=photo.get('alt') or '',
+                    keyword=keyword,
+                    position=position,
+                ))
+            return candidates
+        except Exception as e:
+            print(f"이미지 검색 실패: {e}")
+            return []
+
+    async def aresolve(self, keywords: Sequence[str], api_key: Optional[str] = None,
+                       alternates: int = 3) -> List[ImageCandidate]:
+        """모든 키워드를 동시에 검색해 점수순으로 최대 1 + alternates개 반환.
+        첫 번째 후보는 사용 이력에 기록된다."""
+        keywords = [kw for kw in keywords if kw]
+        if not keywords:
+            return []
+        results = await asyncio.gather(*(self.asearch(kw, api_key) for kw in keywords))
+        ranked = self.rank([c for group in results for c in group], keywords)
+        picked = ranked[:1 + alternates]
+        if picked:
+            self.mark_used(picked[0].photo_id)
+        return picked
+
+    # --- 랭킹 ---
+    def rank(self, candidates: Sequence[ImageCandidate], keywords: Sequence[str]) -> List[ImageCandidate]:
+        """사진 ID 기준으로 중복을 합치고 점수 내림차순 정렬"""
+        by_id: Dict[str, ImageCandidate] = {}
+        found_by: Dict[str, int] = {}
+        for c in candidates:
+            found_by[c.photo_id] = found_by.get(c.photo_id, 0) + 1
+            best = by_id.get(c.photo_id)
+            if best is None or c.position < best.position:
+                by_id[c.photo_id] = c
+        query_tokens = _tokens(' '.join(keywords))
+        scored = [(self.score(c, query_tokens, found_by[c.photo_id], len(keywords), keywords), c)
+                  for c in by_id.values()]
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [c for _, c in scored]
+
+    def score(self, c: ImageCandidate, query_tokens: set, found_count: int,
+              keyword_count: int, keywords: Sequence[str]) -> float:
+        ratio = (c.width / c.height) if c.width and c.height else 0.0
+        landscape = max(0.0, 1 - abs(ratio - TARGET_RATIO) / TARGET_RATIO) if ratio >= 1 else 0.0
+        resolution = min((c.width * c.height) / TARGET_PIXELS, 1.0)
+        alt_tokens = _tokens(c.alt)
+        own_tokens = _tokens(c.keyword)
+        overlap = 0.0
+        if own_tokens:
+            overlap += 0.6 * len(own_tokens & alt_tokens) / len(own_tokens)
+        if query_tokens:
+            overlap += 0.4 * len(query_tokens & alt_tokens) / len(query_tokens)
+        agreement = (found_count - 1) / max(keyword_count - 1, 1)
+        # 앞쪽 키워드(핵심 키워드)와 상위 검색 결과를 약간 우대
+        priority = 1 - (list(keywords).index(c.keyword) / max(keyword_count, 1)) if c.keyword in keywords else 0.0
+        position = 1 / (1 + c.position)
+        total = (0.25 * landscape + 0.2 * resolution + 0.3 * overlap + 0.1 * agreement
+                 + 0.1 * priority + 0.05 * position)
+        if self.is_used(c.photo_id):
+            total -= 1.0
+        return total
@@ -0,0 +1,356 @@
+"""영구 작업 큐 (SQLite) — 일괄 포스팅용.
+
+상태: queued → running → (ready → publishing →) done | failed, 실패 시 재시도 대기는 retrying.
+- 생성(generate)과 발행(publish)은 단계가 분리되어 있다. 생성 워커 N개가 동시에 콘텐츠를 만들고,
+  게시가 필요한 항목은 ready로 남긴다. 발행 페이서(publish 단계 워커)는 같은 배치의 게시를
+  한 번에 하나씩, 이전 게시 후 interval_seconds만큼 간격을 두고 수행한다.
+- 작업을 가져간 워커는 임대(lease)를 받고 heartbeat로 연장한다. 임대가 만료된 running/publishing 작업은
+  다른 워커(또는 재시작한 프로세스)가 다시 가져가므로, 배포/크래시 후에도 자동으로 이어서 처리된다.
+- 여러 gunicorn 워커가 같은 DB 파일을 공유해도 BEGIN IMMEDIATE 트랜잭션으로 한 작업은 한 워커만 가져간다.
+
+환경변수:
+  - JOB_QUEUE_PATH=...        → DB 파일 경로 (기본 job_queue.sqlite3)
+  - JOB_MAX_ATTEMPTS=3        → 항목별 최대 시도 횟수
+  - JOB_LEASE_SECONDS=600     → 임대 시간 (heartbeat로 연장)
+  - JOB_RETRY_DELAY_SECONDS=60 → 첫 재시도 대기 (시도마다 2배)
+"""
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List, Optional
+
+STATE_QUEUED = "queued"
+STATE_RUNNING = "running"
+STATE_RETRYING = "retrying"
+STATE_READY = "ready"            # 생성 완료, 발행 대기
+STATE_PUBLISHING = "publishing"
+STATE_DONE = "done"
+STATE_FAILED = "failed"
+TERMINAL_STATES = (STATE_DONE, STATE_FAILED)
+
+PHASE_GENERATE = "generate"
+PHASE_PUBLISH = "publish"
+
+
+class PermanentJobError(Exception):
+    """재시도해도 같은 결과인 실패 (예: Google 인증 없음). JobWorker는 시도 횟수와 무관하게 바로 failed로 기록"""
+
+
+class JobQueue:
+    def __init__(self, path: Optional[str] = None, max_attempts: Optional[int] = None,
+                 lease_seconds: Optional[float] = None, retry_delay: Optional[float] = None):
+        self.path = path or os.getenv("JOB_QUEUE_PATH", "job_queue.sqlite3")
+        self.max_attempts = max_attempts or int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+        self.lease_seconds = lease_seconds or float(os.getenv("JOB_LEASE_SECONDS", "600"))
+        self.retry_delay = retry_delay if retry_delay is not None else float(os.getenv("JOB_RETRY_DELAY_SECONDS", "60"))
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS batches ("
+            " id TEXT PRIMARY KEY, options TEXT NOT NULL, total INTEGER NOT NULL,"
+            " interval_seconds REAL NOT NULL DEFAULT 0, next_start_at REAL NOT NULL DEFAULT 0,"
+            " created_at REAL NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT, batch_id TEXT NOT NULL, seq INTEGER NOT NULL,"
+            " url TEXT NOT NULL, payload TEXT NOT NULL, state TEXT NOT NULL,"
+            " attempts INTEGER NOT NULL DEFAULT 0, max_attempts INTEGER NOT NULL,"
+            " not_before REAL NOT NULL DEFAULT 0, lease_owner TEXT, lease_expires REAL, heartbeat_at REAL,"
+            " result TEXT, error TEXT, created_at REAL NOT NULL, updated_at REAL NOT NULL,"
+            " started_at REAL, finished_at REAL);"
+            "CREATE INDEX IF NOT EXISTS idx_jobs_state ON jobs(state, not_before);"
+            "CREATE INDEX IF NOT EXISTS idx_jobs_batch ON jobs(batch_id, seq);"
+        )
+
+    # --- 트랜잭션 ---
+    def _write(self, fn: Callable[[sqlite3.Connection], object]):
+        """BEGIN IMMEDIATE로 쓰기 잠금을 먼저 잡아 프로세스 간 경쟁을 막는다"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = fn(self._conn)
+                self._conn.execute("COMMIT")
+                return result
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    # --- 등록 ---
+    def enqueue_batch(self, items: List[Dict], options: Optional[Dict] = None,
+                      interval_seconds: float = 0.0) -> str:
+        """items: [{"url": ..., "payload": {...}}, ...] → batch_id"""
+        batch_id = uuid.uuid4().hex[:12]
+        now = time.time()
+
+        def _tx(conn):
+            conn.execute(
+                "INSERT INTO batches (id, options, total, interval_seconds, next_start_at, created_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (batch_id, json.dumps(options or {}, ensure_ascii=False), len(items), interval_seconds, now, now),
+            )
+            conn.executemany(
+                "INSERT INTO jobs (batch_id, seq, url, payload, state, max_attempts, created_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(batch_id, seq, item["url"], json.dumps(item.get("payload") or {}, ensure_ascii=False),
+                  STATE_QUEUED, self.max_attempts, now, now) for seq, item in enumerate(items)],
+            )
+        self._write(_tx)
+        return batch_id
+
+    # --- 워커 ---
+    def claim(self, worker_id: str, phase: str = PHASE_GENERATE) -> Optional[Dict]:
+        """실행 가능한 작업 하나를 임대. 임대가 만료된 작업도 다시 가져간다
+        (단, 시도 횟수를 다 쓴 작업은 failed로 정리: 워커를 죽이는 항목이 큐를 무한히 붙잡지 않도록).
+        phase=generate: queued/retrying → running (배치 간격과 무관하게 동시 처리)
+        phase=publish:  ready → publishing (배치별로 하나씩, 이전 게시 후 interval_seconds 경과 시)
+        """
+        now = time.time()
+        if phase == PHASE_PUBLISH:
+            sql = ("SELECT j.* FROM jobs j JOIN batches b ON b.id = j.batch_id"
+                   " WHERE ((j.state = ? AND j.not_before <= ?) OR (j.state = ? AND j.lease_expires < ?))"
+                   "   AND b.next_start_at <= ?"
+                   "   AND NOT EXISTS (SELECT 1 FROM jobs r WHERE r.batch_id = j.batch_id AND r.id != j.id"
+                   "                   AND r.state = ? AND r.lease_expires >= ?)"
+                   " ORDER BY b.created_at, j.seq LIMIT 1")
+            params = (STATE_READY, now, STATE_PUBLISHING, now, now, STATE_PUBLISHING, now)
+            next_state = STATE_PUBLISHING
+            leased_state = STATE_PUBLISHING
+        else:
+            sql = ("SELECT j.* FROM jobs j JOIN batches b ON b.id = j.batch_id"
+                   " WHERE (j.state IN (?, ?) AND j.not_before <= ?) OR (j.state = ? AND j.lease_expires < ?)"
+                   " ORDER BY b.created_at, j.seq LIMIT 1")
+            params = (STATE_QUEUED, STATE_RETRYING, now, STATE_RUNNING, now)
+            next_state = STATE_RUNNING
+            leased_state = STATE_RUNNING
+
+        def _tx(conn):
+            conn.execute(
+                "UPDATE jobs SET state = ?, error = ?, lease_owner = NULL, lease_expires = NULL,"
+                " updated_at = ?, finished_at = ? WHERE state = ? AND lease_expires < ? AND attempts >= max_attempts",
+                (STATE_FAILED, "작업 중 워커가 중단되었습니다 (재시도 소진)", now, now, leased_state, now),
+            )
+            row = conn.execute(sql, params).fetchone()
+            if not row:
+                return None
+            conn.execute(
+                "UPDATE jobs SET state = ?, attempts = attempts + 1, lease_owner = ?, lease_expires = ?,"
+                " heartbeat_at = ?, started_at = ?, updated_at = ? WHERE id = ?",
+                (next_state, worker_id, now + self.lease_seconds, now, now, now, row["id"]),
+            )
+            job = dict(row)
+            job["attempts"] += 1
+            job["state"] = next_state
+            job["lease_owner"] = worker_id
+            return job
+        job = self._write(_tx)
+        if job:
+            job["payload"] = json.loads(job["payload"] or "{}")
+            job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def heartbeat(self, job_id: int, worker_id: str) -> bool:
+        """임대 연장. 다른 워커가 가져간 경우 False"""
+        now = time.time()
+
+        def _tx(conn):
+            cur = conn.execute(
+                "UPDATE jobs SET lease_expires = ?, heartbeat_at = ?, updated_at = ?"
+                " WHERE id = ? AND lease_owner = ? AND state IN (?, ?)",
+                (now + self.lease_seconds, now, now, job_id, worker_id, STATE_RUNNING, STATE_PUBLISHING),
+            )
+            return cur.rowcount == 1
+        return self._write(_tx)
+
+    def save_result(self, job_id: int, worker_id: str, result: Dict) -> bool:
+        """실행 중 중간 결과 저장 (예: 게시 단계에서 만든 초안 id). 재시도 시 job["result"]로 다시 전달된다"""
+        now = time.time()
+
+        def _tx(conn):
+            cur = conn.execute(
+                "UPDATE jobs SET result = ?, updated_at = ? WHERE id = ? AND lease_owner = ? AND state IN (?, ?)",
+                (json.dumps(result, ensure_ascii=False), now, job_id, worker_id, STATE_RUNNING, STATE_PUBLISHING),
+            )
+            return cur.rowcount == 1
+        return self._write(_tx)
+
+    def complete(self, job_id: int, worker_id: str, result: Optional[Dict] = None,
+                 publish: bool = False) -> Optional[str]:
+        """성공 기록. 생성 단계에서 publish=True면 ready(발행 대기), 그 외에는 done. 최종 상태 반환"""
+        return self._finish(job_id, worker_id, STATE_READY if publish else STATE_DONE, result=result)
+
+    def fail(self, job_id: int, worker_id: str, error: str, retry: bool = True) -> Optional[str]:
+        """실패 기록. 시도 횟수가 남았으면 지수 백오프 후 같은 단계를 재시도
+        (생성: retrying, 발행: ready), 아니면(또는 retry=False) failed. 최종 상태 반환"""
+        return self._finish(job_id, worker_id, None if retry else STATE_FAILED, error=error)
+
+    def _finish(self, job_id: int, worker_id: str, state: Optional[str],
+                result: Optional[Dict] = None, error: Optional[str] = None) -> Optional[str]:
+        now = time.time()
+
+        def _tx(conn):
+            row = conn.execute("SELECT batch_id, state, attempts, max_attempts, lease_owner, result FROM jobs"
+                               " WHERE id = ?", (job_id,)).fetchone()
+            if not row or row["lease_owner"] != worker_id:
+                return None  # 임대를 잃은 워커의 결과는 버림
+            publishing = row["state"] == STATE_PUBLISHING
+            final = state
+            not_before = 0.0
+            attempts = row["attempts"]
+            stored = json.dumps(result, ensure_ascii=False) if result is not None else row["result"]
+            if final is None:
+                if row["attempts"] < row["max_attempts"]:
+                    final = STATE_READY if publishing else STATE_RETRYING
+                    not_before = now + self.retry_delay * (2 ** (row["attempts"] - 1))
+                else:
+                    final = STATE_FAILED
+            elif final == STATE_READY:
+                attempts = 0  # 발행 단계 시도 횟수는 새로 센다
+            conn.execute(
+                "UPDATE jobs SET state = ?, attempts = ?, result = ?, error = ?, not_before = ?, lease_owner = NULL,"
+                " lease_expires = NULL, updated_at = ?, finished_at = ? WHERE id = ?",
+                (final, attempts, stored, error, not_before, now,
+                 now if final in TERMINAL_STATES else None, job_id),
+            )
+            if publishing and final == STATE_DONE:
+                # 다음 게시는 간격만큼 뒤에 (기존 time.sleep 간격과 같은 의미, 생성에는 적용하지 않음)
+                conn.execute("UPDATE batches SET next_start_at = ? + interval_seconds WHERE id = ?",
+                             (now, row["batch_id"]))
+            return final
+        return self._write(_tx)
+
+    # --- 조회 ---
+    def _counts(self, batch_id: str) -> Dict[str, int]:
+        rows = self._conn.execute("SELECT state, COUNT(*) FROM jobs WHERE batch_id = ? GROUP BY state",
+                                  (batch_id,)).fetchall()
+        return {state: count for state, count in rows}
+
+    def batch_finished(self, batch_id: str) -> bool:
+        with self._lock:
+            counts = self._counts(batch_id)
+        return bool(counts) and all(state in TERMINAL_STATES for state in counts)
+
+    def list_batches(self, limit: int = 50) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM batches ORDER BY created_at DESC LIMIT ?", (limit,)).fetchall()
+            return [self._batch_dict(row, self._counts(row["id"])) for row in rows]
+
+    def get_batch(self, batch_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM batches WHERE id = ?", (batch_id,)).fetchone()
+            if not row:
+                return None
+            batch = self._batch_dict(row, self._counts(batch_id))
+            jobs = self._conn.execute("SELECT * FROM jobs WHERE batch_id = ? ORDER BY seq", (batch_id,)).fetchall()
+        batch["items"] = [{
+            "id": j["id"], "seq": j["seq"], "url": j["url"], "state": j["state"],
+            "attempts": j["attempts"], "max_attempts": j["max_attempts"],
+            "error": j["error"], "result": json.loads(j["result"]) if j["result"] else None,
+            "started_at": j["started_at"], "finished_at": j["finished_at"], "heartbeat_at": j["heartbeat_at"],
+            "publish_at_iso": json.loads(j["payload"] or "{}").get("publish_at_iso"),
+            "not_before": j["not_before"] or None,
+        } for j in jobs]
+        return batch
+
+    @staticmethod
+    def _batch_dict(row: sqlite3.Row, counts: Dict[str, int]) -> Dict:
+        done = counts.get(STATE_DONE, 0) + counts.get(STATE_FAILED, 0)
+        return {
+            "id": row["id"],
+            "total": row["total"],
+            "counts": counts,
+            "progress": (done / row["total"]) if row["total"] else 1.0,
+            "finished": done == row["total"],
+            "interval_seconds": row["interval_seconds"],
+            "options": json.loads(row["options"] or "{}"),
+            "created_at": row["created_at"],
+        }
+
+
+class JobWorker:
+    """큐에서 작업을 꺼내 handler(job) → 결과 dict 를 실행하는 백그라운드 스레드.
+    handler가 예외를 던지면 재시도 대상으로 기록한다 (PermanentJobError면 바로 failed). 실행 중에는 heartbeat로 임대를 연장한다.
+    phase=generate 워커는 needs_publish(job, result)가 참이면 항목을 ready로 넘기고,
+    phase=publish 워커(발행 페이서)가 이를 이어받는다."""
+
+    def __init__(self, queue: JobQueue, handler: Callable[[Dict], Optional[Dict]],
+                 poll_interval: float = 2.0, on_finished: Optional[Callable[[Dict, str], None]] = None,
+                 phase: str = PHASE_GENERATE, needs_publish: Optional[Callable[[Dict, Dict], bool]] = None):
+        self.queue = queue
+        self.handler = handler
+        self.phase = phase
+        self.needs_publish = needs_publish
+        self.poll_interval = poll_interval
+        self.on_finished = on_finished
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "JobWorker":
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name=f"job-{self.phase}", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                job = self.queue.claim(self.worker_id, self.phase)
+            except Exception as e:
+                print(f"⚠️ 작업 큐 조회 실패: {e}")
+                job = None
+            if not job:
+                self._stop.wait(self.poll_interval)
+                continue
+            self._execute(job)
+
+    def _execute(self, job: Dict) -> None:
+        beating = threading.Event()
+
+        def _heartbeat():
+            while not beating.wait(self.queue.lease_seconds / 3):
+                try:
+                    if not self.queue.heartbeat(job["id"], self.worker_id):
+                        print(f"⚠️ 작업 #{job['id']} 임대를 잃었습니다.")
+                        return
+                except Exception:
+                    pass
+
+        hb = threading.Thread(target=_heartbeat, name=f"job-heartbeat-{job['id']}", daemon=True)
+        hb.start()
+        try:
+            result = self.handler(job)
+            publish = (self.phase == PHASE_GENERATE and self.needs_publish is not None
+                       and bool(self.needs_publish(job, result or {})))
+            final = self.queue.complete(job["id"], self.worker_id, result, publish=publish) or STATE_DONE
+        except PermanentJobError as e:
+            final = self.queue.fail(job["id"], self.worker_id, str(e), retry=False) or STATE_FAILED
+        except Exception as e:
+            final = self.queue.fail(job["id"], self.worker_id, str(e)) or STATE_FAILED
+        finally:
+            beating.set()
+        if self.on_finished:
+            try:
+                self.on_finished(job, final)
+            except Exception:
+                pass
+
+
+_queue: Optional[JobQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """프로세스 전역 작업 큐 (지연 생성)"""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = JobQueue()
+        return _queue
@@ -0,0 +1,104 @@
+"""한→영 키워드 번역 사전 (SQLite 영구 저장).
+
+이미지 검색용 키워드 번역 결과를 키워드 단위로 저장해, 이미 본 키워드는 LLM을 거치지 않는다.
+사전에 없는 키워드만 한 번의 배치 요청으로 번역하고 그 결과로 사전을 채운다.
+
+환경변수:
+  - KEYWORD_TRANSLATION_CACHE_ENABLED=0  → 사전 비활성화 (기본 1)
+  - KEYWORD_TRANSLATION_CACHE_PATH=...   → DB 파일 경로 (기본 keyword_translations.sqlite3)
+"""
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+
+def normalize_keyword(keyword: str) -> str:
+    """사전 조회 키: 앞뒤 공백 제거, 연속 공백 축약, 소문자화"""
+    return re.sub(r'\s+', ' ', (keyword or '').strip()).lower()
+
+
+def is_english(keyword: str) -> bool:
+    """이미 영어(ASCII)인 키워드는 번역 불필요"""
+    return bool(keyword) and all(ord(ch) < 128 for ch in keyword)
+
+
+class KeywordTranslationStore:
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("KEYWORD_TRANSLATION_CACHE_PATH", "keyword_translations.sqlite3")
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS keyword_translations ("
+            " keyword TEXT PRIMARY KEY, english TEXT NOT NULL,"
+            " uses INTEGER NOT NULL DEFAULT 0, created_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get_many(self, keywords: Iterable[str]) -> Dict[str, str]:
+        """사전에 있는 키워드만 {정규화 키워드: 영어} 로 반환"""
+        keys = list(dict.fromkeys(normalize_keyword(k) for k in keywords if k))
+        if not keys:
+            return {}
+        placeholders = ",".join("?" * len(keys))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT keyword, english FROM keyword_translations WHERE keyword IN ({placeholders})", keys
+            ).fetchall()
+            found = dict(rows)
+            if found:
+                self._conn.executemany(
+                    "UPDATE keyword_translations SET uses = uses + 1 WHERE keyword = ?", [(k,) for k in found]
+                )
+                self._conn.commit()
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, translations: Dict[str, str]) -> None:
+        now = time.time()
+        rows = [(normalize_keyword(k), v.strip(), now) for k, v in translations.items()
+                if normalize_keyword(k) and isinstance(v, str) and v.strip()]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO keyword_translations (keyword, english, created_at) VALUES (?, ?, ?)", rows
+            )
+            self._conn.commit()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM keyword_translations").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            "entries": entries,
+        }
+
+
+_store: Optional[KeywordTranslationStore] = None
+_store_failed = False
+_store_lock = threading.Lock()
+
+
+def get_keyword_store() -> Optional[KeywordTranslationStore]:
+    """프로세스 전역 번역 사전 (비활성화 또는 열기 실패 시 None)"""
+    global _store, _store_failed
+    if os.getenv("KEYWORD_TRANSLATION_CACHE_ENABLED", "1") == "0":
+        return None
+    with _store_lock:
+        if _store is None and not _store_failed:
+            try:
+                _store = KeywordTranslationStore()
+            except Exception as e:
+                _store_failed = True
+                print(f"⚠️ 키워드 번역 사전을 열 수 없습니다: {e}")
+        return _store
@@ -0,0 +1,154 @@
+"""LLM 응답 영구 캐시 (SQLite, 내용 주소 지정).
+
+키는 (model, messages, temperature, max_tokens)의 SHA-256 해시.
+같은 프롬프트의 재시도/배치 재실행/미리보기→변환 흐름에서 네트워크 호출을 생략한다.
+
+환경변수:
+  - LLM_CACHE_ENABLED=0          → 캐시 비활성화 (기본 1)
+  - LLM_CACHE_PATH=...           → DB 파일 경로 (기본 llm_cache.sqlite3)
+  - LLM_CACHE_MAX_MB=256         → 총 용량 상한, 초과 시 LRU 제거 (상한의 90%까지, 청크 단위)
+  - LLM_CACHE_TTL_SECONDS=604800 → 항목 유효기간 (기본 7일, 0이면 무기한)
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+_EVICT_CHUNK = 64       # 한 번에 지우는 LRU 항목 수
+_EVICT_LOW_WATER = 0.9  # 상한을 넘으면 이 비율까지 줄여 매 삽입마다 제거가 반복되지 않게 함
+
+
+class LLMCache:
+    def __init__(self, path: Optional[str] = None, max_bytes: Optional[int] = None,
+                 ttl_seconds: Optional[float] = None):
+        self.path = path or os.getenv("LLM_CACHE_PATH", "llm_cache.sqlite3")
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv("LLM_CACHE_MAX_MB", "256")) * 1024 * 1024)
+        if ttl_seconds is None:
+            ttl_seconds = float(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            " key TEXT PRIMARY KEY, model TEXT, response TEXT NOT NULL,"
+            " size INTEGER NOT NULL, created_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_access ON llm_cache(last_access)")
+        self._conn.commit()
+        # 총 용량 추정치: 삽입마다 SUM을 돌리지 않도록 메모리에서 누적. 다른 프로세스도 같은 파일을 쓰므로
+        # 상한을 넘었다고 보일 때만 실제 합계로 다시 맞춘다
+        self._total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+
+    @staticmethod
+    def make_key(model: str, messages: List[Dict], temperature: float, max_tokens: Optional[int] = None,
+                 response_format: Optional[Dict] = None) -> str:
+        material = {"model": model, "messages": messages, "temperature": temperature, "max_tokens": max_tokens}
+        if response_format:
+            material["response_format"] = response_format
+        raw = json.dumps(material, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """캐시 조회. 만료 항목은 삭제 후 미스로 처리."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row and self.ttl_seconds and now - row[1] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                row = None
+            if not row:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        try:
+            return json.loads(row[0])
+        except Exception:
+            return None
+
+    def put(self, key: str, model: str, response: Dict) -> None:
+        payload = json.dumps(response, ensure_ascii=False)
+        size = len(payload.encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, model, response, size, created_at, last_access)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, payload, size, now, now),
+            )
+            self._total += size - (old[0] if old else 0)
+            if self.max_bytes and self._total > self.max_bytes:
+                self._evict_locked()
+            self._conn.commit()
+
+    def _evict_locked(self) -> None:
+        """총 용량이 상한을 넘으면 가장 오래 사용되지 않은 항목부터 청크 단위로 제거"""
+        self._total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+        if self._total <= self.max_bytes:
+            return
+        target = self.max_bytes * _EVICT_LOW_WATER
+        while self._total > target:
+            rows = self._conn.execute(
+                "SELECT key, size FROM llm_cache ORDER BY last_access ASC LIMIT ?", (_EVICT_CHUNK,)
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._total -= size
+                if self._total <= target:
+                    break
+
+    def stats(self) -> Dict:
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            "entries": entries,
+            "bytes": total,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+            self._total = 0
+
+
+_cache: Optional[LLMCache] = None
+_cache_failed = False
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMCache]:
+    """프로세스 전역 캐시 (비활성화 또는 열기 실패 시 None)"""
+    global _cache, _cache_failed
+    if os.getenv("LLM_CACHE_ENABLED", "1") == "0":
+        return None
+    with _cache_lock:
+        if _cache is None and not _cache_failed:
+            try:
+                _cache = LLMCache()
+            except Exception as e:
+                _cache_failed = True
+                print(f"⚠️ LLM 캐시를 열 수 없습니다: {e}")
+        return _cache
@@ -0,0 +1,388 @@
+"""OpenAI Chat Completions 공용 게이트웨이.
+
+YouTubeAutoBlogger / YouTubeToSEOContent / GoogleBloggerAutomation이 모두 이 모듈을 통해
+LLM을 호출한다.
+
+- 프로세스 전역 keep-alive 커넥션 풀 (동기 httpx.Client 1개 + 이벤트 루프별 AsyncClient)
+- 선택적 HTTP/2 (LLM_HTTP2=1, h2 패키지 설치 시)
+- 시작 시 커넥션 예열(warmup)
+- 모델/API 키는 호출마다 결정 (인자 → 환경변수 → 기본값). openai 모듈 전역 상태를 쓰지 않음
+- httpx.Client는 스레드 안전하므로 여러 Flask 스레드에서 동시에 호출 가능
+- 동일 요청은 llm_cache(SQLite)에서 응답 (use_cache=False로 호출별 우회)
+- astream_chat_completion: SSE 청크를 증분 파싱해 on_delta로 전달, TTFT/tokens/sec 측정
+- 호스트별 지연과 usage 토큰 수는 metrics 모듈로 집계
+- 모든 요청은 rate_limiter(RPM/TPM 버킷 + AIMD 동시성)를 거치며 429/5xx/연결 오류는 백오프 후 재시도
+"""
+import asyncio
+import json
+import os
+import threading
+import time
+import weakref
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+from llm_cache import LLMCache, get_llm_cache
+from metrics import get_metrics
+from rate_limiter import get_rate_limiter
+
+try:
+    import h2  # noqa: F401  (HTTP/2 선택 지원)
+    _HAS_H2 = True
+except Exception:
+    _HAS_H2 = False
+
+DEFAULT_BASE_URL = "https://api.openai.com/v1"
+DEFAULT_MODEL = "gpt-4o-mini"
+
+
+class LLMError(Exception):
+    """LLM 호출 실패 (HTTP 오류 또는 키 누락)"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def message_content(response: Dict) -> Optional[str]:
+    """Chat Completions 응답 JSON에서 첫 번째 메시지 본문 추출"""
+    try:
+        return (response.get("choices") or [{}])[0].get("message", {}).get("content")
+    except Exception:
+        return None
+
+
+def _total_tokens(usage: Optional[Dict]) -> Optional[int]:
+    try:
+        return int(usage["total_tokens"]) if usage and usage.get("total_tokens") is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class LLMGateway:
+    def __init__(self, base_url: Optional[str] = None, http2: Optional[bool] = None,
+                 max_connections: int = 50, max_keepalive_connections: int = 20,
+                 keepalive_expiry: float = 90.0):
+        self.base_url = (base_url or os.getenv("OPENAI_BASE_URL") or DEFAULT_BASE_URL).rstrip("/")
+        if http2 is None:
+            http2 = os.getenv("LLM_HTTP2", "0") == "1"
+        self.http2 = bool(http2) and _HAS_H2
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._client: Optional[httpx.Client] = None
+        self._lock = threading.Lock()
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+    # --- 커넥션 풀 ---
+    def _sync_client(self) -> httpx.Client:
+        with self._lock:
+            if self._client is None or self._client.is_closed:
+                self._client = httpx.Client(
+                    transport=get_metrics().httpx_transport(http2=self.http2, limits=self._limits),
+                    trust_env=False,  # OS 프록시 무시
+                    timeout=httpx.Timeout(120.0, connect=10.0),
+                )
+            return self._client
+
+    def _async_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                transport=get_metrics().async_httpx_transport(http2=self.http2, limits=self._limits),
+                trust_env=False,
+                timeout=httpx.Timeout(120.0, connect=10.0),
+            )
+            self._async_clients[loop] = client
+        return client
+
+    # --- 요청 구성/응답 처리 ---
+    @staticmethod
+    def resolve_model(model: Optional[str] = None) -> str:
+        return model or os.getenv("OPENAI_MODEL") or DEFAULT_MODEL
+
+    @staticmethod
+    def resolve_api_key(api_key: Optional[str] = None) -> Optional[str]:
+        return api_key or os.getenv("OPENAI_API_KEY")
+
+    def _build_request(self, messages: List[Dict], model: Optional[str], api_key: Optional[str],
+                       temperature: float, max_tokens: Optional[int],
+                       response_format: Optional[Dict] = None) -> tuple:
+        key = self.resolve_api_key(api_key)
+        if not key:
+            raise LLMError("OpenAI API 키가 설정되지 않았습니다.")
+        headers = {"Authorization": f"Bearer {key}", "Content-Type": "application/json"}
+        payload: Dict = {
+            "model": self.resolve_model(model),
+            "messages": messages,
+            "temperature": temperature,
+        }
+        if max_tokens:
+            payload["max_tokens"] = max_tokens
+        if response_format:
+            payload["response_format"] = response_format
+        return headers, payload
+
+    # --- 전송 (속도 제한 + 재시도) ---
+    def _send(self, headers: Dict, payload: Dict, timeout: float) -> Dict:
+        """동기 전송. 재시도 가능한 실패는 제한기가 정한 대기 후 다시 보낸다"""
+        limiter = get_rate_limiter()
+        tokens = limiter.estimate_tokens(payload)
+        attempt = 0
+        while True:
+            limiter.acquire(tokens)
+            resp: Optional[httpx.Response] = None
+            used: Optional[int] = None
+            try:
+                resp = self._sync_client().post(f"{self.base_url}/chat/completions", headers=headers,
+                                                json=payload, timeout=timeout)
+                if resp.status_code == 200:
+                    data = resp.json()
+                    used = _total_tokens(data.get("usage"))
+                    return data
+            except httpx.TransportError as e:
+                resp, error = None, str(e)
+            finally:
+                # 본문 파싱 실패 등 어떤 예외에도 슬롯을 반납 (동시성 슬롯 누수 방지)
+                limiter.release(tokens, resp.status_code if resp is not None else None,
+                                resp.headers if resp is not None else None, used)
+            if resp is None:
+                delay = self._retry_or_raise(limiter, attempt, None, error, None)
+            else:
+                delay = self._retry_or_raise(limiter, attempt, resp.status_code, resp.text, resp.headers)
+            time.sleep(delay)
+            attempt += 1
+
+    async def _asend(self, headers: Dict, payload: Dict, timeout: float, stream: bool = False) -> httpx.Response:
+        """비동기 전송. 200 응답을 돌려주며 stream=True면 본문을 읽지 않은 채로 반환한다.
+        호출자는 응답 처리 후 반드시 _arelease로 제한기 슬롯을 반납해야 한다."""
+        limiter = get_rate_limiter()
+        tokens = limiter.estimate_tokens(payload)
+        client = self._async_client()
+        attempt = 0
+        while True:
+            await limiter.aacquire(tokens)
+            resp: Optional[httpx.Response] = None
+            handed_off = False
+            try:
+                request = client.build_request("POST", f"{self.base_url}/chat/completions", headers=headers,
+                                               json=payload, timeout=timeout)
+                resp = await client.send(request, stream=stream)
+                if resp.status_code == 200:
+                    resp.extensions["rate_limit_tokens"] = tokens
+                    handed_off = True  # 이후 반납은 호출자(_arelease) 몫
+                    return resp
+                if stream:
+                    await resp.aread()
+                    await resp.aclose()
+            except httpx.TransportError as e:
+                resp, error = None, str(e)
+            finally:
+                # 취소(CancelledError)나 예상 밖 예외에도 슬롯을 반납 (AIMD 동시성 한도 누수 방지)
+                if not handed_off:
+                    limiter.release(tokens, resp.status_code if resp is not None else None,
+                                    resp.headers if resp is not None else None)
+            if resp is None:
+                delay = self._retry_or_raise(limiter, attempt, None, error, None)
+            else:
+                delay = self._retry_or_raise(limiter, attempt, resp.status_code, resp.text, resp.headers)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def _arelease(resp: httpx.Response, usage: Optional[Dict]) -> None:
+        get_rate_limiter().release(resp.extensions.get("rate_limit_tokens", 0), resp.status_code,
+                                   resp.headers, _total_tokens(usage))
+
+    @staticmethod
+    def _retry_or_raise(limiter, attempt: int, status: Optional[int], body: str, headers) -> float:
+        """재시도할 수 있으면 대기 초를 반환, 아니면 LLMError"""
+        if attempt >= limiter.max_retries or not limiter.should_retry(status, body):
+            if status is None:
+                raise LLMError(f"OpenAI 연결 오류: {body}")
+            raise LLMError(f"OpenAI 응답 오류: {status} {body[:500]}", status)
+        get_metrics().record_llm_retry(str(status) if status else "network")
+        return limiter.retry_delay(attempt, headers)
+
+    # --- 캐시 ---
+    @staticmethod
+    def _cache_key(payload: Dict) -> str:
+        return LLMCache.make_key(payload["model"], payload["messages"], payload["temperature"], payload.get("max_tokens"),
+                                 response_format=payload.get("response_format"))
+
+    # --- 호출 ---
+    def chat_completion(self, messages: List[Dict], *, model: Optional[str] = None,
+                        api_key: Optional[str] = None, temperature: float = 0.7,
+                        max_tokens: Optional[int] = None, timeout: float = 120.0,
+                        use_cache: bool = True, response_format: Optional[Dict] = None) -> Dict:
+        """Chat Completions 호출 후 응답 JSON 반환 (실패 시 LLMError)"""
+        headers, payload = self._build_request(messages, model, api_key, temperature, max_tokens, response_format)
+        cache = get_llm_cache() if use_cache else None
+        if cache:
+            key = self._cache_key(payload)
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+        data = self._send(headers, payload, timeout)
+        get_metrics().record_llm_usage(payload["model"], data.get("usage"))
+        if cache and message_content(data):
+            cache.put(key, payload["model"], data)
+        return data
+
+    async def achat_completion(self, messages: List[Dict], *, model: Optional[str] = None,
+                               api_key: Optional[str] = None, temperature: float = 0.7,
+                               max_tokens: Optional[int] = None, timeout: float = 120.0,
+                               use_cache: bool = True, response_format: Optional[Dict] = None) -> Dict:
+        """chat_completion의 비동기 버전 (캐시 I/O는 스레드에서 수행)"""
+        headers, payload = self._build_request(messages, model, api_key, temperature, max_tokens, response_format)
+        cache = get_llm_cache() if use_cache else None
+        if cache:
+            key = self._cache_key(payload)
+            cached = await asyncio.to_thread(cache.get, key)
+            if cached is not None:
+                return cached
+        resp = await self._asend(headers, payload, timeout)
+        data: Optional[Dict] = None
+        try:
+            data = resp.json()
+        finally:
+            # 실제 사용량으로 TPM 예약분을 정산 (응답 파싱 실패 시에는 예약분 그대로 해제)
+            self._arelease(resp, data.get("usage") if isinstance(data, dict) else None)
+        get_metrics().record_llm_usage(payload["model"], data.get("usage"))
+        if cache and message_content(data):  # 빈 응답은 캐시하지 않음 (재시도해도 계속 빈 값이 나오게 됨)
+            await asyncio.to_thread(cache.put, key, payload["model"], data)
+        return data
+
+    async def astream_chat_completion(self, messages: List[Dict], *, model: Optional[str] = None,
+                                      api_key: Optional[str] = None, temperature: float = 0.7,
+                                      max_tokens: Optional[int] = None, timeout: float = 120.0,
+                                      use_cache: bool = True, response_format: Optional[Dict] = None,
+                                      on_delta: Optional[Callable[[str], None]] = None) -> Dict:
+        """stream=True로 호출해 부분 텍스트를 on_delta로 전달.
+        반환 형식은 achat_completion과 같고, 추가로 "stream_stats"
+        (ttft: 첫 토큰까지 초, tokens_per_sec, duration, completion_tokens)를 포함한다.
+        """
+        headers, payload = self._build_request(messages, model, api_key, temperature, max_tokens, response_format)
+        cache = get_llm_cache() if use_cache else None
+        if cache:
+            key = self._cache_key(payload)
+            cached = await asyncio.to_thread(cache.get, key)
+            if cached is not None:
+                return cached
+        payload["stream"] = True
+        payload["stream_options"] = {"include_usage": True}
+
+        started = time.monotonic()
+        first_token_at: Optional[float] = None
+        parts: List[str] = []
+        chunks = 0
+        usage: Optional[Dict] = None
+        finish_reason = None
+        # 재시도는 스트림이 시작되기 전(응답 상태 확인 단계)까지만 수행
+        resp = await self._asend(headers, payload, timeout, stream=True)
+        try:
+            async for line in resp.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                try:
+                    chunk = json.loads(data)
+                except ValueError:
+                    continue
+                if chunk.get("usage"):
+                    usage = chunk["usage"]
+                for choice in chunk.get("choices") or []:
+                    delta = (choice.get("delta") or {}).get("content")
+                    if choice.get("finish_reason"):
+                        finish_reason = choice["finish_reason"]
+                    if not delta:
+                        continue
+                    if first_token_at is None:
+                        first_token_at = time.monotonic()
+                    chunks += 1
+                    parts.append(delta)
+                    if on_delta:
+                        try:
+                            on_delta(delta)
+                        except Exception:
+                            pass
+        finally:
+            self._arelease(resp, usage)
+            await resp.aclose()
+        finished = time.monotonic()
+        get_metrics().record_llm_usage(payload["model"], usage)
+
+        content = "".join(parts)
+        completion_tokens = (usage or {}).get("completion_tokens") or chunks
+        gen_time = finished - (first_token_at or finished)
+        data = {
+            "object": "chat.completion",
+            "model": payload["model"],
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": finish_reason}],
+            "usage": usage,
+        }
+        if cache and content:
+            await asyncio.to_thread(cache.put, key, payload["model"], data)
+        return {
+            **data,
+            "stream_stats": {
+                "ttft": (first_token_at - started) if first_token_at else None,
+                "tokens_per_sec": (completion_tokens / gen_time) if gen_time > 0 else None,
+                "duration": finished - started,
+                "completion_tokens": completion_tokens,
+            },
+        }
+
+    def chat(self, messages: List[Dict], **kwargs) -> Optional[str]:
+        """chat_completion 후 본문 텍스트만 반환"""
+        return message_content(self.chat_completion(messages, **kwargs))
+
+    async def achat(self, messages: List[Dict], **kwargs) -> Optional[str]:
+        """achat_completion 후 본문 텍스트만 반환"""
+        return message_content(await self.achat_completion(messages, **kwargs))
+
+    # --- 예열/정리 ---
+    def warmup(self, api_key: Optional[str] = None) -> None:
+        """TLS 핸드셰이크를 미리 수행해 첫 호출 지연을 줄임. 실패는 무시."""
+        key = self.resolve_api_key(api_key)
+        headers = {"Authorization": f"Bearer {key}"} if key else {}
+        try:
+            self._sync_client().get(f"{self.base_url}/models", headers=headers, timeout=10)
+        except Exception:
+            pass
+        try:
+            from async_support import run_sync
+            run_sync(self._awarmup(headers))
+        except Exception:
+            pass
+
+    async def _awarmup(self, headers: Dict) -> None:
+        await self._async_client().get(f"{self.base_url}/models", headers=headers, timeout=10)
+
+    def warmup_in_background(self, api_key: Optional[str] = None) -> None:
+        threading.Thread(target=self.warmup, args=(api_key,), name="llm-warmup", daemon=True).start()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+
+_gateway: Optional[LLMGateway] = None
+_gateway_lock = threading.Lock()
+
+
+def get_gateway() -> LLMGateway:
+    """프로세스 전역 게이트웨이 (지연 생성)"""
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = LLMGateway()
+        return _gateway
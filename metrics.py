@@ -0,0 +1,319 @@
+"""파이프라인 계측 (프로세스 내 메모리, Prometheus 텍스트 포맷 출력).
+
+- 단계별 소요 시간: transcript, analysis, length_fix, korean_fix(chain) / content_fix(single_pass·outline),
+  translate, image_search, render, blogger_post → summary(p50/p95/p99, 최근 샘플 기준)
+- LLM 호출 단계별 소요 시간 (analysis/translate/... stage 라벨) → summary
+- 외부 HTTP 호출 호스트별 지연/상태 → histogram (httpx 전송 계층 래퍼로 수집, 연결 실패/타임아웃은 status="error")
+- LLM usage 필드의 토큰 수, 캐시(llm/transcript/keyword_translation) 적중률
+  (이미 열린 캐시만 읽는다: /api/metrics 조회가 DB 파일을 만들지 않음)
+
+gunicorn 워커가 여러 개면 워커별 값이다. 사용 예:
+    with get_metrics().stage("transcript"):
+        ...
+
+stage_listener(callback) 블록 안에서는 stage()가 시작/끝날 때마다 callback(단계 이름, 진행 중 여부)를 부른다
+(비동기 변환 작업의 진행 단계 표시용, contextvars라 run_sync/asyncio.to_thread로도 전달된다).
+callback은 이벤트 루프 스레드에서도 불리므로 메모리 갱신 정도로 짧게 끝나야 한다.
+"""
+import bisect
+import contextvars
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+
+# 초 단위 히스토그램 버킷 (외부 호출 지연)
+HTTP_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+QUANTILES = (0.5, 0.95, 0.99)
+
+_stage_listener: contextvars.ContextVar = contextvars.ContextVar("metrics_stage_listener", default=None)
+
+
+@contextmanager
+def stage_listener(callback: Callable[[str, bool], None]) -> Iterator[None]:
+    """블록 안의 stage() 시작/종료를 callback(stage, True/False)로 알림"""
+    token = _stage_listener.set(callback)
+    try:
+        yield
+    finally:
+        _stage_listener.reset(token)
+
+
+def _notify_listener(listener: Optional[Callable[[str, bool], None]], stage: str, active: bool) -> None:
+    if listener is not None:
+        try:
+            listener(stage, active)
+        except Exception:
+            pass
+
+
+class _MeteredTransport(httpx.BaseTransport):
+    """이벤트 훅은 응답이 있을 때만 불리므로, 연결 실패/타임아웃까지 세려고 전송 계층에서 계측"""
+
+    def __init__(self, metrics: "Metrics", inner: httpx.BaseTransport):
+        self._metrics = metrics
+        self._inner = inner
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        try:
+            response = self._inner.handle_request(request)
+        except Exception:
+            self._metrics.observe_http(request.url.host, time.perf_counter() - started, None)
+            raise
+        self._metrics.observe_http(request.url.host, time.perf_counter() - started, response.status_code)
+        return response
+
+    def close(self) -> None:
+        self._inner.close()
+
+
+class _AsyncMeteredTransport(httpx.AsyncBaseTransport):
+    def __init__(self, metrics: "Metrics", inner: httpx.AsyncBaseTransport):
+        self._metrics = metrics
+        self._inner = inner
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        try:
+            response = await self._inner.handle_async_request(request)
+        except BaseException:  # 취소(CancelledError)도 응답 없이 끝난 호출로 센다
+            self._metrics.observe_http(request.url.host, time.perf_counter() - started, None)
+            raise
+        self._metrics.observe_http(request.url.host, time.perf_counter() - started, response.status_code)
+        return response
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+class _Summary:
+    """최근 N개 샘플로 분위수를 계산하는 summary"""
+
+    def __init__(self, window: int = 2048):
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.samples.append(value)
+        self.count += 1
+        self.total += value
+
+    def quantile(self, q: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class _Histogram:
+    def __init__(self, buckets: Tuple[float, ...] = HTTP_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        idx = bisect.bisect_left(self.buckets, value)
+        if idx < len(self.counts):
+            self.counts[idx] += 1
+        self.count += 1
+        self.total += value
+
+
+def _labels(**labels: str) -> str:
+    inner = ",".join(f'{k}="{str(v).replace(chr(34), "")}"' for k, v in labels.items())
+    return "{" + inner + "}" if inner else ""
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages: Dict[str, _Summary] = {}
+        self._llm_calls: Dict[str, _Summary] = {}
+        self._http: Dict[str, _Histogram] = {}
+        self._http_status: Dict[Tuple[str, str], int] = {}
+        self._llm_tokens: Dict[Tuple[str, str], int] = {}
+        self._llm_requests: Dict[str, int] = {}
+        self._llm_retries: Dict[str, int] = {}
+        self._cache_sources: Dict[str, Callable[[], Optional[Dict]]] = {}
+        self._gauges: Dict[str, tuple] = {}
+
+    # --- 수집 ---
+    def observe_stage(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self._stages.setdefault(stage, _Summary()).observe(seconds)
+
+    @contextmanager
+    def stage(self, stage: str) -> Iterator[None]:
+        """with 블록 소요 시간을 단계 타이머에 기록 (예외가 나도 기록)"""
+        listener = _stage_listener.get()
+        _notify_listener(listener, stage, True)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_stage(stage, time.perf_counter() - started)
+            _notify_listener(listener, stage, False)
+
+    def observe_llm_call(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self._llm_calls.setdefault(stage, _Summary()).observe(seconds)
+
+    def observe_http(self, host: str, seconds: float, status: Optional[int]) -> None:
+        with self._lock:
+            self._http.setdefault(host, _Histogram()).observe(seconds)
+            key = (host, str(status or "error"))
+            self._http_status[key] = self._http_status.get(key, 0) + 1
+
+    def record_llm_usage(self, model: str, usage: Optional[Dict]) -> None:
+        with self._lock:
+            self._llm_requests[model] = self._llm_requests.get(model, 0) + 1
+            for kind in ("prompt_tokens", "completion_tokens"):
+                value = (usage or {}).get(kind)
+                if value:
+                    key = (model, kind.replace("_tokens", ""))
+                    self._llm_tokens[key] = self._llm_tokens.get(key, 0) + int(value)
+
+    def record_llm_retry(self, reason: str) -> None:
+        with self._lock:
+            self._llm_retries[reason] = self._llm_retries.get(reason, 0) + 1
+
+    def register_gauge(self, name: str, help_text: str, value_fn: Callable[[], Optional[float]]) -> None:
+        """출력 시점에 value_fn()으로 값을 읽는 게이지 등록"""
+        self._gauges[name] = (help_text, value_fn)
+
+    def register_cache(self, name: str, stats_fn: Callable[[], Optional[Dict]]) -> None:
+        """stats()가 {"hits", "misses"}를 돌려주는 캐시를 출력 대상에 등록"""
+        self._cache_sources[name] = stats_fn
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """단계별/LLM 단계별 {count, p50, p95, p99, mean} (벤치마크 보고용)"""
+        def _dump(summaries: Dict[str, _Summary]) -> Dict[str, Dict]:
+            return {
+                name: {"count": s.count, "mean": s.total / s.count if s.count else 0.0,
+                       **{f"p{int(q * 100)}": s.quantile(q) for q in QUANTILES}}
+                for name, s in summaries.items()
+            }
+        with self._lock:
+            return {"stages": _dump(self._stages), "llm_calls": _dump(self._llm_calls),
+                    "llm_tokens": {f"{m}:{k}": v for (m, k), v in self._llm_tokens.items()}}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages.clear()
+            self._llm_calls.clear()
+            self._http.clear()
+            self._http_status.clear()
+            self._llm_tokens.clear()
+            self._llm_requests.clear()
+            self._llm_retries.clear()
+
+    # --- httpx 전송 계층 계측 ---
+    def httpx_transport(self, **kwargs) -> httpx.BaseTransport:
+        """httpx.HTTPTransport(**kwargs)를 감싸 호스트별 지연/상태를 기록 (응답이 없으면 status="error")"""
+        return _MeteredTransport(self, httpx.HTTPTransport(**kwargs))
+
+    def async_httpx_transport(self, **kwargs) -> httpx.AsyncBaseTransport:
+        return _AsyncMeteredTransport(self, httpx.AsyncHTTPTransport(**kwargs))
+
+    # --- 출력 ---
+    def _summary_lines(self, name: str, help_text: str, summaries: Dict[str, _Summary]) -> List[str]:
+        lines = [f"# HELP {name} {help_text}", f"# TYPE {name} summary"]
+        for stage, summary in sorted(summaries.items()):
+            for q in QUANTILES:
+                lines.append(f"{name}{_labels(stage=stage, quantile=q)} {summary.quantile(q):.6f}")
+            lines.append(f"{name}_sum{_labels(stage=stage)} {summary.total:.6f}")
+            lines.append(f"{name}_count{_labels(stage=stage)} {summary.count}")
+        return lines
+
+    def render_prometheus(self) -> str:
+        with self._lock:
+            lines = self._summary_lines("pipeline_stage_seconds", "Pipeline stage duration", self._stages)
+            lines += self._summary_lines("llm_call_seconds", "LLM call duration by pipeline stage", self._llm_calls)
+
+            lines += ["# HELP http_client_request_seconds External HTTP call latency by host",
+                      "# TYPE http_client_request_seconds histogram"]
+            for host, hist in sorted(self._http.items()):
+                cumulative = 0
+                for bound, count in zip(hist.buckets, hist.counts):
+                    cumulative += count
+                    lines.append(f"http_client_request_seconds_bucket{_labels(host=host, le=bound)} {cumulative}")
+                lines.append(f"http_client_request_seconds_bucket{_labels(host=host, le='+Inf')} {hist.count}")
+                lines.append(f"http_client_request_seconds_sum{_labels(host=host)} {hist.total:.6f}")
+                lines.append(f"http_client_request_seconds_count{_labels(host=host)} {hist.count}")
+
+            lines += ["# HELP http_client_requests_total External HTTP calls by host and status",
+                      "# TYPE http_client_requests_total counter"]
+            for (host, status), count in sorted(self._http_status.items()):
+                lines.append(f"http_client_requests_total{_labels(host=host, status=status)} {count}")
+
+            lines += ["# HELP llm_requests_total LLM responses received (cache hits excluded)",
+                      "# TYPE llm_requests_total counter"]
+            for model, count in sorted(self._llm_requests.items()):
+                lines.append(f"llm_requests_total{_labels(model=model)} {count}")
+
+            lines += ["# HELP llm_tokens_total LLM tokens from the usage field",
+                      "# TYPE llm_tokens_total counter"]
+            for (model, kind), count in sorted(self._llm_tokens.items()):
+                lines.append(f"llm_tokens_total{_labels(model=model, kind=kind)} {count}")
+
+            lines += ["# HELP llm_retries_total LLM request retries by cause (HTTP status or network)",
+                      "# TYPE llm_retries_total counter"]
+            for reason, count in sorted(self._llm_retries.items()):
+                lines.append(f"llm_retries_total{_labels(reason=reason)} {count}")
+            sources = dict(self._cache_sources)
+            gauges = dict(self._gauges)
+
+        lines += ["# HELP cache_lookups_total Cache lookups by result", "# TYPE cache_lookups_total counter"]
+        ratios = []
+        for name, stats_fn in sorted(sources.items()):
+            try:
+                stats = stats_fn()
+            except Exception:
+                continue
+            if stats is None:  # 아직 열리지 않았거나 비활성화된 캐시
+                continue
+            hits, misses = stats.get("hits", 0), stats.get("misses", 0)
+            lines.append(f"cache_lookups_total{_labels(cache=name, result='hit')} {hits}")
+            lines.append(f"cache_lookups_total{_labels(cache=name, result='miss')} {misses}")
+            ratios.append(f"cache_hit_ratio{_labels(cache=name)} {(hits / (hits + misses)) if hits + misses else 0.0:.4f}")
+        lines += ["# HELP cache_hit_ratio Cache hit ratio", "# TYPE cache_hit_ratio gauge"] + ratios
+        for name, (help_text, value_fn) in sorted(gauges.items()):
+            try:
+                value = value_fn()
+            except Exception:
+                continue
+            if value is not None:
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name} {float(value):.6f}"]
+        return "\n".join(lines) + "\n"
+
+
+_metrics: Optional[Metrics] = None
+_metrics_lock = threading.Lock()
+
+
+def get_metrics() -> Metrics:
+    """프로세스 전역 계측 레지스트리 (지연 생성, 기본 캐시 등록 포함)"""
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = Metrics()
+            _register_default_caches(_metrics)
+        return _metrics
+
+
+def _register_default_caches(metrics: Metrics) -> None:
+    """캐시 싱글턴을 get_*()로 만들지 않고, 이미 열린 것만 읽는다 (아직 안 쓰인 캐시는 생략)"""
+    import keyword_translations
+    import llm_cache
+    import transcript_cache
+
+    for name, module, attr in (("llm", llm_cache, "_cache"), ("transcript", transcript_cache, "_cache"),
+                               ("keyword_translation", keyword_translations, "_store")):
+        metrics.register_cache(name, lambda module=module, attr=attr: (
+            getattr(module, attr).stats() if getattr(module, attr) is not None else None))
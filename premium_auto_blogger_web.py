@@ -4,11 +4,17 @@ import json
 import zipfile
 import tempfile
 from youtube_auto_blogger import YouTubeAutoBlogger
+from llm_gateway import get_gateway
+from metrics import get_metrics
+from job_queue import PHASE_GENERATE, PHASE_PUBLISH, STATE_FAILED, STATE_PUBLISHING, STATE_READY, STATE_RETRYING, JobWorker, PermanentJobError, get_job_queue
 from google_auth_oauthlib.flow import Flow
-from googleapiclient.discovery import build
+from blogger_service import get_blogger_service, get_service_factory
+from credential_manager import get_credential_manager
+from convert_jobs import ConvertJobRunner, get_convert_job_store
+from event_bus import get_event_bus
+from event_hub import GLOBAL_CHANNEL, TokenBatcher, get_event_hub, job_channel, job_context, parse_last_event_id
 import threading
 import time
-import queue
 import subprocess
 import shutil
 import sys
@@ -37,32 +43,40 @@ try:
 except Exception:
     pass
 
-# --- Simple in-process log streaming (SSE) ---
-_log_clients: list[queue.Queue] = []
+# --- 로그 스트리밍 (SSE) ---
+# 이벤트 허브: 채널별 링 버퍼 + 작업별 채널 + Last-Event-ID 재전송 + heartbeat, 끊긴 구독자는 자동 해제
+# 이벤트 버스(EVENT_BUS=local|sqlite|redis): 다른 워커/노드의 로그도 이 프로세스의 허브로 전달
+# (버스 스레드는 start_background_workers() 또는 첫 발행 때 시작)
+event_hub = get_event_hub()
+
+def push_event(event: str | None, data: str, job_id: str | None = None) -> None:
+    """이벤트 발행. job_id가 없으면 현재 job_context의 작업 채널에도 기록"""
+    get_event_bus().publish(event, data, job_id=job_id)
+
+# LLM 스트리밍 delta는 EVENT_TOKEN_FLUSH_SECONDS마다 묶어서 'token' 이벤트로 발행
+token_batcher = TokenBatcher(push_event)
 
 def push_log(message: str) -> None:
     ts = time.strftime('%H:%M:%S')
     line = f"[{ts}] {message}"
     print(line)
-    for q in list(_log_clients):
-        try:
-            q.put_nowait(line)
-        except Exception:
-            pass
+    token_batcher.flush()  # 앞서 나온 토큰을 먼저 내보내 순서 유지
+    push_event(None, line)
+
+def push_token(stage: str, delta: str) -> None:
+    """LLM 스트리밍 부분 텍스트를 'token' 이벤트로 전달 (stdout에는 출력하지 않음)"""
+    token_batcher.add(stage, delta)
 
 @app.route('/api/log-stream')
 def log_stream():
-    def event_stream(q: queue.Queue):
-        try:
-            while True:
-                msg = q.get()
-                yield f"data: {msg}\n\n"
-        except GeneratorExit:
-            pass
-    q: queue.Queue = queue.Queue()
-    _log_clients.append(q)
-    # detach on client close by returning generator; Flask will garbage collect
-    return Response(event_stream(q), mimetype='text/event-stream')
+    """SSE 로그 스트림. ?job=<id>면 해당 작업 이벤트만, 재접속 시 Last-Event-ID 이후 이벤트를 재전송"""
+    job_id = request.args.get('job')
+    return _sse_response(job_channel(job_id) if job_id else GLOBAL_CHANNEL)
+
+def _sse_response(channel: str) -> Response:
+    last_event_id = parse_last_event_id(request.headers.get('Last-Event-ID') or request.args.get('last_event_id'))
+    return Response(event_hub.stream(channel, last_event_id), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 @app.route('/')
 def index():
@@ -74,61 +88,103 @@ def health_check():
     """헬스 체크"""
     return jsonify({'status': 'healthy', 'message': 'Premium Auto Blogger is running'})
 
+@app.route('/api/metrics')
+def metrics():
+    """Prometheus 텍스트 포맷 계측 (단계별 p50/p95/p99, 호스트별 지연, 토큰 수, 캐시 적중률)"""
+    return Response(get_metrics().render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+def _convert_payload(data: dict) -> dict:
+    """변환 요청 본문 → 작업 페이로드 (중복 판별 키도 이 값으로 만든다)"""
+    return {
+        'youtube_url': (data.get('youtube_url') or '').strip(),
+        'target_audience': data.get('target_audience', '일반인'),
+        'blog_id': data.get('blog_id', ''),
+        'publish_at_iso': data.get('publish_at_iso'),
+    }
+
+def _run_convert(payload: dict) -> dict:
+    """단일 변환 파이프라인 실행 (동기 요청과 비동기 작업 공용). 결과 패키지 dict 반환"""
+    blog_id = payload.get('blog_id')
+    # Google 인증 확인 (저장된 토큰 또는 credentials.json)
+    if not get_credential_manager().has_credentials() and not os.path.exists('credentials.json'):
+        print("⚠️ Google 인증 파일이 없습니다. 콘텐츠 생성만 진행합니다.")
+        blog_id = None
+    else:
+        # 가능하면 기존 토큰으로 서비스 초기화
+        try:
+            auto_blogger.initialize_blogger_from_token()
+        except Exception:
+            pass
+
+    # 전체 자동화 패키지 생성
+    push_log('단일 변환 시작')
+    auto_blogger.log_callback = push_log
+    auto_blogger.stream_callback = push_token
+    # 길이 범위는 기본 3000~4000자로 고정. 필요 시 프론트에서 옵션화 가능
+    package = auto_blogger.generate_full_auto_package(
+        youtube_url=payload['youtube_url'],
+        target_audience=payload.get('target_audience', '일반인'),
+        blog_id=blog_id,
+        min_len=int(os.environ.get('CONTENT_MIN_LEN', '3000')),
+        max_len=int(os.environ.get('CONTENT_MAX_LEN', '4000')),
+        publish_at_iso=payload.get('publish_at_iso')
+    )
+
+    if package and package.get('success'):
+        push_log('단일 변환 완료')
+        # 포스팅 성공 시 크롬으로 새 창 열기
+        try:
+            post_url = package.get('post_url') if isinstance(package, dict) else None
+            open_target = post_url or (f"https://www.blogger.com/blog/posts/{blog_id}" if blog_id else None)
+            if open_target:
+                _open_in_chrome(open_target)
+        except Exception:
+            pass
+    else:
+        push_log('단일 변환 실패')
+    return package
+
+def _convert_error(package) -> str:
+    return package.get('error') if isinstance(package, dict) and package.get('error') else '콘텐츠 생성에 실패했습니다.'
+
+def _wants_async(data: dict) -> bool:
+    """?async=1, 본문 "async": true, 또는 Prefer: respond-async 헤더면 작업 ID를 바로 반환"""
+    flag = str(request.args.get('async', '')).lower() in ('1', 'true', 'yes')
+    return flag or bool(data.get('async')) or 'respond-async' in request.headers.get('Prefer', '')
+
 @app.route('/api/convert', methods=['POST'])
 def convert_youtube_to_blog():
-    """YouTube URL을 블로그 포스트로 변환"""
+    """YouTube URL을 블로그 포스트로 변환 (비동기 요청이면 202 + job_id)"""
     try:
-        data = request.get_json()
-        youtube_url = data.get('youtube_url', '')
-        target_audience = data.get('target_audience', '일반인')
-        blog_id = data.get('blog_id', '')
+        data = request.get_json() or {}
+        payload = _convert_payload(data)
 
-        if not youtube_url:
+        if not payload['youtube_url']:
             return jsonify({'success': False, 'error': 'YouTube URL이 필요합니다.'}), 400
 
-        # Google 인증 확인 (token.pickle 또는 credentials.json)
-        if not os.path.exists('token.pickle') and not os.path.exists('credentials.json'):
-            print("⚠️ Google 인증 파일이 없습니다. 콘텐츠 생성만 진행합니다.")
-            blog_id = None
-        else:
-            # 가능하면 기존 토큰으로 서비스 초기화
-            try:
-                auto_blogger.initialize_blogger_from_token()
-            except Exception:
-                pass
-
-        # 전체 자동화 패키지 생성
-        push_log('단일 변환 시작')
-        auto_blogger.log_callback = push_log
-        # 길이 범위는 기본 3000~4000자로 고정. 필요 시 프론트에서 옵션화 가능
-        package = auto_blogger.generate_full_auto_package(
-            youtube_url=youtube_url,
-            target_audience=target_audience,
-            blog_id=blog_id,
-            min_len=int(os.environ.get('CONTENT_MIN_LEN', '3000')),
-            max_len=int(os.environ.get('CONTENT_MAX_LEN', '4000')),
-            publish_at_iso=(data.get('publish_at_iso') if data else None)
-        )
-
+        if _wants_async(data):
+            job, created = convert_runner.submit(payload)
+            if not created:
+                push_log(f"🔁 같은 변환 요청이 이미 있어 기존 작업에 연결합니다 (작업 {job['id']})")
+            return jsonify({
+                'success': True,
+                'job_id': job['id'],
+                'state': job['state'],
+                'deduplicated': not created,
+                'status_url': url_for('get_convert_job', job_id=job['id']),
+                'events_url': url_for('convert_job_events', job_id=job['id']),
+            }), 202
+
+        package = _run_convert(payload)
         if package and package.get('success'):
-            push_log('단일 변환 완료')
-            # 포스팅 성공 시 크롬으로 새 창 열기
-            try:
-                post_url = package.get('post_url') if isinstance(package, dict) else None
-                open_target = post_url or (f"https://www.blogger.com/blog/posts/{blog_id}" if blog_id else None)
-                if open_target:
-                    _open_in_chrome(open_target)
-            except Exception:
-                pass
             return jsonify({
                 'success': True,
                 'package': package
             })
         else:
-            push_log('단일 변환 실패')
             return jsonify({
                 'success': False,
-                'error': package.get('error') if isinstance(package, dict) and package.get('error') else '콘텐츠 생성에 실패했습니다.'
+                'error': _convert_error(package)
             }), 500
 
     except Exception as e:
@@ -138,6 +194,40 @@ def convert_youtube_to_blog():
             'error': f'처리 중 오류가 발생했습니다: {str(e)}'
         }), 500
 
+def _process_convert_job(job: dict) -> dict:
+    # 작업 로그는 전체 스트림과 작업 채널(/api/jobs/<id>/events)에 함께 기록
+    with job_context(job['id']):
+        package = _run_convert(job['payload'])
+    if not isinstance(package, dict) or not package.get('success'):
+        raise RuntimeError(_convert_error(package))
+    return package
+
+def _on_convert_job_update(job: dict) -> None:
+    """작업 상태/단계 변경을 작업 채널에 'job' 이벤트로 전달 (결과 본문은 GET /api/jobs/<id>로 조회)"""
+    result = job.get('result') or {}
+    push_event('job', json.dumps({
+        'id': job['id'], 'state': job.get('state'), 'stage': job.get('stage'), 'stages': job.get('stages', []),
+        'finished': bool(job.get('finished')), 'error': job.get('error'), 'post_url': result.get('post_url'),
+    }, ensure_ascii=False), job_id=job['id'])
+
+# 단일 변환 비동기 작업: 상태는 SQLite에 저장(모든 워커에서 조회), 실행은 이 프로세스의 스레드 풀
+convert_runner = ConvertJobRunner(get_convert_job_store(), _process_convert_job, on_update=_on_convert_job_update)
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_convert_job(job_id):
+    """변환 작업 상태 (state/stage, 끝났으면 result 또는 error)"""
+    job = convert_runner.store.get(job_id)
+    if not job:
+        return jsonify({'success': False, 'error': '작업을 찾을 수 없습니다.'}), 404
+    return jsonify({'success': True, 'job': job})
+
+@app.route('/api/jobs/<job_id>/events')
+def convert_job_events(job_id):
+    """작업별 SSE: 로그/토큰 이벤트와 진행 상태('job' 이벤트). Last-Event-ID로 이어 받기 지원"""
+    if not convert_runner.store.get(job_id):
+        return jsonify({'success': False, 'error': '작업을 찾을 수 없습니다.'}), 404
+    return _sse_response(job_channel(job_id))
+
 @app.route('/api/save-api-keys', methods=['POST'])
 def save_api_keys():
     """OpenAI/PEXELS API 키 및 모델 저장(런타임 적용)."""
@@ -364,7 +454,8 @@ def download_package():
 </html>
             """
 
-            # 파일들 생성
+            # 파일들 생성 (f-string 식 안에는 백슬래시를 쓸 수 없어 미리 구성)
+            image_section = f'## 이미지\n{package.get("image_url", "N/A")}' if package.get('image_url') else ''
             files = {
                 'blog_post.html': html_content,
                 'analysis.json': json.dumps(package, ensure_ascii=False, indent=2),
@@ -387,7 +478,7 @@ def download_package():
 
 {package.get('blog_content', '콘텐츠 없음')}
 
-{f'## 이미지\n{package.get("image_url", "N/A")}' if package.get('image_url') else ''}
+{image_section}
 """
             }
 
@@ -442,38 +533,113 @@ def upload_doc_screenshot():
     except Exception as e:
         return jsonify({'success': False, 'error': f'업로드 실패: {str(e)}'}), 500
 
-def _run_batch(urls, interval_minutes, blog_id, target_audience, auto_shutdown, schedule_isos=None):
+def _process_batch_job(job: dict) -> dict:
+    # 배치 로그는 전체 스트림과 함께 배치 채널(/api/log-stream?job=<batch_id>)에도 기록
+    with job_context(job['batch_id']):
+        return _generate_batch_item(job)
+
+def _generate_batch_item(job: dict) -> dict:
+    """작업 큐 항목 하나의 콘텐츠 생성 (생성 워커 스레드, 여러 개가 동시에 실행).
+    게시는 하지 않고 패키지를 결과로 남겨 발행 페이서에 넘긴다. 실패는 예외로 알려 재시도 대상으로 남긴다."""
+    payload = job.get('payload') or {}
+    batch = job_queue.get_batch(job['batch_id']) or {}
+    total = batch.get('total') or '?'
+    push_log(f"[{job['seq'] + 1}/{total}] 생성: {job['url']} (시도 {job['attempts']}/{job['max_attempts']})")
+    auto_blogger.log_callback = push_log
+    auto_blogger.stream_callback = push_token
+    pkg = auto_blogger.generate_full_auto_package(
+        youtube_url=job['url'],
+        target_audience=payload.get('target_audience', '일반인'),
+        blog_id=None,
+    )
+    if not isinstance(pkg, dict) or not pkg.get('success'):
+        raise RuntimeError(pkg.get('error') if isinstance(pkg, dict) and pkg.get('error') else '콘텐츠 생성 실패')
+    analysis = pkg.get('analysis') or {}
+    return {'title': analysis.get('title'), 'keywords': analysis.get('keywords', []),
+            'blog_content': pkg.get('blog_content'), 'image_url': pkg.get('image_url')}
+
+def _needs_publish(job: dict, result: dict) -> bool:
+    return bool((job.get('payload') or {}).get('blog_id'))
+
+def _publish_batch_job(job: dict) -> dict:
+    """생성된 항목을 Blogger에 게시 (발행 페이서, 배치별 간격을 지켜 하나씩 실행)"""
+    with job_context(job['batch_id']):
+        return _publish_batch_item(job)
+
+def _publish_batch_item(job: dict) -> dict:
+    payload = job.get('payload') or {}
+    generated = job.get('result') or {}
+    blog_id = payload.get('blog_id')
+    title = generated.get('title') or '블로그 포스트'
+    push_log(f"📝 [{job['seq'] + 1}] 게시: {title} (시도 {job['attempts']}/{job['max_attempts']})")
+    # 재시작 후 이어받은 작업이나 다른 워커의 발행 페이서에서는 Blogger 서비스가 아직 없다
+    if not auto_blogger.initialize_blogger_from_token():
+        raise PermanentJobError('Google 인증 토큰이 없어 게시할 수 없습니다. Google 인증 후 다시 시도하세요.')
+
+    def _remember_draft(post_id: str) -> None:
+        # 초안 id를 작업 결과에 남겨, 발행만 실패해 재시도할 때 초안을 또 만들지 않게 한다
+        generated['draft_post_id'] = post_id
+        job_queue.save_result(job['id'], job['lease_owner'], generated)
+
+    draft_post_id = generated.get('draft_post_id')
+    if draft_post_id:
+        push_log(f"🔁 이전 시도에서 만든 초안({draft_post_id})을 발행합니다.")
+    post_url = auto_blogger.post_to_blogger(
+        blog_id, title, generated.get('blog_content') or '', generated.get('keywords', []),
+        publish_at_iso=payload.get('publish_at_iso'),
+        draft_post_id=draft_post_id, on_draft=_remember_draft
+    )
+    if not post_url:
+        raise RuntimeError('Blogger 게시 실패')
     try:
-        total = len(urls)
-        push_log(f"🚀 일괄 포스팅 시작: {total}건, 간격 {interval_minutes}분, 타겟 {target_audience}")
-        for idx, url in enumerate(urls):
-            push_log(f"[{idx+1}/{total}] 처리: {url}")
-            try:
-                auto_blogger.log_callback = push_log
-                pkg = auto_blogger.generate_full_auto_package(
-                    youtube_url=url,
-                    target_audience=target_audience,
-                    blog_id=blog_id or None,
-                    publish_at_iso=(schedule_isos[idx] if schedule_isos and idx < len(schedule_isos) else None)
-                )
-                try:
-                    if isinstance(pkg, dict):
-                        purl = pkg.get('post_url')
-                        target = purl or (f"https://www.blogger.com/blog/posts/{blog_id}" if blog_id else None)
-                        if target:
-                            _open_in_chrome(target)
-                except Exception:
-                    pass
-            except Exception as e:
-                push_log(f"❌ 항목 처리 실패: {e}")
-            if idx < total - 1:
-                time.sleep(max(1, int(interval_minutes)) * 60)
-        push_log("✅ 모든 일괄 작업 완료")
-    finally:
-        if auto_shutdown:
-            push_log("🛑 자동 종료 옵션이 활성화되어 프로그램을 종료합니다.")
-            # dev 서버이므로 안전 종료 대신 즉시 종료 사용
-            os._exit(0)
+        _open_in_chrome(post_url)
+    except Exception:
+        pass
+    return {'post_url': post_url, 'title': title}
+
+def _on_batch_job_finished(job: dict, state: str) -> None:
+    with job_context(job['batch_id']):
+        _report_batch_job(job, state)
+
+def _report_batch_job(job: dict, state: str) -> None:
+    if state == STATE_READY and job.get('state') == STATE_PUBLISHING:
+        push_log(f"🔁 게시 실패, 재시도 예정: {job['url']}")
+    elif state == STATE_RETRYING:
+        push_log(f"🔁 항목 처리 실패, 재시도 예정: {job['url']}")
+    elif state == STATE_FAILED:
+        push_log(f"❌ 항목 처리 실패(재시도 소진): {job['url']}")
+    if not job_queue.batch_finished(job['batch_id']):
+        return
+    batch = job_queue.get_batch(job['batch_id']) or {}
+    push_log(f"✅ 모든 일괄 작업 완료 (배치 {job['batch_id']}: {batch.get('counts')})")
+    if (batch.get('options') or {}).get('auto_shutdown'):
+        push_log("🛑 자동 종료 옵션이 활성화되어 프로그램을 종료합니다.")
+        # dev 서버이므로 안전 종료 대신 즉시 종료 사용
+        os._exit(0)
+
+# 일괄 포스팅 작업 큐: SQLite에 영구 저장되어 재시작 시 남은 항목을 자동으로 이어서 처리
+# 생성은 BATCH_WORKERS개가 동시에, 게시는 발행 페이서 하나가 배치 간격을 지켜 순서대로 수행
+job_queue = get_job_queue()
+BATCH_WORKERS = max(1, int(os.getenv('BATCH_WORKERS', '3')))
+batch_workers: list = []
+publish_pacer = None
+_workers_lock = threading.Lock()
+
+def start_background_workers() -> None:
+    """일괄 작업 워커/발행 페이서, 이벤트 버스, LLM 커넥션 예열 시작 (프로세스당 한 번만 실행).
+    import만으로는 스레드를 띄우지 않는다: gunicorn은 post_worker_init에서, 개발 서버는 __main__에서 호출"""
+    global publish_pacer
+    with _workers_lock:
+        if publish_pacer is not None:
+            return
+        get_event_bus()
+        # LLM 커넥션 풀 예열 (첫 변환의 TLS 핸드셰이크 지연 제거)
+        get_gateway().warmup_in_background()
+        batch_workers.extend(JobWorker(job_queue, _process_batch_job, on_finished=_on_batch_job_finished,
+                                       phase=PHASE_GENERATE, needs_publish=_needs_publish).start()
+                             for _ in range(BATCH_WORKERS))
+        publish_pacer = JobWorker(job_queue, _publish_batch_job, on_finished=_on_batch_job_finished,
+                                  phase=PHASE_PUBLISH).start()
 
 def _open_in_chrome(url: str) -> None:
     """크롬으로 URL 열기 (Windows 우선). 실패 시 기본 브라우저로 폴백.
@@ -526,15 +692,16 @@ def _open_in_chrome(url: str) -> None:
 def logout_google():
     """Google 로그아웃: 토큰 제거 및 서비스 초기화"""
     try:
-        # 토큰 파일 삭제 시도
+        # 토큰 파일 삭제 시도 (다른 워커도 파일 변경을 보고 로그아웃 상태가 됨)
         try:
-            if os.path.exists('token.pickle'):
-                os.remove('token.pickle')
+            get_credential_manager().clear()
         except Exception:
             pass
         # 세션/인스턴스 정리
         session.pop('oauth_state', None)
         try:
+            if auto_blogger.creds:
+                get_service_factory().invalidate(auto_blogger.creds)
             auto_blogger.creds = None
             auto_blogger.blogger_service = None
         except Exception:
@@ -626,15 +793,42 @@ def batch_convert():
                 schedule_isos = None
                 expanded_urls = cleaned
 
-        # 배치 작업은 백그라운드 스레드로 처리
-        t = threading.Thread(target=_run_batch, args=(expanded_urls, interval_minutes, blog_id, target_audience, auto_shutdown, schedule_isos), daemon=True)
-        t.start()
-
-        return jsonify({'success': True, 'message': f'{len(expanded_urls)}건 일괄 포스팅을 시작했습니다.', 'queued': len(expanded_urls)})
+        # 배치 작업은 영구 작업 큐에 등록 (생성은 동시에, 게시만 간격을 지켜 순서대로 처리)
+        items = [{
+            'url': u,
+            'payload': {
+                'target_audience': target_audience,
+                'blog_id': blog_id,
+                'publish_at_iso': (schedule_isos[idx] if schedule_isos and idx < len(schedule_isos) else None),
+            },
+        } for idx, u in enumerate(expanded_urls)]
+        batch_id = job_queue.enqueue_batch(items, options={'auto_shutdown': auto_shutdown, 'target_audience': target_audience},
+                                           interval_seconds=interval_minutes * 60)
+        push_log(f"🚀 일괄 포스팅 등록: {len(items)}건, 간격 {interval_minutes}분, 타겟 {target_audience} (배치 {batch_id})")
+
+        return jsonify({'success': True, 'message': f'{len(expanded_urls)}건 일괄 포스팅을 시작했습니다.',
+                        'queued': len(expanded_urls), 'batch_id': batch_id})
     except Exception as e:
         print(f"❌ 배치 시작 오류: {e}")
         return jsonify({'success': False, 'error': f'배치 시작 중 오류: {str(e)}'}), 500
 
+@app.route('/api/batches', methods=['GET'])
+def list_batches():
+    """일괄 작업 목록 (상태별 개수/진행률)"""
+    try:
+        limit = max(1, min(200, int(request.args.get('limit', 50))))
+        return jsonify({'success': True, 'batches': job_queue.list_batches(limit)})
+    except Exception as e:
+        return jsonify({'success': False, 'error': f'배치 조회 오류: {str(e)}'}), 500
+
+@app.route('/api/batches/<batch_id>', methods=['GET'])
+def get_batch_status(batch_id):
+    """일괄 작업 상세 (항목별 상태/시도 횟수/결과)"""
+    batch = job_queue.get_batch(batch_id)
+    if not batch:
+        return jsonify({'success': False, 'error': '배치를 찾을 수 없습니다.'}), 404
+    return jsonify({'success': True, 'batch': batch})
+
 @app.route('/api/setup-google-auth', methods=['POST'])
 def setup_google_auth():
     """Google 인증 시작: 인증 URL을 반환하여 프론트에서 새 창으로 열도록 함"""
@@ -692,13 +886,13 @@ def oauth2callback():
         flow.fetch_token(authorization_response=request.url)
 
         creds = flow.credentials
-        # token.pickle 저장 및 서비스 초기화
-        import pickle
-        with open('token.pickle', 'wb') as token:
-            pickle.dump(creds, token)
+        # 토큰 저장(원자적 교체, 다른 워커와 공유) 및 서비스 초기화
+        get_credential_manager().set(creds)
 
+        if auto_blogger.creds:
+            get_service_factory().invalidate(auto_blogger.creds)  # 이전 자격 증명의 서비스는 버림
         auto_blogger.creds = creds
-        auto_blogger.blogger_service = build('blogger', 'v3', credentials=creds)
+        auto_blogger.blogger_service = get_blogger_service(creds)
 
         # 작은 완료 페이지: opener에 postMessage 후 창 닫기
         success_html = """
@@ -751,6 +945,9 @@ if __name__ == '__main__':
     print("📱 웹 브라우저에서 http://localhost:5000 접속하세요")
     print("⏹️  종료하려면 Ctrl+C를 누르세요")
     print("-" * 50)
-    
+
+    # debug 리로더의 감시용 부모 프로세스에서는 워커를 띄우지 않는다 (실제 서버는 자식 프로세스)
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_background_workers()
     app.run(debug=True, host='0.0.0.0', port=5000)
 
@@ -0,0 +1,290 @@
+"""OpenAI 호출용 프로세스 전역 적응형 속도 제한기.
+
+- 분당 요청 수(RPM) / 분당 토큰 수(TPM) 토큰 버킷. 한도는 환경변수로 주거나(LLM_RPM_LIMIT, LLM_TPM_LIMIT)
+  응답의 x-ratelimit-limit-* 헤더에서 학습한다 (LLM_RATE_HEADROOM 비율만큼 여유를 둠)
+- 한도는 계정 전체 값이므로 같은 키를 쓰는 프로세스 수(LLM_RATE_PROCESSES, gunicorn.conf.py가 워커 수로 설정)로
+  나눠 프로세스별 몫만 쓴다. 여러 컨테이너/호스트가 같은 키를 쓰면 LLM_RATE_PROCESSES를 전체 프로세스 수로 지정
+- 동시 요청 수는 AIMD로 조절: 성공하면 조금씩(+1/limit) 늘리고 429가 나면 절반으로 줄인다
+- Retry-After / retry-after-ms / x-ratelimit-remaining-* / x-ratelimit-reset-* 헤더를 반영해 전체 호출을 잠시 멈춤
+- 재시도 대기는 지수 백오프 + 지터 (서버가 대기 시간을 알려주면 그 값을 우선)
+- 동기(스레드)와 비동기(asyncio) 호출자가 같은 상태를 공유한다
+"""
+import asyncio
+import os
+import random
+import re
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Mapping, Optional
+
+RETRYABLE_STATUSES = (408, 409, 429, 500, 502, 503, 504)
+_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+_POLL_MAX = 0.5
+
+
+def parse_reset_duration(value: Optional[str]) -> Optional[float]:
+    """x-ratelimit-reset-* 값("1s", "6m0s", "20ms", "0.5")을 초로 변환"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    parts = _DURATION_RE.findall(value)
+    if not parts:
+        return None
+    return sum(float(n) * _DURATION_UNITS[unit] for n, unit in parts)
+
+
+def parse_retry_after(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """Retry-After(초 또는 HTTP 날짜) / retry-after-ms 헤더를 초로 변환"""
+    if not headers:
+        return None
+    ms = headers.get("retry-after-ms")
+    if ms:
+        try:
+            return max(0.0, float(ms) / 1000.0)
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except Exception:
+        return None
+
+
+class TokenBucket:
+    """분당 한도 토큰 버킷. per_minute <= 0 이면 제한 없음. 잔량은 음수(빚)가 될 수 있다."""
+
+    def __init__(self, per_minute: float = 0.0):
+        self.per_minute = 0.0
+        self.tokens = 0.0
+        self.updated = time.monotonic()
+        self.set_limit(per_minute)
+
+    def set_limit(self, per_minute: float) -> None:
+        per_minute = max(0.0, float(per_minute or 0))
+        if per_minute == self.per_minute:
+            return
+        self._refill(time.monotonic())
+        # 한도가 처음 정해지면 가득 찬 상태에서 시작, 바뀌면 잔량을 새 한도 안으로
+        self.tokens = per_minute if self.per_minute <= 0 else min(self.tokens, per_minute)
+        self.per_minute = per_minute
+
+    def _refill(self, now: float) -> None:
+        if self.per_minute > 0:
+            self.tokens = min(self.per_minute, self.tokens + (now - self.updated) * self.per_minute / 60.0)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """amount를 꺼낼 수 있을 때까지 남은 초 (0이면 즉시 가능)"""
+        if self.per_minute <= 0:
+            return 0.0
+        self._refill(now)
+        need = min(amount, self.per_minute)
+        if self.tokens >= need:
+            return 0.0
+        return (need - self.tokens) * 60.0 / self.per_minute
+
+    def take(self, amount: float) -> None:
+        if self.per_minute > 0:
+            self.tokens -= amount
+
+    def cap(self, remaining: float) -> None:
+        """서버가 알려준 잔량이 더 적으면 맞춘다"""
+        if self.per_minute > 0:
+            self.tokens = min(self.tokens, remaining)
+
+
+class AdaptiveRateLimiter:
+    def __init__(self, rpm: Optional[float] = None, tpm: Optional[float] = None,
+                 max_concurrency: Optional[int] = None, min_concurrency: int = 1,
+                 max_retries: Optional[int] = None, backoff_base: Optional[float] = None,
+                 backoff_max: Optional[float] = None, headroom: Optional[float] = None,
+                 enabled: Optional[bool] = None, processes: Optional[int] = None):
+        if enabled is None:
+            enabled = os.getenv("LLM_RATE_LIMIT_ENABLED", "1") != "0"
+        self.enabled = enabled
+        self._configured_rpm = float(rpm if rpm is not None else os.getenv("LLM_RPM_LIMIT", "0"))
+        self._configured_tpm = float(tpm if tpm is not None else os.getenv("LLM_TPM_LIMIT", "0"))
+        self.max_concurrency = max(1, int(max_concurrency or os.getenv("LLM_MAX_CONCURRENCY", "16")))
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.max_retries = max(0, int(max_retries if max_retries is not None else os.getenv("LLM_MAX_RETRIES", "5")))
+        self.backoff_base = float(backoff_base or os.getenv("LLM_BACKOFF_BASE_SECONDS", "1.0"))
+        self.backoff_max = float(backoff_max or os.getenv("LLM_BACKOFF_MAX_SECONDS", "60"))
+        self.headroom = float(headroom or os.getenv("LLM_RATE_HEADROOM", "0.9"))
+        self.processes = max(1, int(processes or os.getenv("LLM_RATE_PROCESSES", "1")))
+        self._requests = TokenBucket(self._configured_rpm / self.processes)
+        self._tokens = TokenBucket(self._configured_tpm / self.processes)
+        self._limit = float(self.max_concurrency)
+        self._in_flight = 0
+        self._blocked_until = 0.0
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+        self.throttled = 0   # 429 응답 수
+        self.waited = 0.0    # 제한 때문에 기다린 누적 초
+
+    # --- 토큰 추정 ---
+    @staticmethod
+    def estimate_tokens(payload: Dict) -> int:
+        """요청 payload의 토큰 수 대략 추정 (한글은 글자당 1, 그 외 4글자당 1) + 최대 출력 토큰"""
+        chars = cjk = 0
+        for message in payload.get("messages") or []:
+            content = message.get("content")
+            if not isinstance(content, str):
+                continue
+            chars += len(content)
+            cjk += sum(1 for ch in content if "　" <= ch <= "鿿" or "가" <= ch <= "힣")
+        prompt = cjk + (chars - cjk) // 4 + 4 * len(payload.get("messages") or [])
+        return int(prompt + (payload.get("max_tokens") or 512))
+
+    # --- 획득/반납 ---
+    def _try_acquire(self, tokens: int) -> float:
+        """성공하면 0, 아니면 다시 시도하기까지 기다릴 초"""
+        now = time.monotonic()
+        with self._lock:
+            wait = self._blocked_until - now
+            if self._in_flight >= int(self._limit):
+                wait = max(wait, 0.05)
+            wait = max(wait, self._requests.wait_time(1, now), self._tokens.wait_time(tokens, now))
+            if wait > 0:
+                return wait
+            self._requests.take(1)
+            self._tokens.take(tokens)
+            self._in_flight += 1
+            return 0.0
+
+    def acquire(self, tokens: int) -> None:
+        if not self.enabled:
+            return
+        while True:
+            wait = self._try_acquire(tokens)
+            if wait <= 0:
+                return
+            wait = min(wait, _POLL_MAX)
+            self.waited += wait
+            time.sleep(wait)
+
+    async def aacquire(self, tokens: int) -> None:
+        if not self.enabled:
+            return
+        while True:
+            wait = self._try_acquire(tokens)
+            if wait <= 0:
+                return
+            wait = min(wait, _POLL_MAX)
+            self.waited += wait
+            await asyncio.sleep(wait)
+
+    def release(self, tokens: int, status: Optional[int] = None,
+                headers: Optional[Mapping[str, str]] = None, used_tokens: Optional[int] = None) -> None:
+        """요청 종료. 응답 상태/헤더/실제 사용 토큰으로 버킷과 동시성 한도를 갱신"""
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._in_flight = max(0, self._in_flight - 1)
+            if used_tokens is not None:
+                # 추정치와 실제 사용량의 차이를 정산 (환불 또는 추가 차감)
+                self._tokens.take(used_tokens - tokens)
+            if headers:
+                self._apply_headers(headers, now)
+            if status == 429:
+                self.throttled += 1
+                retry_after = parse_retry_after(headers)
+                pause = retry_after if retry_after is not None else self.backoff_base
+                self._blocked_until = max(self._blocked_until, now + pause)
+                # 한 번의 폭주에서 동시에 받은 429로 여러 번 줄지 않도록 쿨다운
+                if now - self._last_decrease >= max(1.0, pause):
+                    self._limit = max(float(self.min_concurrency), self._limit / 2)
+                    self._last_decrease = now
+            elif status is not None and status < 400:
+                self._limit = min(float(self.max_concurrency), self._limit + 1.0 / self._limit)
+
+    def _apply_headers(self, headers: Mapping[str, str], now: float) -> None:
+        for kind, bucket, configured in (("requests", self._requests, self._configured_rpm),
+                                         ("tokens", self._tokens, self._configured_tpm)):
+            limit = _to_float(headers.get(f"x-ratelimit-limit-{kind}"))
+            if limit and not configured:
+                bucket.set_limit(limit * self.headroom / self.processes)
+            remaining = _to_float(headers.get(f"x-ratelimit-remaining-{kind}"))
+            if remaining is None:
+                continue
+            bucket.cap(remaining)
+            if remaining <= 0:
+                reset = parse_reset_duration(headers.get(f"x-ratelimit-reset-{kind}"))
+                if reset:
+                    self._blocked_until = max(self._blocked_until, now + reset)
+
+    # --- 재시도 ---
+    def should_retry(self, status: Optional[int], body: str = "") -> bool:
+        """재시도할 만한 실패인지. 429라도 쿼터 소진(insufficient_quota)은 기다려도 풀리지 않으므로 제외"""
+        if status is None:
+            return True  # 연결/타임아웃 오류
+        if status == 429 and "insufficient_quota" in (body or ""):
+            return False
+        return status in RETRYABLE_STATUSES
+
+    def retry_delay(self, attempt: int, headers: Optional[Mapping[str, str]] = None) -> float:
+        """attempt번째(0부터) 재시도 전 대기 초. 서버 지정 대기 + 작은 지터, 없으면 지수 백오프(equal jitter)"""
+        retry_after = parse_retry_after(headers)
+        if retry_after is not None:
+            return min(self.backoff_max, retry_after) + random.uniform(0, min(1.0, self.backoff_base))
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "concurrency_limit": self._limit,
+                "in_flight": self._in_flight,
+                "rpm_limit": self._requests.per_minute,
+                "tpm_limit": self._tokens.per_minute,
+                "blocked_for": max(0.0, self._blocked_until - time.monotonic()),
+                "throttled": self.throttled,
+                "waited_seconds": self.waited,
+            }
+
+
+def _to_float(value: Optional[str]) -> Optional[float]:
+    try:
+        return float(value) if value not in (None, "") else None
+    except ValueError:
+        return None
+
+
+_limiter: Optional[AdaptiveRateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> AdaptiveRateLimiter:
+    """프로세스 전역 제한기 (지연 생성)"""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = AdaptiveRateLimiter()
+            _register_gauges(_limiter)
+        return _limiter
+
+
+def _register_gauges(limiter: AdaptiveRateLimiter) -> None:
+    from metrics import get_metrics
+
+    metrics = get_metrics()
+    for key, name, help_text in (("concurrency_limit", "llm_concurrency_limit", "Current AIMD LLM concurrency limit"),
+                                 ("in_flight", "llm_in_flight", "LLM requests currently in flight"),
+                                 ("rpm_limit", "llm_rpm_limit", "Effective requests-per-minute budget (0 = unlimited)"),
+                                 ("tpm_limit", "llm_tpm_limit", "Effective tokens-per-minute budget (0 = unlimited)"),
+                                 ("throttled", "llm_throttled_total", "HTTP 429 responses received"),
+                                 ("waited_seconds", "llm_rate_limit_wait_seconds_total", "Time spent waiting for the rate limiter")):
+        metrics.register_gauge(name, help_text, lambda key=key: limiter.stats()[key])
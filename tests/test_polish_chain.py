@@ -0,0 +1,46 @@
+"""chain 모드 길이 보정: 로컬 응축 → (LLM_SHRINK_FALLBACK=1일 때만) LLM 응축"""
+import asyncio
+
+from youtube_auto_blogger import YouTubeAutoBlogger
+
+
+def _blogger(monkeypatch, condensed: bool, fallback: bool):
+    blogger = YouTubeAutoBlogger()
+    blogger.llm_shrink_fallback = fallback
+    calls = []
+
+    def fake_condense(data, desired_min_len, desired_max_len):
+        data['content'] = data['content'][:desired_max_len + 50]
+        return condensed
+
+    async def fake_generate(prompt, stage=None):
+        calls.append(stage)
+        return "짧게 응축한 한국어 본문입니다."
+
+    monkeypatch.setattr(blogger, "_condense_content", fake_condense)
+    monkeypatch.setattr(blogger, "_allm_generate_text", fake_generate)
+    return blogger, calls
+
+
+def _long_data():
+    return {'content': "가나다라마바사 " * 200}
+
+
+def test_llm_shrink_fallback_when_local_condense_falls_short(monkeypatch):
+    blogger, calls = _blogger(monkeypatch, condensed=False, fallback=True)
+    data = asyncio.run(blogger._apolish_chain(_long_data(), 100, 200))
+    assert calls == ["length_fix"]
+    assert data['content'] == "짧게 응축한 한국어 본문입니다."
+
+
+def test_no_llm_call_when_fallback_disabled(monkeypatch):
+    blogger, calls = _blogger(monkeypatch, condensed=False, fallback=False)
+    data = asyncio.run(blogger._apolish_chain(_long_data(), 100, 200))
+    assert calls == []
+    assert len(data['content']) == 250
+
+
+def test_no_llm_call_when_local_condense_fits(monkeypatch):
+    blogger, calls = _blogger(monkeypatch, condensed=True, fallback=True)
+    asyncio.run(blogger._apolish_chain(_long_data(), 100, 200))
+    assert calls == []
@@ -0,0 +1,122 @@
+"""한국어 본문 로컬 응축기 (네트워크 호출 없음).
+
+본문이 목표 길이를 넘을 때 LLM에 다시 보내는 대신, 문단/문장 단위로 가치를 점수화해
+중복 문장 → 군더더기 문장 → 점수가 낮은 문장 순으로 제거하고, 한 문장만 남은 짧은 문단은
+앞 문단에 병합한다. 각 문단의 첫 문장(주제문)은 가능한 한 유지한다.
+"""
+import re
+from typing import Iterable, List, Optional, Tuple
+
+# 정보량이 적은 상투적 표현 (포함 시 감점)
+FILLER_PHRASES = [
+    "이 글에서는", "이번 글에서는", "결론적으로", "요약하면", "정리하자면", "앞서 말씀드린",
+    "앞서 언급한", "다시 한번", "다시 한 번", "말씀드렸듯이", "살펴보겠습니다", "알아보겠습니다",
+    "알아보았습니다", "살펴보았습니다", "도움이 되셨길", "도움이 되었으면", "마무리하겠습니다",
+    "여러분", "사실", "정말", "매우", "아주", "굉장히",
+]
+
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?…。])\s+|\n+')
+_NORMALIZE = re.compile(r'[\s\W_]+', re.UNICODE)
+
+
+def split_paragraphs(text: str) -> List[str]:
+    parts = [p.strip() for p in text.split('\n\n') if p.strip()]
+    if len(parts) <= 1:
+        parts = [p.strip() for p in text.split('\n') if p.strip()]
+    return parts
+
+
+def split_sentences(paragraph: str) -> List[str]:
+    return [s.strip() for s in _SENTENCE_SPLIT.split(paragraph) if s and s.strip()]
+
+
+def _bigrams(sentence: str) -> set:
+    norm = _NORMALIZE.sub('', sentence)
+    return {norm[i:i + 2] for i in range(len(norm) - 1)} or {norm}
+
+
+def _similarity(a: set, b: set) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _score(sentence: str, position: int, keywords: Iterable[str]) -> float:
+    """문장 가치 점수 (높을수록 유지). 길이 대비 정보량을 근사."""
+    score = 1.0
+    if position == 0:
+        score += 1.5  # 문단 주제문
+    if re.search(r'\d', sentence):
+        score += 0.8  # 수치/데이터
+    score += 0.5 * sum(1 for kw in keywords if kw and kw in sentence)
+    score -= 0.7 * sum(1 for phrase in FILLER_PHRASES if phrase in sentence)
+    if len(sentence) < 15:
+        score -= 0.5
+    return score
+
+
+def condense_korean_text(text: str, max_len: int, min_len: int = 0,
+                         keywords: Optional[Iterable[str]] = None,
+                         dedupe_threshold: float = 0.8) -> Tuple[str, dict]:
+    """text를 max_len 이하로 응축. 가능하면 min_len 아래로는 줄이지 않는다.
+    반환: (응축된 텍스트, {"before", "after", "removed_duplicates", "removed_sentences", "merged_paragraphs"})
+    """
+    keywords = [k for k in (keywords or []) if isinstance(k, str)]
+    stats = {"before": len(text), "after": len(text), "removed_duplicates": 0,
+             "removed_sentences": 0, "merged_paragraphs": 0}
+    if len(text) <= max_len:
+        return text, stats
+
+    # 문단 → 문장 구조: [[sentence, ...], ...]
+    paragraphs = [split_sentences(p) for p in split_paragraphs(text)]
+
+    # 1) 중복/유사 문장 제거 (먼저 나온 문장 유지)
+    seen: List[set] = []
+    for para in paragraphs:
+        kept = []
+        for sent in para:
+            grams = _bigrams(sent)
+            if any(_similarity(grams, g) >= dedupe_threshold for g in seen):
+                stats["removed_duplicates"] += 1
+                continue
+            seen.append(grams)
+            kept.append(sent)
+        para[:] = kept
+
+    def _assemble() -> str:
+        return '\n\n'.join(' '.join(p) for p in paragraphs if p)
+
+    current = len(_assemble())
+
+    # 2) 점수가 낮은 문장부터 제거 (주제문은 마지막 수단)
+    if current > max_len:
+        candidates = []
+        for pi, para in enumerate(paragraphs):
+            for si, sent in enumerate(para):
+                candidates.append((_score(sent, si, keywords), pi, sent))
+        candidates.sort(key=lambda c: c[0])
+        for _, pi, sent in candidates:
+            if current <= max_len:
+                break
+            cost = len(sent) + 1
+            if current - cost < min_len:
+                continue  # 하한 보호: 더 짧은 다른 문장을 찾음
+            paragraphs[pi].remove(sent)
+            stats["removed_sentences"] += 1
+            current = len(_assemble())
+
+    # 3) 한 문장만 남은 짧은 문단은 앞 문단에 병합
+    merged: List[List[str]] = []
+    for para in paragraphs:
+        if not para:
+            continue
+        if merged and len(para) == 1 and len(para[0]) < 80:
+            merged[-1].extend(para)
+            stats["merged_paragraphs"] += 1
+        else:
+            merged.append(para)
+    paragraphs = merged
+
+    result = _assemble()
+    stats["after"] = len(result)
+    return result, stats
@@ -0,0 +1,139 @@
+"""YouTube 스크립트 영구 캐시 (SQLite + zlib 압축).
+
+키는 (정규화된 video_id, 언어). 출처(timedtext / transcript_api)와 수집 시각을 함께 저장해
+미리보기→변환, 배치 재실행 시 자막을 다시 내려받지 않는다.
+LLM이 만든 대체 스크립트(source=llm)는 실제 자막이 아니므로 저장하지 않는다.
+
+환경변수:
+  - TRANSCRIPT_CACHE_ENABLED=0           → 캐시 비활성화 (기본 1)
+  - TRANSCRIPT_CACHE_PATH=...            → DB 파일 경로 (기본 transcript_cache.sqlite3)
+  - TRANSCRIPT_CACHE_TTL_SECONDS=2592000 → 항목 유효기간 (기본 30일, 0이면 무기한)
+"""
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Optional
+
+SOURCE_TIMEDTEXT = "timedtext"
+SOURCE_TRANSCRIPT_API = "transcript_api"
+SOURCE_LLM = "llm"
+
+_VIDEO_ID_PATTERNS = [
+    r"v=([\w-]{11})",
+    r"youtu\.be/([\w-]{11})",
+    r"/shorts/([\w-]{11})",
+    r"/embed/([\w-]{11})",
+    r"/live/([\w-]{11})",
+]
+
+
+def extract_video_id(url: str) -> Optional[str]:
+    """YouTube URL 형태와 무관하게 11자리 video_id로 정규화"""
+    for p in _VIDEO_ID_PATTERNS:
+        m = re.search(p, url or "")
+        if m:
+            return m.group(1)
+    return None
+
+
+class TranscriptCache:
+    def __init__(self, path: Optional[str] = None, ttl_seconds: Optional[float] = None):
+        self.path = path or os.getenv("TRANSCRIPT_CACHE_PATH", "transcript_cache.sqlite3")
+        if ttl_seconds is None:
+            ttl_seconds = float(os.getenv("TRANSCRIPT_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS transcripts ("
+            " video_id TEXT NOT NULL, lang TEXT NOT NULL, source TEXT NOT NULL,"
+            " body BLOB NOT NULL, fetched_at REAL NOT NULL,"
+            " PRIMARY KEY (video_id, lang))"
+        )
+        self._conn.commit()
+
+    def _expired(self, fetched_at: float) -> bool:
+        return bool(self.ttl_seconds) and time.time() - fetched_at > self.ttl_seconds
+
+    def get(self, video_id: str, lang: Optional[str] = None) -> Optional[Dict]:
+        """캐시 조회. lang이 없으면 해당 영상의 가장 최근 항목 반환.
+        반환: {"video_id", "lang", "source", "text", "fetched_at"}
+        """
+        with self._lock:
+            if lang is not None:
+                row = self._conn.execute(
+                    "SELECT lang, source, body, fetched_at FROM transcripts WHERE video_id = ? AND lang = ?",
+                    (video_id, lang),
+                ).fetchone()
+            else:
+                row = self._conn.execute(
+                    "SELECT lang, source, body, fetched_at FROM transcripts WHERE video_id = ?"
+                    " ORDER BY fetched_at DESC LIMIT 1",
+                    (video_id,),
+                ).fetchone()
+            if row and self._expired(row[3]):
+                self._conn.execute("DELETE FROM transcripts WHERE video_id = ? AND lang = ?", (video_id, row[0]))
+                self._conn.commit()
+                row = None
+            if not row:
+                self.misses += 1
+                return None
+            self.hits += 1
+        try:
+            text = zlib.decompress(row[2]).decode("utf-8")
+        except Exception:
+            return None
+        return {"video_id": video_id, "lang": row[0], "source": row[1], "text": text, "fetched_at": row[3]}
+
+    def put(self, video_id: str, text: str, source: str, lang: Optional[str] = None) -> None:
+        if source == SOURCE_LLM:
+            return
+        body = zlib.compress(text.encode("utf-8"), 6)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO transcripts (video_id, lang, source, body, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                (video_id, lang or "", source, body, time.time()),
+            )
+            self._conn.commit()
+
+    def delete(self, video_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM transcripts WHERE video_id = ?", (video_id,))
+            self._conn.commit()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM transcripts").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            "entries": entries,
+        }
+
+
+_cache: Optional[TranscriptCache] = None
+_cache_failed = False
+_cache_lock = threading.Lock()
+
+
+def get_transcript_cache() -> Optional[TranscriptCache]:
+    """프로세스 전역 캐시 (비활성화 또는 열기 실패 시 None)"""
+    global _cache, _cache_failed
+    if os.getenv("TRANSCRIPT_CACHE_ENABLED", "1") == "0":
+        return None
+    with _cache_lock:
+        if _cache is None and not _cache_failed:
+            try:
+                _cache = TranscriptCache()
+            except Exception as e:
+                _cache_failed = True
+                print(f"⚠️ 스크립트 캐시를 열 수 없습니다: {e}")
+        return _cache
@@ -0,0 +1,88 @@
+"""자막 스크립트 압축 전처리기 (추출 → 분석 사이).
+
+자동 생성 자막은 롤링 표시 때문에 같은 구절이 겹쳐 반복되고, [음악] 같은 비음성 표기와
+추임새가 많아 그대로 프롬프트 토큰이 된다. 의미를 바꾸지 않는 범위에서만 줄인다.
+- 이전 줄과 겹치는 앞부분/중복 줄 제거
+- [음악], (박수), ♪ 등 비음성 표기와 독립된 추임새(음, 어, um, uh ...) 제거
+- 공백 정규화
+- 토큰 예산을 지정한 경우에만 초과분을 줄 경계에서 자름 (기본은 자르지 않음: 긴 스크립트는
+  transcript_summarizer의 map-reduce 요약이 처리한다)
+
+환경변수:
+  - TRANSCRIPT_COMPACTION=0         → 압축 비활성화 (기본 1)
+  - TRANSCRIPT_TOKEN_BUDGET=0       → 압축 후 최대 추정 토큰 수 (기본 0 = 무제한)
+"""
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+from transcript_summarizer import estimate_tokens
+
+_TAG_PATTERNS = [
+    re.compile(r'\[[^\]\n]{1,20}\]'),                                  # [음악], [Music], [박수]
+    re.compile(r'\((?:[^)\n]{0,6})(?:음악|박수|웃음|music|applause|laughter)(?:[^)\n]{0,6})\)', re.I),
+    re.compile(r'[♪♫♬]+'),
+    re.compile(r'>>+'),                                                # 화자 전환 표시
+]
+_FILLER = re.compile(
+    r'(?<![\w가-힣])(?:음+|어+|으음+|아+|에+|그니까|뭐랄까|um+|uh+|erm|hmm+)(?![\w가-힣])[,.…]*',
+    re.I,
+)
+_SPACES = re.compile(r'[ \t ]+')
+_DUP_WINDOW = 8  # 최근 몇 줄 안에서 완전히 같은 줄을 중복으로 볼지
+_MIN_OVERLAP = 3  # 롤링 자막 겹침으로 볼 최소 어절 수 (1~2어절 일치는 우연인 경우가 많다)
+
+
+def _strip_overlap(previous: str, line: str) -> str:
+    """이전 줄의 끝부분과 _MIN_OVERLAP어절 이상 겹치는 line의 앞부분(어절 단위)을 제거"""
+    prev_words = previous.split()
+    words = line.split()
+    for size in range(min(len(prev_words), len(words)), _MIN_OVERLAP - 1, -1):
+        if prev_words[-size:] == words[:size]:
+            return ' '.join(words[size:])
+    return line
+
+
+def compact_transcript(text: str, token_budget: Optional[int] = None) -> Tuple[str, Dict]:
+    """자막을 압축해 (텍스트, 통계) 반환.
+    통계: {"tokens_before", "tokens_after", "tokens_saved", "removed_lines", "truncated"}
+    """
+    if token_budget is None:
+        token_budget = int(os.getenv("TRANSCRIPT_TOKEN_BUDGET", "0"))
+    tokens_before = estimate_tokens(text or '')
+    lines: List[str] = []
+    removed = 0
+    for raw in (text or '').splitlines():
+        line = raw
+        for pattern in _TAG_PATTERNS:
+            line = pattern.sub(' ', line)
+        line = _FILLER.sub(' ', line)
+        line = _SPACES.sub(' ', line).strip(' ,')
+        if lines and line:
+            line = _strip_overlap(lines[-1], line)
+        if not line or line in lines[-_DUP_WINDOW:]:
+            removed += 1
+            continue
+        lines.append(line)
+
+    truncated = False
+    if token_budget and token_budget > 0:
+        kept, used = [], 0
+        for line in lines:
+            cost = estimate_tokens(line) + 1
+            if used + cost > token_budget:
+                truncated = True
+                break
+            kept.append(line)
+            used += cost
+        lines = kept
+
+    result = '\n'.join(lines)
+    tokens_after = estimate_tokens(result)
+    return result, {
+        "tokens_before": tokens_before,
+        "tokens_after": tokens_after,
+        "tokens_saved": tokens_before - tokens_after,
+        "removed_lines": removed,
+        "truncated": truncated,
+    }
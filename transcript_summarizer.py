@@ -0,0 +1,118 @@
+"""긴 스크립트용 map-reduce 요약.
+
+한 시간짜리 영상의 스크립트를 프롬프트 하나에 통째로 넣으면 느리고 비싸며 컨텍스트 한도를 넘기기도 한다.
+- map: 스크립트를 토큰 상한 기준 청크로 나눠 병렬로 요약(핵심 노트)
+- reduce: 청크 노트를 순서대로 이어 붙여 본문 생성 프롬프트의 입력으로 사용
+- 청크 요약은 청크 내용 해시로 llm_cache에 저장해, 재실행 시 바뀐 청크만 다시 요약한다.
+
+환경변수:
+  - LONG_INPUT_TOKENS=12000    → 이 추정 토큰 수를 넘으면 map-reduce 사용
+  - SUMMARY_CHUNK_TOKENS=3000  → 청크당 토큰 상한
+  - SUMMARY_CONCURRENCY=4      → 동시 요약 요청 수
+"""
+import asyncio
+import hashlib
+import os
+import re
+from typing import Awaitable, Callable, List, Optional
+
+from llm_cache import get_llm_cache
+
+# 프롬프트를 바꾸면 버전을 올려 이전 요약 캐시를 무효화
+SUMMARY_PROMPT_VERSION = "v1"
+
+
+def estimate_tokens(text: str) -> int:
+    """토크나이저 없이 쓰는 근사치: 한글/CJK 1자 ≈ 1토큰, 그 외 4자 ≈ 1토큰"""
+    if not text:
+        return 0
+    cjk = len(re.findall(r'[぀-ヿ㐀-鿿가-힣]', text))
+    return cjk + (len(text) - cjk + 3) // 4
+
+
+def chunk_text(text: str, max_tokens: int) -> List[str]:
+    """줄 단위로 max_tokens 이하 청크를 채움. 한 줄이 상한을 넘으면 글자 수로 자른다."""
+    chunks: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        tokens = estimate_tokens(line)
+        if tokens > max_tokens:
+            # 토큰 비율만큼 글자 수로 분할
+            step = max(1, int(len(line) * max_tokens / tokens))
+            pieces = [line[i:i + step] for i in range(0, len(line), step)]
+        else:
+            pieces = [line]
+        for piece in pieces:
+            piece_tokens = estimate_tokens(piece)
+            if current and current_tokens + piece_tokens > max_tokens:
+                chunks.append("\n".join(current))
+                current, current_tokens = [], 0
+            current.append(piece)
+            current_tokens += piece_tokens
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+class TranscriptSummarizer:
+    def __init__(self, generate: Callable[[str], Awaitable[Optional[str]]], model: str = "",
+                 threshold_tokens: Optional[int] = None, chunk_tokens: Optional[int] = None,
+                 concurrency: Optional[int] = None):
+        """generate: 프롬프트를 받아 텍스트를 돌려주는 비동기 LLM 호출 함수"""
+        self.generate = generate
+        self.model = model
+        self.threshold_tokens = threshold_tokens or int(os.getenv("LONG_INPUT_TOKENS", "12000"))
+        self.chunk_tokens = chunk_tokens or int(os.getenv("SUMMARY_CHUNK_TOKENS", "3000"))
+        self.concurrency = concurrency or int(os.getenv("SUMMARY_CONCURRENCY", "4"))
+
+    def needs_summary(self, text: str) -> bool:
+        return estimate_tokens(text) > self.threshold_tokens
+
+    def _chunk_key(self, chunk: str) -> str:
+        raw = f"chunk_summary:{SUMMARY_PROMPT_VERSION}:{self.model}:{chunk}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _chunk_prompt(chunk: str, index: int, total: int) -> str:
+        return f"""
+        다음은 YouTube 영상 스크립트의 {index}/{total} 부분입니다.
+        블로그 글의 재료가 되도록 핵심 내용을 한국어 노트로 정리하세요.
+        - 주장, 근거, 수치, 고유명사, 사례, 실행 팁은 빠짐없이 유지
+        - 인사말, 잡담, 반복 표현은 제외
+        - 원문 길이의 20~30% 분량, 글머리표(-) 목록으로만 응답
+
+        스크립트:
+        {chunk}
+        """
+
+    async def _asummarize_chunk(self, chunk: str, index: int, total: int, semaphore: asyncio.Semaphore) -> str:
+        cache = get_llm_cache()
+        key = self._chunk_key(chunk)
+        if cache:
+            cached = await asyncio.to_thread(cache.get, key)
+            if cached and cached.get("summary"):
+                return cached["summary"]
+        async with semaphore:
+            summary = await self.generate(self._chunk_prompt(chunk, index, total))
+        if not summary or not summary.strip():
+            # 요약 실패 시 정보 손실 대신 원문 청크를 그대로 사용
+            return chunk
+        summary = summary.strip()
+        if cache:
+            await asyncio.to_thread(cache.put, key, self.model or "chunk_summary", {"summary": summary})
+        return summary
+
+    async def asummarize(self, text: str) -> str:
+        """청크별 병렬 요약 후 순서대로 결합한 노트 반환"""
+        chunks = chunk_text(text, self.chunk_tokens)
+        if len(chunks) <= 1:
+            return text
+        semaphore = asyncio.Semaphore(self.concurrency)
+        notes = await asyncio.gather(*(
+            self._asummarize_chunk(chunk, i, len(chunks), semaphore) for i, chunk in enumerate(chunks, 1)
+        ))
+        return "\n\n".join(f"[파트 {i}/{len(notes)}]\n{note}" for i, note in enumerate(notes, 1))
@@ -4,6 +4,7 @@ import json
 from datetime import datetime
 from youtube_to_seo_content import YouTubeToSEOContent
 import zipfile
+from llm_gateway import get_gateway
 import io
 
 app = Flask(__name__)
@@ -12,6 +13,9 @@ app.config['SECRET_KEY'] = 'your-secret-key-here'
 # OpenAI API 키 (환경 변수에서 가져오거나 직접 설정)
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY', 'your-openai-api-key-here')
 
+# LLM 커넥션 풀 예열 (첫 변환의 TLS 핸드셰이크 지연 제거)
+get_gateway().warmup_in_background(OPENAI_API_KEY)
+
 # 전역 변수로 변환기 인스턴스 저장
 converter = None
 
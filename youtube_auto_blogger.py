@@ -1,14 +1,12 @@
 import os
 import json
+import asyncio
 import requests
-from typing import Optional, Dict, List
+from typing import Callable, Optional, Dict, List
 from pytube import YouTube
-from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
-import pickle
 import base64
 from PIL import Image
 import io
@@ -16,22 +14,26 @@ import re
 import html
 import xml.etree.ElementTree as ET
 import json as jsonlib
-
-# Optional dependency: youtube-transcript-api for robust caption fetching
-try:
-    from youtube_transcript_api import (
-        YouTubeTranscriptApi,
-        TranscriptsDisabled,
-        NoTranscriptFound,
-        VideoUnavailable,
-    )
-except Exception:
-    YouTubeTranscriptApi = None
+import time
+from async_support import get_async_client, run_sync
+from llm_gateway import LLMError, get_gateway, message_content
+from caption_resolver import CaptionResolver
+from transcript_cache import extract_video_id, get_transcript_cache
+from text_condenser import condense_korean_text
+from keyword_translations import get_keyword_store, is_english, normalize_keyword
+from image_resolver import ImageResolver
+from transcript_summarizer import TranscriptSummarizer, estimate_tokens
+from transcript_compactor import compact_transcript
+from metrics import get_metrics
+from blogger_batch import schedule_posts
+from blogger_service import get_blogger_service
+from credential_manager import get_credential_manager
 
 class YouTubeAutoBlogger:
     def __init__(self, pexels_api_key: Optional[str] = None):
-        self.pexels_base_url = "https://api.pexels.com/v1"
+        self.pexels_base_url = os.getenv("PEXELS_BASE_URL", "https://api.pexels.com/v1")
         self.pexels_api_key = pexels_api_key
+        self.image_resolver = ImageResolver(self.pexels_base_url)
         # OpenAI (GPT) 설정: 환경변수 사용 (필수)
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
         self.openai_model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
@@ -41,32 +43,38 @@ class YouTubeAutoBlogger:
         self.creds = None
         self.blogger_service = None
         self.log_callback = None
+        # 스트리밍 콜백: (stage, 부분 텍스트). 설정되어 있으면 LLM 호출을 stream 모드로 수행
+        self.stream_callback = None
+        self.caption_resolver = CaptionResolver()
+        # 본문 생성 방식: chain(기본, 초안→길이 보정→한글 보정) | single_pass(길이/언어 제약을 한 번에 요청,
+        #               위반 필드만 재요청: 호출 수는 줄지만 본문 품질은 프롬프트 한 번에 달림) | outline(개요 먼저, 소제목별 본문 동시 생성)
+        self.analysis_mode = os.getenv("ANALYSIS_MODE", "chain")
+        # 본문이 길면 로컬 응축기(text_condenser)로 줄임. 1이면 그래도 넘칠 때만 LLM 응축 요청
+        self.llm_shrink_fallback = os.getenv("LLM_SHRINK_FALLBACK", "0") == "1"
         
     def initialize_blogger_from_token(self) -> bool:
-        """token.pickle이 있으면 이를 사용해 Blogger 서비스를 초기화."""
+        """저장된 토큰(자격 증명 관리자)이 있으면 이를 사용해 Blogger 서비스를 초기화."""
         try:
-            if self.blogger_service:
+            creds = get_credential_manager().get()
+            if not creds:
+                return False
+            if self.blogger_service and creds is self.creds:
                 return True
-            if os.path.exists('token.pickle'):
-                with open('token.pickle', 'rb') as token:
-                    self.creds = pickle.load(token)
-                if self.creds:
-                    self.blogger_service = build('blogger', 'v3', credentials=self.creds)
-                    return True
+            self.creds = creds
+            self.blogger_service = get_blogger_service(creds)
+            return True
         except Exception as _:
             return False
-        return False
     def setup_google_auth(self, client_id: str = None, client_secret: str = None):
         """Google OAuth 2.0 인증 설정"""
-        # 토큰이 이미 있으면 로드
-        if os.path.exists('token.pickle'):
-            with open('token.pickle', 'rb') as token:
-                self.creds = pickle.load(token)
+        # 토큰이 이미 있으면 로드 (메모리 보관, 만료 전 백그라운드 갱신)
+        manager = get_credential_manager()
+        self.creds = manager.get()
         
         # 유효한 인증 정보가 없으면 새로 생성
         if not self.creds or not self.creds.valid:
             if self.creds and self.creds.expired and self.creds.refresh_token:
-                self.creds.refresh(Request())
+                manager.refresh_now()
             else:
                 # credentials.json 파일이 없으면 자동 생성
                 if not os.path.exists('credentials.json'):
@@ -81,16 +89,14 @@ class YouTubeAutoBlogger:
                 flow = InstalledAppFlow.from_client_secrets_file(
                     'credentials.json', self.SCOPES)
                 self.creds = flow.run_local_server(port=0)
-            
-            # 토큰 저장
-            with open('token.pickle', 'wb') as token:
-                pickle.dump(self.creds, token)
+                # 토큰 저장
+                manager.set(self.creds)
         
         # Blogger API 서비스 생성
         try:
             # 프록시가 TLS를 깨뜨리는 환경을 회피
             self._disable_system_proxies()
-            self.blogger_service = build('blogger', 'v3', credentials=self.creds)
+            self.blogger_service = get_blogger_service(self.creds)
             return True
         except Exception as e:
             print(f"❌ Blogger API 서비스 생성 실패: {e}")
@@ -135,35 +141,66 @@ class YouTubeAutoBlogger:
         except Exception:
             print(message)
 
-    def _llm_generate_text(self, prompt: str) -> Optional[str]:
-        """OpenAI(Chat Completions)으로 텍스트 생성. 키가 없으면 생성 불가."""
+    def _llm_messages(self, prompt: str) -> List[Dict]:
+        return [
+            {"role": "system", "content": "You are a helpful assistant that writes fluent Korean when appropriate."},
+            {"role": "user", "content": prompt}
+        ]
+
+    def _llm_generate_text(self, prompt: str, use_cache: bool = True) -> Optional[str]:
+        """OpenAI(Chat Completions)으로 텍스트 생성. 키가 없으면 생성 불가.
+        use_cache=False면 LLM 응답 캐시를 우회해 항상 새로 생성.
+        """
         if not self.openai_api_key:
             self._log("❌ OpenAI API 키가 설정되지 않았습니다. AI 생성을 진행할 수 없습니다.")
             return None
         try:
-            # 시스템 프록시로 인해 TLS 문제가 발생하는 환경 방지
-            self._disable_system_proxies()
             self._log(f"LLM: OpenAI ({self.openai_model})")
-            headers = {"Authorization": f"Bearer {self.openai_api_key}", "Content-Type": "application/json"}
-            payload = {
-                "model": self.openai_model,
-                "messages": [
-                    {"role": "system", "content": "You are a helpful assistant that writes fluent Korean when appropriate."},
-                    {"role": "user", "content": prompt}
-                ],
-                "temperature": 0.7,
-            }
-            session = requests.Session()
-            session.trust_env = False  # OS 프록시 무시
-            resp = session.post("https://api.openai.com/v1/chat/completions", headers=headers, json=payload, timeout=120)
-            if resp.status_code == 200:
-                return resp.json().get("choices", [{}])[0].get("message", {}).get("content")
-            else:
-                try:
-                    txt = resp.text[:500]
-                except Exception:
-                    txt = str(resp)
-                self._log(f"❌ OpenAI 응답 오류: {resp.status_code} {txt}")
+            return get_gateway().chat(self._llm_messages(prompt), model=self.openai_model,
+                                      api_key=self.openai_api_key, temperature=0.7, timeout=120,
+                                      use_cache=use_cache)
+        except LLMError as e:
+            self._log(f"❌ {e}")
+        except Exception as e:
+            self._log(f"❌ OpenAI 호출 오류: {e}")
+        return None
+
+    async def _allm_generate_text(self, prompt: str, use_cache: bool = True, stage: str = "llm",
+                                  stream: Optional[bool] = None, json_mode: bool = False) -> Optional[str]:
+        """_llm_generate_text의 비동기 버전 (공유 게이트웨이 사용).
+        stream=True(기본: stream_callback이 있을 때)면 토큰을 stream_callback(stage, delta)로 전달하고
+        단계별 TTFT/tokens/sec를 로그로 남긴다. json_mode=True면 JSON 객체 응답을 강제한다.
+        """
+        if not self.openai_api_key:
+            self._log("❌ OpenAI API 키가 설정되지 않았습니다. AI 생성을 진행할 수 없습니다.")
+            return None
+        if stream is None:
+            stream = self.stream_callback is not None
+        try:
+            self._log(f"LLM: OpenAI ({self.openai_model})")
+            kwargs = dict(model=self.openai_model, api_key=self.openai_api_key, temperature=0.7,
+                          timeout=120, use_cache=use_cache,
+                          response_format={"type": "json_object"} if json_mode else None)
+            if not stream:
+                started = time.perf_counter()
+                text = await get_gateway().achat(self._llm_messages(prompt), **kwargs)
+                get_metrics().observe_llm_call(stage, time.perf_counter() - started)
+                return text
+
+            callback = self.stream_callback
+            on_delta = (lambda delta: callback(stage, delta)) if callback else None
+            started = time.perf_counter()
+            response = await get_gateway().astream_chat_completion(self._llm_messages(prompt), on_delta=on_delta, **kwargs)
+            get_metrics().observe_llm_call(stage, time.perf_counter() - started)
+            stats = response.get("stream_stats")
+            if stats and stats.get("ttft") is not None:
+                self._log(
+                    f"⏱️ LLM[{stage}] 첫 토큰 {stats['ttft']:.2f}s, "
+                    f"{stats['tokens_per_sec'] or 0:.1f} tok/s, 총 {stats['duration']:.1f}s"
+                )
+            return message_content(response)
+        except LLMError as e:
+            self._log(f"❌ {e}")
         except Exception as e:
             self._log(f"❌ OpenAI 호출 오류: {e}")
         return None
@@ -189,62 +226,36 @@ class YouTubeAutoBlogger:
             print("\n설정이 취소되었습니다.")
             return False
     
-    def extract_youtube_script(self, youtube_url: str) -> Optional[str]:
-        """YouTube URL에서 스크립트 추출"""
+    def extract_youtube_script(self, youtube_url: str, use_cache: bool = True) -> Optional[str]:
+        """YouTube URL에서 스크립트 추출 (aextract_youtube_script의 동기 래퍼)"""
+        return run_sync(self.aextract_youtube_script(youtube_url, use_cache=use_cache))
+
+    async def aextract_youtube_script(self, youtube_url: str, use_cache: bool = True) -> Optional[str]:
+        """YouTube URL에서 스크립트 추출 (비동기)
+        video_id 기준 스크립트 캐시를 먼저 확인하고, 새로 얻은 스크립트는 출처와 함께 저장.
+        """
         try:
             print(f"🎥 YouTube 스크립트 추출 중: {youtube_url}")
 
-            # 1) youtube-transcript-api로 자막 우선 시도 (ko -> en)
-            def _extract_video_id(url: str) -> Optional[str]:
-                patterns = [r"v=([\w-]{11})", r"youtu\.be/([\w-]{11})", r"/shorts/([\w-]{11})"]
-                for p in patterns:
-                    m = re.search(p, url)
-                    if m:
-                        return m.group(1)
-                return None
+            video_id = extract_video_id(youtube_url)
+            cache = get_transcript_cache() if (use_cache and video_id) else None
+            if cache:
+                cached = await asyncio.to_thread(cache.get, video_id)
+                if cached:
+                    print(f"✅ 캐시된 스크립트 사용 ({cached['source']}, {cached['lang'] or '-'})")
+                    return cached['text']
 
-            video_id = _extract_video_id(youtube_url)
-            # 1) 공식 timedtext XML 우선 시도 (로그인/제한 영상 제외)
+            # 1) 자막 탐색: 소스별 트랙 목록 1회 조회 → 로컬 언어 선택 → 선택 트랙 1회 다운로드
             if video_id:
-                script = self._fetch_timedtext_script(video_id)
-                if script:
-                    print("✅ timedtext XML에서 스크립트 추출 완료")
-                    return script
-            # 1.5) youtube-transcript-api 보조 시도 (있으면)
-            if YouTubeTranscriptApi and video_id:
-                preferred_langs = ['ko', 'ko-KR', 'en', 'en-US', 'ja', 'zh-Hans', 'zh-Hant', 'zh']
-                for attempt in range(2):
-                    try:
-                        for lang in preferred_langs:
-                            try:
-                                data = YouTubeTranscriptApi.get_transcript(video_id, languages=[lang])
-                                script = "\n".join(seg['text'] for seg in data if seg.get('text'))
-                                if script.strip():
-                                    print("✅ 자막 API에서 스크립트 추출 완료")
-                                    return script
-                            except Exception:
-                                continue
-                        break
-                    except Exception:
-                        break
-
-            # 2) pytube로 메타 정보(제목/설명) 확보 (자막은 사용하지 않음)
-            title, description = None, None
-            try:
-                yt = YouTube(youtube_url)
-                title = yt.title
-                description = yt.description
-            except Exception:
-                # oEmbed로 최소 제목 확보
-                try:
-                    oembed = requests.get(
-                        "https://www.youtube.com/oembed",
-                        params={"url": youtube_url, "format": "json"}, timeout=10,
-                    )
-                    if oembed.ok:
-                        title = oembed.json().get('title')
-                except Exception:
-                    pass
+                track = await self.caption_resolver.aresolve(video_id)
+                if track:
+                    print(f"✅ 자막에서 스크립트 추출 완료 ({track.source}, {track.lang})")
+                    await self._astore_transcript(cache, video_id, track.text, track.source, track.lang)
+                    return track.text
+
+            # 2) 자막이 없을 때만 pytube/oEmbed로 메타 정보(제목/설명) 확보
+            #    (대부분 자막으로 끝나고 pytube 스레드 호출은 취소할 수 없으므로 미리 시작하지 않는다)
+            title, description = await self._afetch_video_meta(youtube_url)
 
             # 3) 자막이 없으면 AI로 스크립트 생성
             print("📝 AI로 스크립트 생성 중...")
@@ -257,7 +268,9 @@ class YouTubeAutoBlogger:
             실제 스크립트처럼 자연스럽고 상세하게 작성해주세요.
             """
 
-            script = self._llm_generate_text(prompt)
+            # 생성한 스크립트는 스크립트 캐시에 넣지 않는다: 나중에 자막이 생겨도 캐시가 이를 가리게 된다
+            # (같은 프롬프트의 재생성은 LLM 응답 캐시가 처리)
+            script = await self._allm_generate_text(prompt, stage="script")
             if script:
                 print("✅ AI로 스크립트 생성 완료")
                 return script
@@ -269,47 +282,98 @@ class YouTubeAutoBlogger:
             print(f"❌ YouTube 스크립트 추출 실패: {e}")
             return None
 
-    def _fetch_timedtext_script(self, video_id: str) -> Optional[str]:
-        """YouTube timedtext XML 엔드포인트로 자막을 폴백 추출"""
+    async def _astore_transcript(self, cache, video_id: Optional[str], text: str, source: str,
+                                 lang: Optional[str] = None) -> None:
+        if not (cache and video_id):
+            return
         try:
-            # 사용 가능한 언어 목록 조회
-            list_url = "https://video.google.com/timedtext"
-            r = requests.get(list_url, params={"type": "list", "v": video_id}, timeout=10)
-            if r.status_code != 200 or not r.text.strip():
-                return None
-            root = ET.fromstring(r.text)
-            tracks = root.findall('track')
-            if not tracks:
-                return None
-            # 선호 언어 선택
-            preferred = ['ko', 'ko-KR', 'en', 'en-US']
-            lang = None
-            for p in preferred:
-                if any(t.get('lang_code') == p for t in tracks):
-                    lang = p; break
-            if not lang:
-                lang = tracks[0].get('lang_code')
-
-            # 자막 다운로드 (XML)
-            r2 = requests.get(list_url, params={"lang": lang, "v": video_id}, timeout=15)
-            if r2.status_code != 200 or not r2.text.strip():
-                return None
-            root2 = ET.fromstring(r2.text)
-            lines = []
-            for node in root2.findall('text'):
-                t = node.text or ''
-                t = html.unescape(t)
-                t = t.replace('\n', ' ').strip()
-                if t:
-                    lines.append(t)
-            text = "\n".join(lines)
-            return text if text.strip() else None
+            await asyncio.to_thread(cache.put, video_id, text, source, lang)
+        except Exception as e:
+            print(f"⚠️ 스크립트 캐시 저장 실패: {e}")
+
+    async def _afetch_video_meta(self, youtube_url: str) -> tuple:
+        """pytube(스레드) → oEmbed 순으로 (제목, 설명) 확보 (PYTUBE_ENABLED=0이면 oEmbed만)"""
+        def _pytube_meta():
+            if os.getenv("PYTUBE_ENABLED", "1") == "0":
+                raise RuntimeError("pytube disabled")
+            yt = YouTube(youtube_url)
+            return yt.title, yt.description
+        try:
+            return await asyncio.to_thread(_pytube_meta)
         except Exception:
-            return None
+            # oEmbed로 최소 제목 확보
+            try:
+                oembed = await get_async_client().get(
+                    os.getenv("YOUTUBE_OEMBED_URL", "https://www.youtube.com/oembed"),
+                    params={"url": youtube_url, "format": "json"}, timeout=10,
+                )
+                if oembed.is_success:
+                    return oembed.json().get('title'), None
+            except Exception:
+                pass
+        return None, None
+
+    def _fetch_timedtext_script(self, video_id: str) -> Optional[str]:
+        """YouTube timedtext XML 엔드포인트로 자막을 폴백 추출 (동기 래퍼)"""
+        return run_sync(self._afetch_timedtext_script(video_id))
+
+    async def _afetch_timedtext_script(self, video_id: str) -> Optional[str]:
+        """YouTube timedtext XML 엔드포인트로 자막을 폴백 추출"""
+        track = await self.caption_resolver.afetch_timedtext(video_id)
+        return track.text if track else None
     
-    def analyze_content(self, script_text: str, target_audience: str = "일반인", desired_min_len: int = 3000, desired_max_len: int = 4000) -> Dict:
-        """AI로 콘텐츠 분석 및 SEO 최적화 (OpenAI 전용)"""
-        # 안전 가드: 비정상 인자 교정
+    def analyze_content(self, script_text: str, target_audience: str = "일반인", desired_min_len: int = 3000, desired_max_len: int = 4000,
+                        mode: Optional[str] = None) -> Dict:
+        """AI로 콘텐츠 분석 및 SEO 최적화 (aanalyze_content의 동기 래퍼)"""
+        return run_sync(self.aanalyze_content(script_text, target_audience, desired_min_len, desired_max_len, mode=mode))
+
+    async def aanalyze_content(self, script_text: str, target_audience: str = "일반인", desired_min_len: int = 3000, desired_max_len: int = 4000,
+                               mode: Optional[str] = None) -> Dict:
+        """AI로 콘텐츠 분석 및 SEO 최적화 (OpenAI 전용): 초안 생성 → 길이/한글 보정
+        mode: 'single_pass' | 'chain' | 'outline' (기본: self.analysis_mode)
+        """
+        mode = mode or self.analysis_mode
+        desired_min_len, desired_max_len = self._normalize_length_range(desired_min_len, desired_max_len)
+        data = await self._agenerate_analysis(script_text, target_audience, desired_min_len, desired_max_len, mode=mode)
+        if not data:
+            return {}
+        return await self._apolish_content(data, desired_min_len, desired_max_len, mode=mode)
+
+    def _compact_script(self, script_text: str) -> str:
+        """자막 중복/비음성 표기/추임새 제거 및 토큰 예산 적용 (TRANSCRIPT_COMPACTION=0이면 생략)"""
+        if os.getenv("TRANSCRIPT_COMPACTION", "1") == "0":
+            return script_text
+        try:
+            compacted, stats = compact_transcript(script_text)
+        except Exception as e:
+            print(f"⚠️ 스크립트 압축 실패: {e}")
+            return script_text
+        if not compacted.strip():
+            return script_text
+        saved_pct = stats['tokens_saved'] / max(stats['tokens_before'], 1) * 100
+        self._log(
+            f"🧹 스크립트 압축: 약 {stats['tokens_before']} → {stats['tokens_after']} 토큰 "
+            f"({saved_pct:.0f}% 절감{', 예산 초과분 잘림' if stats['truncated'] else ''})"
+        )
+        return compacted
+
+    async def _acondense_long_script(self, script_text: str) -> str:
+        """긴 스크립트는 청크별 병렬 요약(map-reduce) 노트로 대체. 짧으면 그대로 반환."""
+        summarizer = TranscriptSummarizer(
+            lambda prompt: self._allm_generate_text(prompt, use_cache=False, stage="summarize", stream=False),
+            model=self.openai_model,
+        )
+        if not summarizer.needs_summary(script_text):
+            return script_text
+        before = estimate_tokens(script_text)
+        self._log(f"📚 긴 스크립트(약 {before} 토큰): 청크별 병렬 요약 중...")
+        notes = await summarizer.asummarize(script_text)
+        self._log(f"📚 요약 완료: 약 {before} → {estimate_tokens(notes)} 토큰")
+        return notes
+
+    @staticmethod
+    def _normalize_length_range(desired_min_len, desired_max_len) -> tuple:
+        """안전 가드: 비정상 길이 인자 교정"""
         try:
             desired_min_len = int(desired_min_len)
             desired_max_len = int(desired_max_len)
@@ -319,8 +383,154 @@ class YouTubeAutoBlogger:
                 desired_max_len = desired_min_len + 500
         except Exception:
             desired_min_len, desired_max_len = 3000, 4000
+        return desired_min_len, desired_max_len
 
-        prompt = f"""
+    async def _agenerate_analysis(self, script_text: str, target_audience: str, desired_min_len: int, desired_max_len: int,
+                                  mode: str = "chain") -> Dict:
+        """메인 JSON(제목/소제목/본문/키워드/메타) 생성. 길이/한글 보정은 하지 않음."""
+        script_text = self._compact_script(script_text)
+        script_text = await self._acondense_long_script(script_text)
+        if mode == "outline":
+            data = await self._agenerate_outline_article(script_text, target_audience, desired_min_len, desired_max_len)
+            if data:
+                return data
+            self._log("⚠️ 개요 기반 생성 실패 → 단일 요청 생성으로 전환")
+            mode = "single_pass"
+        if mode == "single_pass":
+            prompt = self._single_pass_prompt(script_text, target_audience, desired_min_len, desired_max_len)
+        else:
+            prompt = self._chain_prompt(script_text, target_audience, desired_min_len, desired_max_len)
+        
+        try:
+            raw = (await self._allm_generate_text(prompt, stage="analysis", json_mode=(mode == "single_pass")) or '').strip()
+            data = self._parse_json_object(raw)
+            if not data:
+                # 최소 구조 반환
+                data = {
+                    "title": f"{target_audience}을 위한 블로그 포스트",
+                    "subheadings": ["주요 내용", "상세 설명", "결론"],
+                    "content": raw,
+                    "keywords": ["키워드1", "키워드2", "키워드3", "키워드4", "키워드5",
+                                   "키워드6", "키워드7", "키워드8", "키워드9", "키워드10"],
+                    "meta_description": "유튜브 콘텐츠를 바탕으로 한 블로그 포스트입니다.",
+                    "target_audience": target_audience
+                }
+            return data
+
+        except Exception as e:
+            print(f"❌ 콘텐츠 분석 실패: {e}")
+            return {}
+
+    @staticmethod
+    def _parse_json_object(raw: str) -> Dict:
+        """코드펜스 제거 및 JSON 부분만 추출 (실패 시 빈 dict)"""
+        raw = (raw or '').strip()
+        if raw.startswith('```'):
+            raw = raw.strip('`')
+        try:
+            return jsonlib.loads(raw) or {}
+        except Exception:
+            try:
+                start = raw.find('{')
+                end = raw.rfind('}')
+                if start != -1 and end != -1:
+                    return jsonlib.loads(raw[start:end+1]) or {}
+            except Exception:
+                pass
+        return {}
+
+    async def _agenerate_outline_article(self, script_text: str, target_audience: str,
+                                         desired_min_len: int, desired_max_len: int) -> Dict:
+        """개요(제목/소제목/키워드/메타)를 먼저 받고, 소제목별 본문을 동시에 생성해 순서대로 조립.
+        본문 생성 시간은 섹션 합이 아니라 가장 느린 섹션 하나로 제한된다. 실패 시 빈 dict."""
+        try:
+            raw = await self._allm_generate_text(
+                self._outline_prompt(script_text, target_audience), stage="outline", json_mode=True
+            )
+            outline = self._parse_json_object(raw or '')
+            subheadings = [h.strip() for h in outline.get('subheadings') or [] if isinstance(h, str) and h.strip()]
+            if not outline.get('title') or not subheadings:
+                return {}
+            points = outline.get('section_points') or []
+            per_section = (desired_min_len + desired_max_len) // 2 // len(subheadings)
+            self._log(f"🧩 개요 완료: 소제목 {len(subheadings)}개, 섹션 본문 동시 생성 중...")
+
+            async def _section(idx: int, heading: str) -> Optional[str]:
+                hint = points[idx] if idx < len(points) and isinstance(points[idx], str) else ''
+                prompt = self._section_prompt(script_text, target_audience, outline['title'], subheadings,
+                                              idx, hint, per_section)
+                text = await self._allm_generate_text(prompt, stage=f"section_{idx + 1}", stream=False)
+                return text.strip() if text and text.strip() else None
+
+            bodies = await asyncio.gather(*(_section(i, h) for i, h in enumerate(subheadings)))
+            sections = [{"heading": h, "body": b} for h, b in zip(subheadings, bodies) if b]
+            if not sections:
+                return {}
+            if len(sections) < len(subheadings):
+                self._log(f"⚠️ 섹션 {len(subheadings) - len(sections)}개 생성 실패 → 해당 소제목 제외")
+            return {
+                "title": outline['title'],
+                "subheadings": [s['heading'] for s in sections],
+                "sections": sections,
+                "content": "\n\n".join(s['body'] for s in sections),
+                "keywords": outline.get('keywords') or [],
+                "meta_description": outline.get('meta_description', ''),
+                "target_audience": outline.get('target_audience') or target_audience,
+            }
+        except Exception as e:
+            print(f"❌ 개요 기반 생성 실패: {e}")
+            return {}
+
+    @staticmethod
+    def _outline_prompt(script_text: str, target_audience: str) -> str:
+        """본문 없이 구조만 요청하는 짧은 개요 프롬프트"""
+        return f"""
+        다음 유튜브 스크립트를 기반으로 {target_audience} 타겟의 한국어 블로그 포스트 개요를 JSON 객체 하나로 작성하세요.
+        본문은 쓰지 말고 구조만 작성합니다.
+        - subheadings: 글의 흐름에 맞는 소제목 4~6개
+        - section_points: 소제목별로 다룰 핵심 내용을 한 문장씩 (subheadings와 같은 순서·개수)
+        - keywords: 한글 키워드 10개, meta_description: 150자 이내
+        - 모든 필드는 자연스러운 한국어
+
+        스크립트 원문:
+        {script_text}
+
+        JSON 형식:
+        {{
+            "title": "",
+            "subheadings": ["", "", "", "", ""],
+            "section_points": ["", "", "", "", ""],
+            "keywords": ["", "", "", "", "", "", "", "", "", ""],
+            "meta_description": "",
+            "target_audience": "{target_audience}"
+        }}
+        """
+
+    @staticmethod
+    def _section_prompt(script_text: str, target_audience: str, title: str, subheadings: List[str],
+                        idx: int, hint: str, per_section: int) -> str:
+        """섹션 하나의 본문 프롬프트. 스크립트를 앞에 두어 섹션 간 프롬프트 앞부분이 같도록 함(서버 측 프롬프트 캐시 활용)"""
+        outline_text = "\n".join(f"{i + 1}. {h}" for i, h in enumerate(subheadings))
+        return f"""
+        스크립트 원문:
+        {script_text}
+
+        위 스크립트로 {target_audience} 타겟의 한국어 블로그 글 "{title}"을 쓰고 있습니다.
+        전체 소제목:
+        {outline_text}
+
+        이 중 {idx + 1}번 소제목 "{subheadings[idx]}"의 본문만 작성하세요.
+        {f"- 다룰 내용: {hint}" if hint else ""}
+        - 공백 포함 약 {per_section}자, 2~4개 단락을 빈 줄로 구분
+        - 다른 소제목의 내용은 다루지 말 것, 소제목 자체는 쓰지 말 것
+        - 구체적 사례/데이터/실행 팁 포함, 존댓말, 상투적 문구 금지
+        - 반환은 '본문 텍스트'만. 다른 형식·주석·마크다운 금지
+        """
+
+    @staticmethod
+    def _chain_prompt(script_text: str, target_audience: str, desired_min_len: int, desired_max_len: int) -> str:
+        """기존(chain) 모드 프롬프트: 길이/한글은 이후 단계에서 보정"""
+        return f"""
         다음 유튜브 스크립트를 기반으로 {target_audience} 타겟의 고품질 한국어 블로그 포스트를 작성하세요.
         - 길이: 본문은 {desired_min_len}~{desired_max_len}자 사이 (가독성 유지, 불필요한 군더더기 금지)
         - 품질: 구체적 사례/데이터/실행 가능한 팁 포함, 중복·상투적 표현 지양, 광고성·과장 금지
@@ -343,39 +553,128 @@ class YouTubeAutoBlogger:
             "target_audience": "{target_audience}"
         }}
         """
-        
+
+    @staticmethod
+    def _single_pass_prompt(script_text: str, target_audience: str, desired_min_len: int, desired_max_len: int) -> str:
+        """길이/언어/구조 제약을 한 번의 구조화 요청에 모두 담은 프롬프트"""
+        per_section = (desired_min_len + desired_max_len) // 2 // 5
+        return f"""
+        다음 유튜브 스크립트를 기반으로 {target_audience} 타겟의 고품질 한국어 블로그 포스트를 JSON 객체 하나로 작성하세요.
+
+        [필수 제약 - 모두 만족해야 함]
+        1. 언어: 모든 필드를 자연스러운 한국어(존댓말)로 작성. 스크립트가 영어 등 외국어여도 반드시 한국어로 작성
+        2. 길이: content는 공백 포함 {desired_min_len}~{desired_max_len}자. 소제목 5개 기준 섹션당 약 {per_section}자
+        3. 구조: subheadings 4~6개. content는 소제목 순서대로 단락을 빈 줄로 구분한 순수 텍스트(마크다운/HTML 금지)
+        4. SEO: keywords는 한글 키워드 10개, meta_description은 150자 이내, 키워드는 본문에 자연스럽게 배치
+        5. 품질: 구체적 사례/데이터/실행 가능한 팁 포함. "이 글에서는", "결론적으로", "요약하면" 같은 템플릿 문구 금지
+
+        스크립트 원문:
+        {script_text}
+
+        JSON 형식:
+        {{
+            "title": "",
+            "subheadings": ["", "", "", "", ""],
+            "content": "",
+            "keywords": ["", "", "", "", "", "", "", "", "", ""],
+            "meta_description": "",
+            "target_audience": "{target_audience}"
+        }}
+        """
+
+    # single_pass 검증 시 허용하는 길이 오차 (LLM의 글자 수 계산이 부정확하므로 ±10%)
+    LENGTH_SLACK = 0.1
+
+    @staticmethod
+    def _hangul_ratio(text: str) -> float:
+        hangul = sum(1 for ch in text if '\uac00' <= ch <= '\ud7a3')
+        return hangul / max(len(text), 1)
+
+    def _content_issues(self, text: str, desired_min_len: int, desired_max_len: int) -> List[str]:
+        """본문 로컬 검증: 'short' | 'long' | 'not_korean' 목록 반환"""
+        issues = []
+        body = (text or '').strip()
+        if len(body) < desired_min_len * (1 - self.LENGTH_SLACK):
+            issues.append('short')
+        elif len(body) > desired_max_len * (1 + self.LENGTH_SLACK):
+            issues.append('long')
+        if body and self._hangul_ratio(body) < 0.2:
+            issues.append('not_korean')
+        return issues
+
+    async def _apolish_content(self, data: Dict, desired_min_len: int, desired_max_len: int,
+                               mode: str = "chain") -> Dict:
+        """모드별 본문 후처리. single_pass/outline은 로컬 검증 후 위반한 content 필드만 한 번 재요청."""
+        if mode not in ("single_pass", "outline"):
+            return await self._apolish_chain(data, desired_min_len, desired_max_len)
+        with get_metrics().stage("content_fix"):
+            data = await self._apolish_single_pass(data, desired_min_len, desired_max_len)
+        # 보정으로 본문이 바뀌면 섹션 경계가 더 이상 맞지 않으므로 단락 분할 렌더링으로 되돌림
+        sections = data.get('sections')
+        if sections and data.get('content') != "\n\n".join(s.get('body', '') for s in sections):
+            data.pop('sections', None)
+        return data
+
+    async def _apolish_single_pass(self, data: Dict, desired_min_len: int, desired_max_len: int) -> Dict:
         try:
-            raw = (self._llm_generate_text(prompt) or '').strip()
-            # 코드펜스 제거 및 JSON 부분만 추출
-            if raw.startswith('```'):
-                raw = raw.strip('`')
-            def _parse_json(s: str) -> Dict:
-                try:
-                    return jsonlib.loads(s)
-                except Exception:
-                    try:
-                        start = s.find('{')
-                        end = s.rfind('}')
-                        if start != -1 and end != -1:
-                            return jsonlib.loads(s[start:end+1])
-                    except Exception:
-                        pass
-                return {}
+            issues = self._content_issues(data.get('content') or '', desired_min_len, desired_max_len)
+            if 'long' in issues:
+                self._condense_content(data, desired_min_len, desired_max_len)
+                issues = self._content_issues(data.get('content') or '', desired_min_len, desired_max_len)
+                if issues == ['long'] and not self.llm_shrink_fallback:
+                    return data
+            if not issues:
+                return data
+            self._log(f"🔧 본문 재요청(content만): {', '.join(issues)}")
+            fixed = await self._arepair_content(data.get('content') or '', issues, desired_min_len, desired_max_len)
+            if fixed:
+                data['content'] = fixed
+            return data
+        except Exception as e:
+            print(f"❌ 콘텐츠 보정 실패: {e}")
+            return data
 
-            data = _parse_json(raw) or {}
-            if not data:
-                # 최소 구조 반환
-                data = {
-                    "title": f"{target_audience}을 위한 블로그 포스트",
-                    "subheadings": ["주요 내용", "상세 설명", "결론"],
-                    "content": raw,
-                    "keywords": ["키워드1", "키워드2", "키워드3", "키워드4", "키워드5",
-                                   "키워드6", "키워드7", "키워드8", "키워드9", "키워드10"],
-                    "meta_description": "유튜브 콘텐츠를 바탕으로 한 블로그 포스트입니다.",
-                    "target_audience": target_audience
-                }
+    def _condense_content(self, data: Dict, desired_min_len: int, desired_max_len: int) -> bool:
+        """로컬 응축기로 본문을 desired_max_len 이하로 줄임 (네트워크 호출 없음). 범위 안에 들어오면 True"""
+        body = (data.get('content') or '').strip()
+        keywords = data.get('keywords') if isinstance(data.get('keywords'), list) else []
+        condensed, stats = condense_korean_text(body, desired_max_len, desired_min_len, keywords=keywords)
+        data['content'] = condensed
+        self._log(
+            f"✂️ 로컬 응축: {stats['before']}자 → {stats['after']}자 "
+            f"(중복 {stats['removed_duplicates']}, 문장 {stats['removed_sentences']}, 병합 {stats['merged_paragraphs']})"
+        )
+        return stats['after'] <= desired_max_len
+
+    async def _arepair_content(self, body: str, issues: List[str], desired_min_len: int, desired_max_len: int) -> Optional[str]:
+        """길이/언어 위반을 한 번의 요청으로 함께 교정"""
+        rules = []
+        if 'not_korean' in issues:
+            rules.append("- 자연스러운 한국어(존댓말)로 옮겨 쓰기, 의미는 충실히 유지")
+        if 'short' in issues:
+            rules.append(f"- {desired_min_len}~{desired_max_len}자로 확장: 소제목별 구체 사례/데이터/실행 팁 보강")
+        elif 'long' in issues:
+            rules.append(f"- {desired_min_len}~{desired_max_len}자로 응축: 정보 손실 최소화, 중복/수사 제거")
+        else:
+            rules.append(f"- 길이는 {desired_min_len}~{desired_max_len}자 유지")
+        rules_text = "\n                    ".join(rules)
+        prompt = f"""
+                    아래 블로그 본문을 다음 조건에 맞게 고쳐 쓰세요.
+                    {rules_text}
+                    - 단락 구분(빈 줄) 유지, 상투적 문구 금지
+                    - 반환은 '본문 텍스트'만. 다른 형식·주석·마크다운 금지
 
+                    본문:
+                    {body}
+                    """
+        text = await self._allm_generate_text(prompt, stage="content_fix")
+        return text.strip() if text else None
+
+    async def _apolish_chain(self, data: Dict, desired_min_len: int, desired_max_len: int) -> Dict:
+        """본문 길이 보정 및 한글 강제 (순차 의존: 길이 보정 결과를 한글 검사)"""
+        try:
             # 본문 길이 보정(목표 {desired_min_len}~{desired_max_len}자)
+            started = time.perf_counter()
             try:
                 body = (data.get('content') or '').strip()
                 body_len = len(body)
@@ -389,32 +688,37 @@ class YouTubeAutoBlogger:
                     본문:
                     {body}
                     """
-                    r_len_text = self._llm_generate_text(expand_prompt)
+                    r_len_text = await self._allm_generate_text(expand_prompt, stage="length_fix")
                     if r_len_text:
                         data['content'] = r_len_text.strip()
                 elif body_len > desired_max_len:
-                    shrink_prompt = f"""
-                    아래 본문을 핵심은 유지하되 {desired_min_len}~{desired_max_len}자로 응축하세요.
-                    - 정보 손실 최소화, 불필요한 수사/중복 제거
-                    - 문장 간 결속 강화, 논리 흐름 유지
-                    - 반환은 '본문 텍스트'만. 다른 형식·주석·마크다운 금지
+                    # 로컬 응축 먼저, 그래도 길면 (LLM_SHRINK_FALLBACK=1일 때만) LLM 응축
+                    condensed = self._condense_content(data, desired_min_len, desired_max_len)
+                    if not condensed and self.llm_shrink_fallback:
+                        body = data['content']
+                        shrink_prompt = f"""
+                        아래 본문을 핵심은 유지하되 {desired_min_len}~{desired_max_len}자로 응축하세요.
+                        - 정보 손실 최소화, 불필요한 수사/중복 제거
+                        - 문장 간 결속 강화, 논리 흐름 유지
+                        - 반환은 '본문 텍스트'만. 다른 형식·주석·마크다운 금지
 
-                    본문:
-                    {body}
-                    """
-                    r_len_text = self._llm_generate_text(shrink_prompt)
-                    if r_len_text:
-                        data['content'] = r_len_text.strip()
+                        본문:
+                        {body}
+                        """
+                        r_len_text = await self._allm_generate_text(shrink_prompt, stage="length_fix")
+                        if r_len_text:
+                            data['content'] = r_len_text.strip()
             except Exception:
                 pass
 
+            get_metrics().observe_stage("length_fix", time.perf_counter() - started)
+
             # 한글 강제: 본문이 영어 위주면 한국어로 변환
+            started = time.perf_counter()
             try:
                 text = data.get('content') or ''
                 # 간단한 한글 문자 비율 체크
-                hangul = sum(1 for ch in text if '\uac00' <= ch <= '\ud7a3')
-                ratio = hangul / max(len(text), 1)
-                if ratio < 0.2 and text.strip():
+                if self._hangul_ratio(text) < 0.2 and text.strip():
                     to_kr_prompt = f"""
                     다음 영어(또는 비한국어) 블로그 본문을 한국어로 매끄럽게 번역하되, 의미를 충실히 반영하세요.
                     - 존댓말, 자연스러운 한국어 문장
@@ -423,66 +727,78 @@ class YouTubeAutoBlogger:
                     본문:
                     {text}
                     """
-                    r3_text = self._llm_generate_text(to_kr_prompt)
+                    r3_text = await self._allm_generate_text(to_kr_prompt, stage="korean_fix")
                     if r3_text:
                         data['content'] = r3_text
             except Exception:
                 pass
+            get_metrics().observe_stage("korean_fix", time.perf_counter() - started)
 
             return data
                 
         except Exception as e:
-            print(f"❌ 콘텐츠 분석 실패: {e}")
-            return {}
+            print(f"❌ 콘텐츠 보정 실패: {e}")
+            return data
     
     def translate_keywords_to_english(self, keywords: List[str]) -> List[str]:
-        """키워드를 영어로 번역"""
+        """키워드를 영어로 번역 (동기 래퍼)"""
+        return run_sync(self.atranslate_keywords_to_english(keywords))
+
+    async def atranslate_keywords_to_english(self, keywords: List[str]) -> List[str]:
+        """키워드를 영어로 번역. 번역 사전(keyword_translations)을 먼저 조회하고,
+        처음 보는 키워드만 한 번의 배치 요청으로 번역해 사전에 저장한다."""
+        keywords = [kw for kw in keywords[:5] if isinstance(kw, str) and kw.strip()]
+        store = get_keyword_store()
+        known: Dict[str, str] = {}
+        if store:
+            try:
+                known = await asyncio.to_thread(store.get_many, [kw for kw in keywords if not is_english(kw)])
+            except Exception as e:
+                print(f"⚠️ 키워드 번역 사전 조회 실패: {e}")
+        unseen = [kw for kw in keywords if not is_english(kw) and normalize_keyword(kw) not in known]
+        if unseen:
+            fresh = await self._atranslate_keyword_batch(unseen)
+            if fresh:
+                known.update({normalize_keyword(k): v for k, v in fresh.items()})
+                if store:
+                    try:
+                        await asyncio.to_thread(store.put_many, fresh)
+                    except Exception as e:
+                        print(f"⚠️ 키워드 번역 사전 저장 실패: {e}")
+        else:
+            self._log("📖 키워드 번역: 사전에서 모두 찾음 (LLM 호출 생략)")
+        return [kw if is_english(kw) else known.get(normalize_keyword(kw), kw) for kw in keywords]
+
+    async def _atranslate_keyword_batch(self, keywords: List[str]) -> Dict[str, str]:
+        """사전에 없는 키워드들을 한 번에 번역. 반환: {원문 키워드: 영어}"""
         prompt = f"""
         다음 한글 키워드들을 영어로 번역해주세요. 
         이미지 검색에 적합한 영어 단어로 변환해주세요.
         
-        키워드: {', '.join(keywords[:5])}
+        키워드: {jsonlib.dumps(keywords, ensure_ascii=False)}
         
-        영어 키워드만 쉼표로 구분해서 응답해주세요.
+        각 원문 키워드를 키로, 영어 키워드를 값으로 하는 JSON 객체만 응답해주세요.
         """
         
         try:
-            text = self._llm_generate_text(prompt)
-            if text:
-                english_keywords = text.strip().split(',')
-                return [kw.strip() for kw in english_keywords]
-            return keywords[:5]
+            text = await self._allm_generate_text(prompt, stage="translate", json_mode=True)
+            if not text:
+                return {}
+            mapping = jsonlib.loads(text.strip())
+            return {k: v.strip() for k, v in mapping.items()
+                    if k in keywords and isinstance(v, str) and v.strip()}
         except Exception as e:
             print(f"❌ 키워드 번역 실패: {e}")
-            return keywords[:5]
+            return {}
     
     def search_pexels_image(self, keyword: str) -> Optional[str]:
-        """Pexels에서 이미지 검색"""
-        try:
-            headers = {}
-            if self.pexels_api_key:
-                headers['Authorization'] = self.pexels_api_key
-            
-            url = f"{self.pexels_base_url}/search"
-            params = {
-                'query': keyword,
-                'per_page': 1,
-                'orientation': 'landscape'
-            }
-            response = requests.get(url, headers=headers, params=params, timeout=30)
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('photos'):
-                    photo = data['photos'][0]
-                    return photo.get('src', {}).get('large')
-            else:
-                print(f"Pexels API 오류: {response.status_code}")
-                return None
-                
-        except Exception as e:
-            print(f"이미지 검색 실패: {e}")
-        
-        return None
+        """Pexels에서 이미지 검색 (동기 래퍼)"""
+        return run_sync(self.asearch_pexels_image(keyword))
+
+    async def asearch_pexels_image(self, keyword: str) -> Optional[str]:
+        """Pexels에서 이미지 검색 (첫 번째 결과)"""
+        candidates = await self.image_resolver.asearch(keyword, self.pexels_api_key, per_page=1)
+        return candidates[0].url if candidates else None
 
     # (최적 이미지 선택/로컬 토큰화 보조 함수는 이전 상태로 복귀하므로 제거)
     
@@ -504,6 +820,23 @@ class YouTubeAutoBlogger:
                 f'style="max-width: 100%; height: auto; margin: 20px 0;" />'
             )
 
+        # 섹션별로 생성된 본문(outline 모드)은 실제 경계대로 출력
+        sections = analysis.get('sections')
+        if sections:
+            for section in sections:
+                paras = [p.strip() for p in (section.get('body') or '').split('\n\n') if p.strip()]
+                if len(paras) <= 1:
+                    paras = [p.strip() for p in (section.get('body') or '').split('\n') if p.strip()]
+                html_content += f"""
+                <h2>{section.get('heading', '')}</h2>
+                {''.join(f'<p>{para}</p>' for para in paras)}
+                """
+            html_content += f"""
+        <h3>관련 키워드</h3>
+        <p>{', '.join(keywords)}</p>
+        """
+            return html_content
+
         # 전체 본문을 소제목 개수에 맞춰 균등 분할하여 모든 문단을 포함
         # - LLM 출력이 \n\n 단락 구분을 사용하지 않을 수 있어 보조 분할을 사용
         raw_parts = [p.strip() for p in content.split('\n\n') if p.strip()]
@@ -545,9 +878,12 @@ class YouTubeAutoBlogger:
         return html_content
     
     def post_to_blogger(self, blog_id: str, title: str, content: str, labels: List[str] = None,
-                        publish_at_iso: Optional[str] = None) -> Optional[str]:
+                        publish_at_iso: Optional[str] = None, draft_post_id: Optional[str] = None,
+                        on_draft: Optional[Callable[[str], None]] = None) -> Optional[str]:
         """구글 블로거에 포스트 작성 후 공개 URL 반환 (실패 시 None)
-        예약 발행: publish_at_iso(ISO8601/RFC3339)가 미래 시간이면 초안 생성 후 해당 시각으로 발행
+        예약 발행: publish_at_iso(ISO8601/RFC3339)가 미래 시간이면 초안 생성 후 해당 시각으로 발행.
+        초안 생성 직후 on_draft(post_id)를 호출하므로, 발행만 실패했을 때 호출자가 그 id를 draft_post_id로
+        넘겨 재시도하면 초안을 다시 만들지 않고 발행만 다시 한다 (중복 게시물 방지)
         """
         try:
             if not self.blogger_service:
@@ -565,16 +901,20 @@ class YouTubeAutoBlogger:
             }
             
             if publish_at_iso:
-                # 초안으로 생성 후 예약 발행
-                draft = self.blogger_service.posts().insert(
-                    blogId=blog_id,
-                    body=post_body,
-                    isDraft=True
-                ).execute()
-                post_id = draft.get('id')
+                # 초안으로 생성 후 예약 발행 (재시도면 이미 만든 초안을 발행만)
+                post_id = draft_post_id
                 if not post_id:
-                    print("❌ 초안 생성 실패")
-                    return None
+                    draft = self.blogger_service.posts().insert(
+                        blogId=blog_id,
+                        body=post_body,
+                        isDraft=True
+                    ).execute()
+                    post_id = draft.get('id')
+                    if not post_id:
+                        print("❌ 초안 생성 실패")
+                        return None
+                    if on_draft:
+                        on_draft(post_id)
                 pub = self.blogger_service.posts().publish(
                     blogId=blog_id,
                     postId=post_id,
@@ -601,6 +941,22 @@ class YouTubeAutoBlogger:
             print(f"❌ 블로그 포스트 작성 실패: {e}")
             return None
     
+    def post_many_to_blogger(self, blog_id: str, posts: List[Dict]) -> List[Dict]:
+        """여러 포스트를 Blogger 배치 요청으로 한 번에 작성/예약 (blogger_batch.schedule_posts)
+        posts 항목: {"title", "content", "labels", "publish_at_iso"}. 반환은 입력 순서대로 항목별 결과
+        """
+        if not self.blogger_service:
+            print("❌ Blogger 서비스가 초기화되지 않았습니다.")
+            return [{"success": False, "error": "Blogger 서비스가 초기화되지 않았습니다."} for _ in posts]
+        try:
+            results = schedule_posts(self.blogger_service, blog_id, posts)
+        except Exception as e:
+            print(f"❌ 일괄 포스트 작성 실패: {e}")
+            return [{"success": False, "error": str(e)} for _ in posts]
+        ok = sum(1 for r in results if r.get("success"))
+        print(f"✅ 일괄 포스트 작성: {ok}/{len(results)}건 성공")
+        return results
+
     def get_user_blogs(self) -> List[Dict]:
         """사용자의 블로그 목록 가져오기"""
         try:
@@ -617,47 +973,64 @@ class YouTubeAutoBlogger:
     def generate_full_auto_package(self, youtube_url: str, target_audience: str = "일반인", blog_id: str = None,
                                    min_len: int = 3000, max_len: int = 4000,
                                    publish_at_iso: Optional[str] = None) -> Dict:
-        """완전 자동화된 패키지 생성"""
+        """완전 자동화된 패키지 생성 (agenerate_full_auto_package의 동기 래퍼)"""
+        return run_sync(self.agenerate_full_auto_package(
+            youtube_url, target_audience, blog_id,
+            min_len=min_len, max_len=max_len, publish_at_iso=publish_at_iso,
+        ))
+
+    async def agenerate_full_auto_package(self, youtube_url: str, target_audience: str = "일반인", blog_id: str = None,
+                                          min_len: int = 3000, max_len: int = 4000,
+                                          publish_at_iso: Optional[str] = None) -> Dict:
+        """완전 자동화된 패키지 생성 (비동기).
+
+        서로 의존하지 않는 단계는 겹쳐서 실행한다:
+        초안 생성 직후 본문 보정(길이/한글)과 키워드 번역→이미지 검색을 동시에 진행.
+        """
         print("🚀 YouTube 자동 블로거 시작...")
         
+        metrics = get_metrics()
+
         # 1. YouTube 스크립트 추출
-        script_text = self.extract_youtube_script(youtube_url)
+        with metrics.stage("transcript"):
+            script_text = await self.aextract_youtube_script(youtube_url)
         if not script_text:
             return {"error": "YouTube 스크립트 추출 실패"}
         
-        # 2. AI로 콘텐츠 분석
+        # 2. AI로 콘텐츠 분석 (초안)
         print("📊 콘텐츠 분석 중...")
-        analysis = self.analyze_content(script_text, target_audience, desired_min_len=min_len, desired_max_len=max_len)
-        if not analysis:
+        min_len, max_len = self._normalize_length_range(min_len, max_len)
+        mode = self.analysis_mode
+        with metrics.stage("analysis"):
+            draft = await self._agenerate_analysis(script_text, target_audience, min_len, max_len, mode=mode)
+        if not draft:
             return {"error": "콘텐츠 분석 실패"}
         
-        # 3. 키워드 번역
-        print("🌐 키워드 번역 중...")
-        english_keywords = self.translate_keywords_to_english(analysis.get('keywords', []))
-        
-        # 4. 이미지 검색
-        print("🖼️ 이미지 검색 중...")
-        image_url = None
-        for keyword in english_keywords:
-            image_url = self.search_pexels_image(keyword)
-            if image_url:
-                break
+        # 3~4. 본문 보정 ∥ (키워드 번역 → 이미지 검색)
+        analysis, (english_keywords, image_url, image_alternates) = await asyncio.gather(
+            self._apolish_content(draft, min_len, max_len, mode=mode),
+            self._aresolve_image(list(draft.get('keywords', []))),
+        )
         
         # 5. 블로그 포스트 콘텐츠 생성
         print("✍️ 블로그 포스트 생성 중...")
-        blog_content = self.create_blog_post_content(analysis, image_url)
+        with metrics.stage("render"):
+            blog_content = self.create_blog_post_content(analysis, image_url)
         
         # 6. 구글 블로거에 포스트 (선택사항)
         post_url: Optional[str] = None
         if blog_id and self.blogger_service:
             print("📝 구글 블로거에 포스트 중...")
-            post_url = self.post_to_blogger(
-                blog_id, 
-                analysis.get('title', '블로그 포스트'),
-                blog_content,
-                analysis.get('keywords', []),
-                publish_at_iso=publish_at_iso
-            )
+            # googleapiclient는 블로킹이므로 스레드에서 실행
+            with metrics.stage("blogger_post"):
+                post_url = await asyncio.to_thread(
+                    self.post_to_blogger,
+                    blog_id, 
+                    analysis.get('title', '블로그 포스트'),
+                    blog_content,
+                    analysis.get('keywords', []),
+                    publish_at_iso=publish_at_iso
+                )
             # post_url은 실제 공개 URL이거나 None
         
         return {
@@ -667,10 +1040,24 @@ class YouTubeAutoBlogger:
             "analysis": analysis,
             "english_keywords": english_keywords,
             "image_url": image_url,
+            "image_alternates": image_alternates,
             "blog_content": blog_content,
             "post_url": post_url,
             "target_audience": target_audience
         }
+
+    async def _aresolve_image(self, keywords: List[str]) -> tuple:
+        """키워드 번역 후 모든 키워드를 동시에 검색, 후보를 로컬 랭킹해 최상위 선택.
+        반환: (english_keywords, image_url, 대체 이미지 URL 목록)"""
+        print("🌐 키워드 번역 중...")
+        with get_metrics().stage("translate"):
+            english_keywords = await self.atranslate_keywords_to_english(keywords)
+        print("🖼️ 이미지 검색 중...")
+        with get_metrics().stage("image_search"):
+            ranked = await self.image_resolver.aresolve(english_keywords, self.pexels_api_key)
+        if not ranked:
+            return english_keywords, None, []
+        return english_keywords, ranked[0].url, [c.url for c in ranked[1:]]
     
     def save_to_files(self, package: Dict, output_dir: str = "auto_blogger_output"):
         """결과를 파일로 저장"""
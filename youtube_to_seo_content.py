@@ -5,6 +5,7 @@ from datetime import datetime
 import os
 from typing import Dict, List, Optional
 import openai
+from llm_gateway import get_gateway, message_content
 from PIL import Image, ImageDraw, ImageFont
 import io
 import base64
@@ -13,7 +14,6 @@ class YouTubeToSEOContent:
     def __init__(self, openai_api_key: str):
         """유튜브 스크립트를 SEO 최적화된 콘텐츠로 변환하는 클래스"""
         self.openai_api_key = openai_api_key
-        openai.api_key = openai_api_key
         
     def extract_youtube_id(self, url: str) -> str:
         """유튜브 URL에서 비디오 ID 추출"""
@@ -44,8 +44,9 @@ class YouTubeToSEOContent:
     def analyze_script(self, script_text: str) -> Dict:
         """스크립트 분석하여 키워드, 주제, 구조 추출"""
         try:
-            response = openai.ChatCompletion.create(
+            response = get_gateway().chat_completion(
                 model="gpt-3.5-turbo",
+                api_key=self.openai_api_key,
                 messages=[
                     {
                         "role": "system",
@@ -76,7 +77,7 @@ class YouTubeToSEOContent:
                 temperature=0.7
             )
             
-            return json.loads(response.choices[0].message.content)
+            return json.loads(message_content(response))
             
         except Exception as e:
             print(f"스크립트 분석 중 오류: {e}")
@@ -85,8 +86,9 @@ class YouTubeToSEOContent:
     def generate_seo_content(self, analysis: Dict, script_text: str) -> Dict:
         """SEO 최적화된 블로그 포스트 생성"""
         try:
-            response = openai.ChatCompletion.create(
+            response = get_gateway().chat_completion(
                 model="gpt-3.5-turbo",
+                api_key=self.openai_api_key,
                 messages=[
                     {
                         "role": "system",
@@ -118,7 +120,7 @@ class YouTubeToSEOContent:
             )
             
             return {
-                "html_content": response.choices[0].message.content,
+                "html_content": message_content(response),
                 "analysis": analysis
             }
             
@@ -135,6 +137,7 @@ class YouTubeToSEOContent:
             main_prompt = f"SEO 최적화된 블로그 포스트용 이미지: {analysis.get('main_topic', '')}"
             
             response = openai.Image.create(
+                api_key=self.openai_api_key,
                 prompt=main_prompt,
                 n=1,
                 size="1024x1024"
@@ -147,6 +150,7 @@ class YouTubeToSEOContent:
                 sub_prompt = f"블로그 포스트 섹션 이미지: {sub_topic}"
                 
                 response = openai.Image.create(
+                    api_key=self.openai_api_key,
                     prompt=sub_prompt,
                     n=1,
                     size="512x512"
@@ -164,8 +168,9 @@ class YouTubeToSEOContent:
     def create_social_media_content(self, analysis: Dict, content: str) -> Dict:
         """소셜미디어용 콘텐츠 생성"""
         try:
-            response = openai.ChatCompletion.create(
+            response = get_gateway().chat_completion(
                 model="gpt-3.5-turbo",
+                api_key=self.openai_api_key,
                 messages=[
                     {
                         "role": "system",
@@ -193,7 +198,7 @@ class YouTubeToSEOContent:
                 temperature=0.7
             )
             
-            return json.loads(response.choices[0].message.content)
+            return json.loads(message_content(response))
             
         except Exception as e:
             print(f"소셜미디어 콘텐츠 생성 중 오류: {e}")